@@ -0,0 +1,37 @@
+"""backfill_video_credit
+
+Revision ID: 4a9c2e7f1b60
+Revises: e1f4b8c2d753
+Create Date: 2026-10-19 16:31:45.927310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a9c2e7f1b60'
+down_revision: Union[str, None] = 'e1f4b8c2d753'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Os créditos passam a ser criados no cadastro; usuários antigos sem registro recebem o saldo inicial
+    op.execute(
+        """
+        INSERT INTO tb_video_credit (guid, user_id, balance, created_at, updated_at)
+        SELECT md5(random()::text || clock_timestamp()::text || u.id::text)::uuid, u.id, 10, now(), now()
+        FROM tb_user u
+        ON CONFLICT (user_id) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Os registros criados não são removidos: o saldo pode já ter sido usado
+    pass
@@ -0,0 +1,50 @@
+"""video_credit_hold
+
+Revision ID: 7b2d5f8e3a19
+Revises: 4a9c2e7f1b60
+Create Date: 2026-10-19 17:05:12.483920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2d5f8e3a19'
+down_revision: Union[str, None] = '4a9c2e7f1b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tb_video_credit', sa.Column('held', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('tb_video_credit_hold',
+    sa.Column('video_credit_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('active', 'captured', 'released', name='credit_hold_states'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('transaction_id', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('guid', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['transaction_id'], ['tb_video_credit_transaction.id'], ),
+    sa.ForeignKeyConstraint(['video_credit_id'], ['tb_video_credit.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('guid')
+    )
+    op.create_index(op.f('ix_tb_video_credit_hold_id'), 'tb_video_credit_hold', ['id'], unique=False)
+    op.create_index('ix_tb_video_credit_hold_status_expires_at', 'tb_video_credit_hold', ['status', 'expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tb_video_credit_hold_status_expires_at', table_name='tb_video_credit_hold')
+    op.drop_index(op.f('ix_tb_video_credit_hold_id'), table_name='tb_video_credit_hold')
+    op.drop_table('tb_video_credit_hold')
+    sa.Enum(name='credit_hold_states').drop(op.get_bind(), checkfirst=True)
+    op.drop_column('tb_video_credit', 'held')
@@ -0,0 +1,34 @@
+"""video_upload_state
+
+Revision ID: 8d4f1a6b2c37
+Revises: 5b0e3c7d9a21
+Create Date: 2026-10-19 10:41:07.552913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4f1a6b2c37'
+down_revision: Union[str, None] = '5b0e3c7d9a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+upload_states = sa.Enum('pending', 'uploading', 'done', 'failed', name='upload_states')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    upload_states.create(op.get_bind(), checkfirst=True)
+    op.add_column('tb_video', sa.Column('upload_state', upload_states, nullable=True))
+    # Vídeos já enviados ao Blob Storage são marcados como concluídos
+    op.execute("UPDATE tb_video SET upload_state = 'done' WHERE url LIKE 'https://%'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tb_video', 'upload_state')
+    upload_states.drop(op.get_bind(), checkfirst=True)
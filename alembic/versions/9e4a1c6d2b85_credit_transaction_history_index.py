@@ -0,0 +1,34 @@
+"""credit_transaction_history_index
+
+Revision ID: 9e4a1c6d2b85
+Revises: 7b2d5f8e3a19
+Create Date: 2026-10-19 17:42:08.615204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4a1c6d2b85'
+down_revision: Union[str, None] = '7b2d5f8e3a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # O histórico é lido por crédito, do mais recente para o mais antigo; o índice entrega as linhas já ordenadas
+    op.create_index(
+        'ix_tb_video_credit_transaction_credit_created_at_id',
+        'tb_video_credit_transaction',
+        ['video_credit_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tb_video_credit_transaction_credit_created_at_id', table_name='tb_video_credit_transaction')
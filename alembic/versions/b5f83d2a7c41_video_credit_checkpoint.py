@@ -0,0 +1,43 @@
+"""video_credit_checkpoint
+
+Revision ID: b5f83d2a7c41
+Revises: 9e4a1c6d2b85
+Create Date: 2026-10-19 18:20:37.204561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5f83d2a7c41'
+down_revision: Union[str, None] = '9e4a1c6d2b85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tb_video_credit_checkpoint',
+    sa.Column('video_credit_id', sa.Integer(), nullable=False),
+    sa.Column('last_transaction_id', sa.Integer(), nullable=False),
+    sa.Column('expected_balance', sa.Integer(), nullable=False),
+    sa.Column('drift', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('guid', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['video_credit_id'], ['tb_video_credit.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('guid'),
+    sa.UniqueConstraint('video_credit_id')
+    )
+    op.create_index(op.f('ix_tb_video_credit_checkpoint_id'), 'tb_video_credit_checkpoint', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tb_video_credit_checkpoint_id'), table_name='tb_video_credit_checkpoint')
+    op.drop_table('tb_video_credit_checkpoint')
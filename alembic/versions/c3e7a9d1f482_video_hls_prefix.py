@@ -0,0 +1,28 @@
+"""video_hls_prefix
+
+Revision ID: c3e7a9d1f482
+Revises: 8d4f1a6b2c37
+Create Date: 2026-10-19 14:22:36.180457
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e7a9d1f482'
+down_revision: Union[str, None] = '8d4f1a6b2c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tb_video', sa.Column('hls_prefix', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tb_video', 'hls_prefix')
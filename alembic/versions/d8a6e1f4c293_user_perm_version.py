@@ -0,0 +1,28 @@
+"""user_perm_version
+
+Revision ID: d8a6e1f4c293
+Revises: b5f83d2a7c41
+Create Date: 2026-10-19 19:03:51.770248
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a6e1f4c293'
+down_revision: Union[str, None] = 'b5f83d2a7c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tb_user', sa.Column('perm_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tb_user', 'perm_version')
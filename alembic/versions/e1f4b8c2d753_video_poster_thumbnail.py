@@ -0,0 +1,30 @@
+"""video_poster_thumbnail
+
+Revision ID: e1f4b8c2d753
+Revises: c3e7a9d1f482
+Create Date: 2026-10-19 15:08:12.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f4b8c2d753'
+down_revision: Union[str, None] = 'c3e7a9d1f482'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tb_video', sa.Column('poster_url', sa.String(), nullable=True))
+    op.add_column('tb_video', sa.Column('thumbnail_url', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tb_video', 'thumbnail_url')
+    op.drop_column('tb_video', 'poster_url')
@@ -0,0 +1,30 @@
+"""video_upload_owner
+
+Revision ID: f2c6d9a4b813
+Revises: d8a6e1f4c293
+Create Date: 2026-10-19 21:17:42.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d9a4b813'
+down_revision: Union[str, None] = 'd8a6e1f4c293'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tb_video', sa.Column('upload_owner', sa.String(), nullable=True))
+    op.add_column('tb_video', sa.Column('upload_heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tb_video', 'upload_heartbeat_at')
+    op.drop_column('tb_video', 'upload_owner')
@@ -45,7 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["x-csrf-token", "set-cookie", "*"],
+    expose_headers=["x-csrf-token", "set-cookie", "x-next-cursor", "*"],
     max_age=600,
 )
 
@@ -84,6 +84,76 @@ from app.api.routes import api_router
 app_logger.info(f"Application {settings.PROJECT_NAME} initialized with API at {settings.API_STR}")
 
 
+# Provisiona os containers do Blob Storage na inicialização para tirar a verificação do caminho de upload
+@app.on_event("startup")
+def provision_blob_container():
+    if settings.STORAGE_BACKEND.lower() == "azure" and not settings.AZURE_STORAGE_CONNECTION_STRING:
+        return
+    from app.services.storage_backends import get_storage_backend
+    try:
+        backend = get_storage_backend()
+        backend.ensure_container(settings.AZURE_STORAGE_CONTAINER_NAME)
+        backend.ensure_container(settings.AZURE_STORAGE_ARTIFACTS_CONTAINER_NAME)
+    except Exception as e:
+        # Não impede a inicialização; a verificação é refeita no primeiro upload
+        app_logger.warning(f"Não foi possível provisionar o container do Blob Storage: {e}")
+
+
+# Reenfileira os uploads interrompidos por um reinício (a fila do uploader fica em memória)
+@app.on_event("startup")
+def start_upload_recovery_sweeper():
+    from app.services.upload_service import get_upload_recovery_sweeper
+    get_upload_recovery_sweeper().start()
+
+
+@app.on_event("shutdown")
+def stop_upload_recovery_sweeper():
+    from app.services.upload_service import get_upload_recovery_sweeper
+    get_upload_recovery_sweeper().stop()
+
+
+# Aguarda os uploads em segundo plano pendentes antes de encerrar
+@app.on_event("shutdown")
+def stop_background_uploader():
+    from app.services.upload_service import get_background_uploader
+    get_background_uploader().stop()
+
+
+# Libera periodicamente as reservas de créditos expiradas
+@app.on_event("startup")
+def start_credit_hold_sweeper():
+    from app.services.credit_service import get_credit_hold_sweeper
+    get_credit_hold_sweeper().start()
+
+
+@app.on_event("shutdown")
+def stop_credit_hold_sweeper():
+    from app.services.credit_service import get_credit_hold_sweeper
+    get_credit_hold_sweeper().stop()
+
+
+# Invalida o cache de saldos quando outros processos alteram créditos
+@app.on_event("startup")
+def start_balance_invalidation_listener():
+    if not settings.CREDIT_BALANCE_NOTIFY_ENABLED:
+        return
+    from app.services.credit_cache import get_balance_invalidation_listener
+    get_balance_invalidation_listener().start()
+
+
+@app.on_event("shutdown")
+def stop_balance_invalidation_listener():
+    from app.services.credit_cache import get_balance_invalidation_listener
+    get_balance_invalidation_listener().stop()
+
+
+# Aguarda os hashes de senha em andamento antes de encerrar
+@app.on_event("shutdown")
+def stop_password_hashing_pool():
+    from app.core.security import password_hashing_pool
+    password_hashing_pool.shutdown()
+
+
 # Health check endpoint
 @app.get("/health")
 def health_check():
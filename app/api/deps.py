@@ -1,14 +1,19 @@
 from typing import Generator, List, Optional, Tuple, Dict, Any
+from collections import OrderedDict
+import hashlib
+import threading
+import time
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
-from datetime import datetime
 
 from app.core.config import settings
 from app.core.security import JWT_ALGORITHM
 from app.core.csrf import csrf_protect
+from app.core.principal import Principal, build_principal, get_cached_principal, store_principal
+from app.core.logger import app_logger as logger
 from app.db.session import SessionLocal
 from app.models.user import User
 from app.models.role import Role
@@ -28,11 +33,41 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+# Tokens já verificados: sha256 do token -> (user_id, payload, exp)
+_verified_token_cache: "OrderedDict[bytes, Tuple[str, Dict[str, Any], float]]" = OrderedDict()
+_verified_token_cache_lock = threading.Lock()
+
+
+def _get_verified_token(token_hash: bytes, now: float) -> Optional[Tuple[str, Dict[str, Any], float]]:
+    with _verified_token_cache_lock:
+        cached = _verified_token_cache.get(token_hash)
+        if cached is None:
+            return None
+        if cached[2] <= now:
+            del _verified_token_cache[token_hash]
+            return None
+        _verified_token_cache.move_to_end(token_hash)
+        return cached
+
+
+def _store_verified_token(token_hash: bytes, user_id: str, payload: Dict[str, Any], exp: float) -> None:
+    if settings.JWT_CACHE_SIZE <= 0:
+        return
+    with _verified_token_cache_lock:
+        _verified_token_cache[token_hash] = (user_id, payload, exp)
+        _verified_token_cache.move_to_end(token_hash)
+        while len(_verified_token_cache) > settings.JWT_CACHE_SIZE:
+            _verified_token_cache.popitem(last=False)
+
+
 # Helper function to validate JWT token
 def validate_token(token: str) -> Tuple[str, Dict[str, Any]]:
     """
     Validates a JWT token and returns the user_id and payload if valid.
     Raises HTTPException if token is invalid or expired.
+
+    Verified tokens are cached (keyed by their SHA-256) until their exp, so repeated
+    requests with the same bearer token skip the signature check.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,70 +75,66 @@ def validate_token(token: str) -> Tuple[str, Dict[str, Any]]:
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    current_time = time.time()
+    token_hash = hashlib.sha256(token.encode()).digest()
+    cached = _get_verified_token(token_hash, current_time)
+    if cached is not None:
+        return cached[0], dict(cached[1])
+    
     try:
-        # Log token information for debugging
-        from app.core.logger import app_logger as logger
-        logger.debug(f"Validating token: {token[:10]}...")
-        logger.debug(f"Using SECRET_KEY: {settings.SECRET_KEY[:5]}...")
-        logger.debug(f"Using JWT_ALGORITHM: {JWT_ALGORITHM}")
-        
-        # Decode token        
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[JWT_ALGORITHM]
         )
-        
-        # Log successful decode
-        logger.debug("Token decoded successfully")
-        
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            logger.warning("Token missing 'sub' claim")
-            raise credentials_exception
-        
-        # Check if token is expired
-        exp = payload.get("exp")
-        if exp is None:
-            logger.warning("Token missing 'exp' claim")
-            raise credentials_exception
-        
-        # Convert exp to datetime and check if it's expired
-        current_time = datetime.utcnow().timestamp()
-        if current_time > exp:
-            logger.warning(f"Token expired: {exp} < {current_time}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token expired",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        logger.debug(f"Token valid for user_id: {user_id}")
-        return user_id, payload
-            
     except JWTError as e:
         logger.error(f"JWT Error: {str(e)}")
-        logger.debug(f"Token: {token[:10]}...")
-        logger.debug(f"SECRET_KEY: {settings.SECRET_KEY[:5]}...")
-        logger.debug(f"JWT_ALGORITHM: {JWT_ALGORITHM}")
-        
-        # Try to decode without verification for debugging
-        try:
-            # This is just for debugging - never use unverified tokens in production
-            header = jwt.get_unverified_header(token)
-            logger.debug(f"Token header: {header}")
-        except Exception as header_error:
-            logger.error(f"Could not parse token header: {str(header_error)}")
-            
         raise credentials_exception
+    
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        logger.warning("Token missing 'sub' claim")
+        raise credentials_exception
+    
+    # Check if token is expired
+    exp = payload.get("exp")
+    if exp is None:
+        logger.warning("Token missing 'exp' claim")
+        raise credentials_exception
+    
+    if current_time > exp:
+        logger.warning(f"Token expired: {exp} < {current_time}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    _store_verified_token(token_hash, user_id, payload, exp)
+    return user_id, dict(payload)
+
+def _check_perm_version(principal: Principal, token_perm_version: Optional[int]) -> None:
+    # Tokens issued before a role change carry outdated permission claims
+    if token_perm_version is not None and token_perm_version != principal.perm_version:
+        logger.warning(f"Outdated permission claims for user: {principal.guid}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token permissions are outdated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
 # Current user dependency
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
-    from app.core.logger import app_logger as logger
-    logger.debug("get_current_user function called")
-    
+) -> Principal:
     # Validate token and get user_id
-    user_id, _ = validate_token(token)
+    user_id, payload = validate_token(token)
+    token_perm_version = payload.get("perm_version")
+    
+    # Snapshot cached for PRINCIPAL_CACHE_TTL_SECONDS; invalidated when the user changes.
+    # A token newer than the cached snapshot means the snapshot is stale: reload it
+    principal = get_cached_principal(user_id)
+    if principal is not None and (token_perm_version is None or token_perm_version <= principal.perm_version):
+        _check_perm_version(principal, token_perm_version)
+        return principal
     
     # Get user from database
     user = db.query(User).filter(User.guid == user_id).first()
@@ -115,13 +146,15 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    logger.debug(f"User authenticated: {user.email}")
-    return user
+    principal = build_principal(db, user, payload)
+    store_principal(user_id, principal)
+    _check_perm_version(principal, token_perm_version)
+    return principal
 
 # Active user dependency
 def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
@@ -130,8 +163,8 @@ def get_current_active_user(
 
 # Verified user dependency
 def get_current_verified_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     if not current_user.is_verified:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email not verified"
@@ -141,20 +174,11 @@ def get_current_verified_user(
 # Permission check dependency
 def has_permission(required_permission: str):
     def permission_checker(
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_verified_user)
-    ) -> User:
-        # Get all user roles
-        user_roles = [user_role.role for user_role in current_user.roles]
-        
-        # Get all permissions from user roles
-        user_permissions = []
-        for role in user_roles:
-            role_permissions = [rp.permission for rp in role.permissions]
-            user_permissions.extend(role_permissions)
-        
-        # Check if user has the required permission
-        if not any(p.name == required_permission for p in user_permissions):
+        current_user: Principal = Depends(get_current_verified_user)
+    ) -> Principal:
+        # Permissions come from the token claims (or the database for older tokens),
+        # already checked against the user's current perm_version
+        if required_permission not in current_user.permissions:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"User does not have permission: {required_permission}"
@@ -167,8 +191,8 @@ def has_permission(required_permission: str):
 # Profile type check dependency
 def has_profile_type(required_profile_type: str):
     def profile_type_checker(
-        current_user: User = Depends(get_current_verified_user)
-    ) -> User:
+        current_user: Principal = Depends(get_current_verified_user)
+    ) -> Principal:
         if current_user.profile_type != required_profile_type:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -8,6 +8,7 @@ from app.api.routes.videos import router as videos_router
 from app.api.routes.credits import router as credits_router
 from app.api.routes.assistir import router as assistir_router
 from app.api.routes.payments import router as payments_router
+from app.api.routes.storage import router as storage_router
 
 api_router = APIRouter()
 
@@ -16,4 +17,5 @@ api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
 api_router.include_router(videos_router, prefix="/videos", tags=["videos"])
 api_router.include_router(credits_router, prefix="/credits", tags=["credits"])
 api_router.include_router(assistir_router, prefix="/assistir", tags=["assistir"])
-api_router.include_router(payments_router, prefix="/payments", tags=["payments"])
\ No newline at end of file
+api_router.include_router(payments_router, prefix="/payments", tags=["payments"])
+api_router.include_router(storage_router, prefix="/storage", tags=["storage"])
\ No newline at end of file
@@ -2,14 +2,15 @@ from typing import Dict, Any
 import uuid
 import traceback
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from app.core.logger import get_logger
 
 logger = get_logger("assistir")
 
 from app.api.deps import get_db, get_current_verified_user
-from app.models.user import User
+from app.core.principal import Principal
+from app.core.config import settings
 from app.models.video import Video
 
 router = APIRouter()
@@ -17,13 +18,18 @@ router = APIRouter()
 @router.get("/{video_guid}")
 def assistir_video(
     video_guid: str,
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    current_user: Principal = Depends(get_current_verified_user)
 ) -> Dict[str, Any]:
     """Gera um link de streaming para um vídeo específico
     
+    Vídeos empacotados em HLS recebem a URL assinada da playlist master; os demais,
+    a URL com SAS do MP4.
+    
     Args:
         video_guid: GUID do vídeo
+        request: Requisição atual, usada para montar a URL da playlist
         db: Sessão do banco de dados
         current_user: Usuário autenticado atual
         
@@ -49,10 +55,6 @@ def assistir_video(
     )
     
     try:
-        # Recarrega o usuário da sessão para garantir que os atributos estejam atualizados
-        current_user = db.merge(current_user)
-        db.refresh(current_user)
-        
         # Verifica se o vídeo existe e pertence ao usuário
         video = db.query(Video).filter(Video.guid == video_guid, Video.user_id == current_user.id).first()
         
@@ -74,11 +76,24 @@ def assistir_video(
                 }
             )
         
-        # Importa o serviço de vídeo para gerar a URL de streaming
-        from app.services.video_service import get_video_streaming_url
-        
-        # Gera a URL de streaming
-        streaming_url = get_video_streaming_url(db, video_guid, current_user.id)
+        if video.hls_prefix:
+            # Playlist master HLS, servida por esta API com as URIs dos segmentos assinadas
+            from app.services.hls_service import MASTER_PLAYLIST, sign_hls_query
+            # Caminho montado a partir da rota, e não de request.url_for: atrás de um proxy que
+            # termina o TLS, a URL da requisição chega como http://
+            playlist_path = request.scope.get("root_path", "") + request.app.url_path_for(
+                "playlist_hls", video_guid=str(video.guid), path=MASTER_PLAYLIST
+            )
+            playlist_url = settings.PUBLIC_BASE_URL.rstrip("/") + playlist_path
+            streaming_url = f"{playlist_url}?{sign_hls_query(video.guid)}"
+            streaming_format = "hls"
+        else:
+            # Importa o serviço de vídeo para gerar a URL de streaming
+            from app.services.video_service import get_video_streaming_url
+            
+            # Gera a URL de streaming
+            streaming_url = get_video_streaming_url(db, video_guid, current_user.id)
+            streaming_format = "mp4"
         
         if not streaming_url:
             logger.warning(
@@ -111,6 +126,7 @@ def assistir_video(
         # Retorna a URL de streaming com informações adicionais do vídeo
         return {
             "streaming_url": streaming_url,
+            "streaming_format": streaming_format,
             "video_title": video.title,
             "video_duration": video.duration,
             "video_content": video.conteudo,
@@ -144,4 +160,65 @@ def assistir_video(
                 "message": "Erro interno do servidor",
                 "error_id": error_id
             }
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/{video_guid}/hls/{path:path}", name="playlist_hls")
+def playlist_hls(
+    video_guid: str,
+    path: str,
+    exp: int,
+    sig: str,
+    db: Session = Depends(get_db)
+) -> Response:
+    """Serve uma playlist HLS de um vídeo com as URIs assinadas
+    
+    A query string assinada gerada em /assistir/{video_guid} substitui a autenticação,
+    já que o player não envia o token do usuário.
+    
+    Args:
+        video_guid: GUID do vídeo
+        path: Caminho da playlist dentro do pacote HLS
+        exp: Timestamp de expiração da assinatura
+        sig: Assinatura HMAC
+        db: Sessão do banco de dados
+        
+    Returns:
+        A playlist HLS
+        
+    Raises:
+        HTTPException: Se a assinatura for inválida ou a playlist não existir
+    """
+    from app.services.hls_service import render_playlist, verify_hls_signature
+    
+    if not verify_hls_signature(video_guid, exp, sig):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "code": "invalid_signature",
+                "message": "Link de streaming inválido ou expirado"
+            }
+        )
+    
+    hls_prefix = db.query(Video.hls_prefix).filter(Video.guid == video_guid).scalar()
+    if not hls_prefix:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "playlist_not_found",
+                "message": "Playlist não encontrada"
+            }
+        )
+    
+    try:
+        playlist = render_playlist(video_guid, hls_prefix, path, exp, sig)
+    except (ValueError, FileNotFoundError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "playlist_not_found",
+                "message": "Playlist não encontrada"
+            }
+        )
+    
+    return Response(content=playlist, media_type="application/vnd.apple.mpegurl")
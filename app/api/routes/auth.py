@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from authlib.integrations.starlette_client import OAuth
+from starlette.concurrency import run_in_threadpool
 from starlette.config import Config
 from starlette.responses import RedirectResponse
 
@@ -12,7 +13,11 @@ from app.core.csrf import csrf_protect
 
 from app.api.deps import get_db
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password, get_password_hash, brute_force_protection
+from app.core.security import (
+    create_access_token, verify_password_async, get_password_hash_async, password_needs_rehash,
+    brute_force_protection, PasswordHashingBusy
+)
+from app.core.principal import permission_claims
 from app.core.logger import get_logger
 
 logger = get_logger("auth")
@@ -21,9 +26,69 @@ from app.models.role import Role
 from app.models.user_role import UserRole
 from app.schemas.token import Token
 from app.schemas.user import UserCreate
+from app.services.credit_service import provision_user_credit
 
 router = APIRouter()
 
+
+def password_hashing_unavailable() -> HTTPException:
+    """Resposta para quando o pool de hashing de senhas está saturado"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+# The login and registration handlers are async so they can await the hashing pool;
+# their (synchronous) database work runs in the threadpool through these helpers.
+def get_user_by_email(db: Session, email: str) -> User:
+    return db.query(User).filter(User.email == email).first()
+
+
+def update_password_hash(db: Session, user: User, hashed_password: str) -> None:
+    try:
+        user.hashed_password = hashed_password
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def create_user(db: Session, user_in: UserCreate, hashed_password: str) -> User:
+    user = User(
+        email=user_in.email,
+        hashed_password=hashed_password,
+        is_active=True,
+        is_verified=False,  # Require email verification
+        profile_type="Free",
+    )
+    db.add(user)
+    db.flush()
+    
+    # Assign default role
+    default_role = db.query(Role).filter(Role.name == "user").first()
+    if default_role:
+        user_role = UserRole(user_id=user.id, role_id=default_role.id)
+        db.add(user_role)
+    
+    # Cria o registro de créditos na mesma transação do cadastro
+    provision_user_credit(db, user.id)
+    
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def token_user_data(db: Session, user: User) -> dict:
+    """User data included in the access token (reads the permission claims from the database)"""
+    return {
+        "name": user.full_name if hasattr(user, "full_name") and user.full_name else "",
+        "email": user.email,
+        "profile": user.profile_type,
+        **permission_claims(db, user)
+    }
+
 # Set up Google OAuth
 config = Config()
 config.environ["GOOGLE_CLIENT_ID"] = settings.GOOGLE_CLIENT_ID
@@ -37,7 +102,7 @@ oauth.register(
 )
 
 @router.post("/login", response_model=Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """OAuth2 compatible token login, get an access token for future requests"""
@@ -53,10 +118,15 @@ def login_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await run_in_threadpool(get_user_by_email, db, form_data.username)
+    
+    # Check authentication (hashing runs in the dedicated pool)
+    try:
+        password_valid = bool(user) and await verify_password_async(form_data.password, user.hashed_password)
+    except PasswordHashingBusy:
+        raise password_hashing_unavailable()
     
-    # Check authentication
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not password_valid:
         # Record failed attempt
         attempts_remaining, is_now_locked = brute_force_protection.record_failed_attempt(identifier)
         
@@ -82,12 +152,18 @@ def login_access_token(
     # Reset failed attempts counter on successful login
     brute_force_protection.reset_attempts(identifier)
     
+    # Upgrade legacy bcrypt hashes (or outdated Argon2 parameters) while the password is at hand
+    if password_needs_rehash(user.hashed_password):
+        try:
+            hashed_password = await get_password_hash_async(form_data.password)
+            await run_in_threadpool(update_password_hash, db, user, hashed_password)
+            logger.info(f"Password hash upgraded for user: {identifier}")
+        except Exception as e:
+            # Best effort: the login succeeds and the upgrade is retried on the next one
+            logger.warning(f"Could not upgrade password hash for user {user.email}: {e}")
+    
     # Create user data to include in token
-    user_data = {
-        "name": user.full_name if hasattr(user, "full_name") else "",
-        "email": user.email,
-        "profile": user.profile_type
-    }
+    user_data = await run_in_threadpool(token_user_data, db, user)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES) 
     logger.info(f"User {user.email} logged in successfully")
     return {
@@ -98,11 +174,11 @@ def login_access_token(
     }
 
 @router.post("/register", response_model=Token, dependencies=[Depends(csrf_protect())])
-def register_user(user_in: UserCreate, db: Session = Depends(get_db)) -> Any:
+async def register_user(user_in: UserCreate, db: Session = Depends(get_db)) -> Any:
     """Register a new user and return an access token"""
     logger.info(f"Registration attempt for email: {user_in.email}")
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_in.email).first()
+    existing_user = await run_in_threadpool(get_user_by_email, db, user_in.email)
     if existing_user:
         logger.warning(f"Registration failed: Email already exists: {user_in.email}")
         raise HTTPException(
@@ -110,32 +186,16 @@ def register_user(user_in: UserCreate, db: Session = Depends(get_db)) -> Any:
             detail="Email already registered",
         )
     
-    # Create new user
-    user = User(
-        email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
-        is_active=True,
-        is_verified=False,  # Require email verification
-        profile_type="Free",
-    )
-    db.add(user)
-    db.flush()
-    
-    # Assign default role
-    default_role = db.query(Role).filter(Role.name == "user").first()
-    if default_role:
-        user_role = UserRole(user_id=user.id, role_id=default_role.id)
-        db.add(user_role)
+    try:
+        hashed_password = await get_password_hash_async(user_in.password)
+    except PasswordHashingBusy:
+        raise password_hashing_unavailable()
     
-    db.commit()
-    db.refresh(user)
+    # Create new user
+    user = await run_in_threadpool(create_user, db, user_in, hashed_password)
 
     # Create user data to include in token
-    user_data = {
-        "name": user.full_name if hasattr(user, "full_name") and user.full_name else user_info.get("name", ""),
-        "email": user.email,
-        "profile": user.profile_type
-    }
+    user_data = await run_in_threadpool(token_user_data, db, user)
 
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -187,6 +247,9 @@ async def auth_google_callback(request: Request, db: Session = Depends(get_db)):
             user_role = UserRole(user_id=user.id, role_id=default_role.id)
             db.add(user_role)
         
+        # Cria o registro de créditos na mesma transação do cadastro
+        provision_user_credit(db, user.id)
+        
         db.commit()
         db.refresh(user)
     else:
@@ -194,13 +257,16 @@ async def auth_google_callback(request: Request, db: Session = Depends(get_db)):
         user.oauth_provider = "google"
         user.oauth_id = user_info["sub"]
         user.is_verified = True
+        # Idempotente: garante o registro de créditos de contas anteriores ao provisionamento no cadastro
+        provision_user_credit(db, user.id)
         db.commit()
     
     # Create user data to include in token
     user_data = {
         "name": user.full_name if hasattr(user, "full_name") else "",
         "email": user.email,
-        "profile": user.profile_type
+        "profile": user.profile_type,
+        **permission_claims(db, user)
     }
     
     # Create access token 
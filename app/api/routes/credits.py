@@ -1,17 +1,21 @@
-from typing import Any, List
+from typing import Any, List, Optional
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_verified_user, csrf_protect, has_permission
-from app.models.user import User
-from app.schemas.video_credit import VideoCredit, VideoCreditTransaction, VideoCreditWithTransactions
+from app.core.principal import Principal
+from app.schemas.video_credit import (
+    VideoCredit, VideoCreditTransaction, VideoCreditWithTransactions, BulkCreditGrantRequest, CreditGrantResult
+)
 from app.services.credit_service import (
     check_user_credit_balance, 
-    get_user_credit, 
+    get_cached_user_credit,
     get_credit_transactions,
+    encode_transaction_cursor,
     add_credits,
+    grant_credits_bulk,
     CreditTransactionException
 )
 from app.core.exceptions import map_domain_exception_to_http
@@ -25,7 +29,7 @@ router = APIRouter()
 @router.get("/balance", response_model=VideoCredit)
 def get_credit_balance(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    current_user: Principal = Depends(get_current_verified_user)
 ) -> Any:
     """Obtém o saldo de créditos do usuário atual"""
     logger.info(
@@ -37,18 +41,32 @@ def get_credit_balance(
         }
     )
     
-    credit = get_user_credit(db, current_user.id)
+    credit = get_cached_user_credit(db, current_user.id)
+    if not credit:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "credit_not_found",
+                "message": "Registro de créditos não encontrado"
+            }
+        )
     return credit
 
 
 @router.get("/transactions", response_model=List[VideoCreditTransaction])
 def get_user_transactions(
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user),
+    current_user: Principal = Depends(get_current_verified_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after: Optional[str] = None
 ) -> Any:
-    """Obtém o histórico de transações de crédito do usuário atual"""
+    """Obtém o histórico de transações de crédito do usuário atual
+
+    Para paginar, envie em after o cursor recebido no cabeçalho X-Next-Cursor da
+    página anterior; skip continua aceito por compatibilidade.
+    """
     logger.info(
         "Consultando histórico de transações de crédito",
         extra={
@@ -56,11 +74,24 @@ def get_user_transactions(
             "user_email": current_user.email,
             "skip": skip,
             "limit": limit,
+            "after": after,
             "operation": "get_credit_transactions"
         }
     )
     
-    transactions = get_credit_transactions(db, current_user.id, skip, limit)
+    try:
+        transactions = get_credit_transactions(db, current_user.id, skip, limit, after=after)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "invalid_cursor",
+                "message": "Cursor de paginação inválido"
+            }
+        )
+    
+    if transactions and len(transactions) == limit:
+        response.headers["X-Next-Cursor"] = encode_transaction_cursor(transactions[-1])
     return transactions
 
 
@@ -68,7 +99,7 @@ def get_user_transactions(
 def add_user_credits(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(has_permission("adicionar_creditos")),
+    current_user: Principal = Depends(has_permission("adicionar_creditos")),
     amount: int,
     description: str = "Compra de créditos"
 ) -> Any:
@@ -112,4 +143,25 @@ def add_user_credits(
                 "message": "Erro interno do servidor",
                 "error_id": error_id
             }
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/bulk-grant", response_model=List[CreditGrantResult], dependencies=[Depends(csrf_protect())])
+def bulk_grant_credits(
+    *,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(has_permission("conceder_creditos")),
+    grant_in: BulkCreditGrantRequest
+) -> Any:
+    """Concede créditos a vários usuários (uso administrativo), retornando o resultado de cada concessão"""
+    logger.info(
+        "Concedendo créditos em lote",
+        extra={
+            "user_id": current_user.id,
+            "user_email": current_user.email,
+            "grants": len(grant_in.grants),
+            "operation": "bulk_grant_credits"
+        }
+    )
+    
+    return grant_credits_bulk(db, [grant.model_dump() for grant in grant_in.grants])
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_verified_user, csrf_protect
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.payment import (
     PaymentIntentCreate,
     PaymentIntentResponse,
@@ -40,7 +40,7 @@ router = APIRouter()
 def create_payment_intent_endpoint(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user),
+    current_user: Principal = Depends(get_current_verified_user),
     payment_data: PaymentIntentCreate
 ) -> Any:
     """Cria uma intenção de pagamento no Stripe"""
@@ -105,7 +105,7 @@ def create_payment_intent_endpoint(
 def confirm_payment_endpoint(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user),
+    current_user: Principal = Depends(get_current_verified_user),
     payment_data: PaymentConfirm
 ) -> Any:
     """Confirma um pagamento no Stripe"""
@@ -152,7 +152,7 @@ def confirm_payment_endpoint(
 def create_checkout_session_endpoint(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user),
+    current_user: Principal = Depends(get_current_verified_user),
     checkout_data: CheckoutSessionCreate
 ) -> Any:
     """Cria uma sessão de checkout no Stripe para finalizar o pagamento"""
@@ -203,7 +203,7 @@ def create_checkout_session_endpoint(
 @router.get("/subscription-status", response_model=SubscriptionStatus)
 def get_subscription_status_endpoint(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user)
+    current_user: Principal = Depends(get_current_verified_user)
 ) -> Any:
     """Verifica o status da assinatura do usuário"""
     try:
@@ -246,7 +246,7 @@ def get_subscription_status_endpoint(
 def cancel_subscription_endpoint(
     *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user),
+    current_user: Principal = Depends(get_current_verified_user),
     cancel_data: SubscriptionCancel
 ) -> Any:
     """Cancela a assinatura do usuário"""
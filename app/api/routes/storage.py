@@ -0,0 +1,61 @@
+import os
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.core.logger import get_logger
+from app.services.storage_backends import LocalFileSystemStorageBackend, get_storage_backend
+
+logger = get_logger("storage")
+
+router = APIRouter()
+
+# Tipos MIME não reconhecidos (ou reconhecidos incorretamente) pelo mimetypes
+MEDIA_TYPES = {
+    ".ts": "video/mp2t",
+    ".m3u8": "application/vnd.apple.mpegurl",
+}
+
+@router.get("/{container}/{key:path}")
+def baixar_objeto(container: str, key: str, exp: int, perm: str, sig: str) -> FileResponse:
+    """Serve um objeto do backend de armazenamento local a partir de uma URL assinada
+
+    Disponível apenas com STORAGE_BACKEND=local. Aceita requisições com Range, o que
+    permite o streaming dos vídeos pelo player.
+
+    Args:
+        container: Nome do container
+        key: Chave do objeto
+        exp: Timestamp de expiração da URL
+        perm: Permissões concedidas pela URL
+        sig: Assinatura HMAC da URL
+
+    Returns:
+        O conteúdo do objeto
+
+    Raises:
+        HTTPException: Se a assinatura for inválida ou o objeto não existir
+    """
+    backend = get_storage_backend()
+    if not isinstance(backend, LocalFileSystemStorageBackend):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Objeto não encontrado")
+
+    if "r" not in perm or not backend.verify_signature(container, key, exp, perm, sig):
+        logger.warning(
+            "URL de armazenamento com assinatura inválida ou expirada",
+            extra={
+                "container": container,
+                "key": key,
+                "operation": "storage_download_forbidden"
+            }
+        )
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="URL inválida ou expirada")
+
+    try:
+        path = backend.path_for(container, key)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Objeto não encontrado")
+    if not backend.exists(container, key):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Objeto não encontrado")
+
+    return FileResponse(path, media_type=MEDIA_TYPES.get(os.path.splitext(key)[1]))
@@ -13,13 +13,22 @@ logger = get_logger("videos")
 from app.api.deps import get_db, has_permission, get_current_verified_user
 from app.core.exceptions import VideoNotValidatedException, VideoServiceException, VideoGenerationException, DomainException, map_domain_exception_to_http
 #from app.core.csrf import csrf_protect
-from app.models.user import User
+from app.core.principal import Principal
 from app.models.video import Video
 from app.schemas.video import VideoCreate, Video as VideoSchema
+from app.services.storage_service import generate_image_url
 
 router = APIRouter()
 
 
+def _to_schema(video: Video) -> VideoSchema:
+    """Converte o vídeo para o schema de resposta, com URLs assinadas do poster e das miniaturas"""
+    video_schema = VideoSchema.model_validate(video, from_attributes=True)
+    video_schema.poster_url = generate_image_url(video.poster_url)
+    video_schema.thumbnail_url = generate_image_url(video.thumbnail_url)
+    return video_schema
+
+
 
 
 
@@ -29,7 +38,7 @@ def create_video(
     *,
     db: Session = Depends(get_db),
     video_in: VideoCreate,
-    current_user: User = Depends(has_permission("criar_videos"))
+    current_user: Principal = Depends(has_permission("criar_videos"))
 ) -> Any:
     """Cria um novo vídeo
     
@@ -66,10 +75,6 @@ def create_video(
     )
     
     try:
-        # Recarrega o usuário da sessão para garantir que os atributos estejam atualizados
-        current_user = db.merge(current_user)
-        db.refresh(current_user)
-        
         # Delega a criação do vídeo para o serviço
         video = create_video_service(db, video_in, current_user)
         
@@ -204,7 +209,7 @@ def create_video(
 @router.get("/", response_model=Dict[str, Any])
 def get_videos(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_verified_user),
+    current_user: Principal = Depends(get_current_verified_user),
     skip: int = 0,
     limit: int = 100,
     order_by: str = "id",
@@ -242,10 +247,6 @@ def get_videos(
     )
     
     try:
-        # Recarrega o usuário da sessão para garantir que os atributos estejam atualizados
-        current_user = db.merge(current_user)
-        db.refresh(current_user)
-        
         # Validação dos parâmetros de ordenação
         valid_order_fields = {"id": Video.id, "title": Video.title, "created_at": Video.data_registro}
         valid_directions = {"asc": "asc", "desc": "desc"}
@@ -285,7 +286,7 @@ def get_videos(
         
         # Converte os objetos Video do SQLAlchemy para o schema VideoSchema antes de retornar
         # Usando o método correto para Pydantic v2
-        video_schemas = [VideoSchema.model_validate(video, from_attributes=True) for video in videos]
+        video_schemas = [_to_schema(video) for video in videos]
         
         # Retorna os resultados com metadados de paginação
         return {
@@ -328,7 +329,7 @@ def get_video(
     *,
     db: Session = Depends(get_db),
     video_id: str,
-    current_user: User = Depends(get_current_verified_user)
+    current_user: Principal = Depends(get_current_verified_user)
 ) -> Any:
     """Obtém um vídeo específico pelo ID ou UID
     
@@ -358,10 +359,6 @@ def get_video(
     )
     
     try:
-        # Recarrega o usuário da sessão para garantir que os atributos estejam atualizados
-        current_user = db.merge(current_user)
-        db.refresh(current_user)
-        
         # Tenta converter para inteiro para compatibilidade com IDs numéricos
         try:
             numeric_id = int(video_id)
@@ -396,7 +393,7 @@ def get_video(
                 "operation": "get_video_success"
             }
         )
-        return video
+        return _to_schema(video)
     except HTTPException:
         # Re-lança exceções HTTP já tratadas
         raise
@@ -433,7 +430,7 @@ def download_video(
     *,
     db: Session = Depends(get_db),
     video_guid: str,
-    current_user: User = Depends(get_current_verified_user)
+    current_user: Principal = Depends(get_current_verified_user)
 ) -> Any:
     """Gera um link de download para um vídeo específico
     
@@ -463,10 +460,6 @@ def download_video(
     )
     
     try:
-        # Recarrega o usuário da sessão para garantir que os atributos estejam atualizados
-        current_user = db.merge(current_user)
-        db.refresh(current_user)
-        
         # Verifica se o vídeo existe e pertence ao usuário atual
         video = db.query(Video).filter(Video.guid == video_guid, Video.user_id == current_user.id).first()
         if not video:
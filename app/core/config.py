@@ -13,18 +13,83 @@ load_dotenv(dotenv_path=".env.dev")
 class Settings(BaseSettings):
     API_STR: str = os.getenv("API_STR", "/api")
     PROJECT_NAME: str = os.getenv("PROJECT_NAME", "FastAPI Backend")
+    # URL pública da aplicação (ex.: https://api.exemplo.com), usada nas URLs absolutas
+    # devolvidas aos clientes; vazia, as URLs são relativas à raiz do host
+    PUBLIC_BASE_URL: str = os.getenv("PUBLIC_BASE_URL", "")
     
     # Secret key for JWT
     # Obtém a chave secreta das variáveis de ambiente
     # Gera uma chave aleatória apenas para desenvolvimento se não estiver definida
     SECRET_KEY: str = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
     
+    # Backend de armazenamento: "azure", "azurite" (emulador) ou "local" (sistema de arquivos)
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "azure")
+    # Backend local: diretório raiz dos containers e URL base da rota /storage
+    LOCAL_STORAGE_PATH: str = os.getenv("LOCAL_STORAGE_PATH", "storage")
+    LOCAL_STORAGE_BASE_URL: str = os.getenv("LOCAL_STORAGE_BASE_URL", "http://localhost:8000/api/storage")
+    # Chave das URLs assinadas do backend local; obrigatória com STORAGE_BACKEND=local e igual em todos os processos
+    LOCAL_STORAGE_SIGNING_KEY: str = os.getenv("LOCAL_STORAGE_SIGNING_KEY", "")
+    
     # Azure Blob Storage settings
     AZURE_STORAGE_CONNECTION_STRING: str = os.getenv("AZURE_STORAGE_CONNECTION_STRING", "")
     AZURE_STORAGE_CONTAINER_NAME: str = os.getenv("AZURE_STORAGE_CONTAINER_NAME", "videos")
+    # Container dos artefatos do pipeline (imagens, narrações), endereçados pelo SHA-256
+    AZURE_STORAGE_ARTIFACTS_CONTAINER_NAME: str = os.getenv("AZURE_STORAGE_ARTIFACTS_CONTAINER_NAME", "artifacts")
+    # Pool de conexões HTTP e timeouts (segundos) do cliente compartilhado do Blob Storage
+    AZURE_STORAGE_POOL_CONNECTIONS: int = int(os.getenv("AZURE_STORAGE_POOL_CONNECTIONS", 10))
+    AZURE_STORAGE_POOL_MAXSIZE: int = int(os.getenv("AZURE_STORAGE_POOL_MAXSIZE", 32))
+    AZURE_STORAGE_CONNECTION_TIMEOUT: int = int(os.getenv("AZURE_STORAGE_CONNECTION_TIMEOUT", 10))
+    AZURE_STORAGE_READ_TIMEOUT: int = int(os.getenv("AZURE_STORAGE_READ_TIMEOUT", 120))
+    # Upload em blocos paralelos (tamanhos em bytes)
+    AZURE_STORAGE_MAX_BLOCK_SIZE: int = int(os.getenv("AZURE_STORAGE_MAX_BLOCK_SIZE", 8 * 1024 * 1024))
+    AZURE_STORAGE_MAX_SINGLE_PUT_SIZE: int = int(os.getenv("AZURE_STORAGE_MAX_SINGLE_PUT_SIZE", 16 * 1024 * 1024))
+    AZURE_STORAGE_MAX_CONCURRENCY: int = int(os.getenv("AZURE_STORAGE_MAX_CONCURRENCY", 8))
+    # Uploads em segundo plano: workers assíncronos e tamanho máximo da fila
+    AZURE_STORAGE_UPLOAD_WORKERS: int = int(os.getenv("AZURE_STORAGE_UPLOAD_WORKERS", 2))
+    AZURE_STORAGE_UPLOAD_QUEUE_SIZE: int = int(os.getenv("AZURE_STORAGE_UPLOAD_QUEUE_SIZE", 50))
+    # Uploads interrompidos (ex.: reinício do processo): intervalo do heartbeat do dono, idade
+    # máxima do heartbeat e intervalo da recuperação
+    AZURE_STORAGE_UPLOAD_HEARTBEAT_SECONDS: int = int(os.getenv("AZURE_STORAGE_UPLOAD_HEARTBEAT_SECONDS", 60))
+    AZURE_STORAGE_UPLOAD_STALE_MINUTES: int = int(os.getenv("AZURE_STORAGE_UPLOAD_STALE_MINUTES", 15))
+    AZURE_STORAGE_UPLOAD_RECOVERY_INTERVAL_SECONDS: int = int(os.getenv("AZURE_STORAGE_UPLOAD_RECOVERY_INTERVAL_SECONDS", 300))
+    # Renderiza em MP4 fragmentado e envia os blocos ao Blob Storage durante a renderização
+    AZURE_STORAGE_UPLOAD_WHILE_RENDERING: bool = os.getenv("AZURE_STORAGE_UPLOAD_WHILE_RENDERING", "False").lower() == "true"
+    # Cache de URLs com SAS geradas localmente
+    AZURE_STORAGE_SAS_CACHE_SIZE: int = int(os.getenv("AZURE_STORAGE_SAS_CACHE_SIZE", 10000))
+    AZURE_STORAGE_SAS_EXPIRY_BUCKET_MINUTES: int = int(os.getenv("AZURE_STORAGE_SAS_EXPIRY_BUCKET_MINUTES", 15))
+    AZURE_STORAGE_SAS_MIN_REMAINING_MINUTES: int = int(os.getenv("AZURE_STORAGE_SAS_MIN_REMAINING_MINUTES", 30))
+    
+    # Empacotamento HLS opcional após a renderização
+    HLS_ENABLED: bool = os.getenv("HLS_ENABLED", "False").lower() == "true"
+    # Renditions no formato altura:bitrate de vídeo, separadas por vírgula
+    HLS_RENDITIONS: str = os.getenv("HLS_RENDITIONS", "720:2800k,480:1200k,360:700k")
+    HLS_SEGMENT_SECONDS: int = int(os.getenv("HLS_SEGMENT_SECONDS", 4))
+    # Fila própria do empacotamento HLS, para que as transcodificações não atrasem os uploads
+    HLS_WORKERS: int = int(os.getenv("HLS_WORKERS", 1))
+    HLS_QUEUE_SIZE: int = int(os.getenv("HLS_QUEUE_SIZE", 10))
+
+    # Reservas de créditos: validade de uma reserva e intervalo do sweeper que libera as expiradas
+    CREDIT_HOLD_TTL_MINUTES: int = int(os.getenv("CREDIT_HOLD_TTL_MINUTES", 60))
+    CREDIT_HOLD_SWEEP_INTERVAL_SECONDS: int = int(os.getenv("CREDIT_HOLD_SWEEP_INTERVAL_SECONDS", 300))
+
+    # Cache de saldos de crédito por processo (TTL 0 desativa); com NOTIFY, escritas de outros processos invalidam o cache via LISTEN/NOTIFY do Postgres
+    CREDIT_BALANCE_CACHE_TTL_SECONDS: int = int(os.getenv("CREDIT_BALANCE_CACHE_TTL_SECONDS", 30))
+    CREDIT_BALANCE_CACHE_SIZE: int = int(os.getenv("CREDIT_BALANCE_CACHE_SIZE", 10000))
+    CREDIT_BALANCE_NOTIFY_ENABLED: bool = os.getenv("CREDIT_BALANCE_NOTIFY_ENABLED", "False").lower() == "true"
 
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60 * 24 * 8))
+    # Tokens JWT já verificados mantidos em cache por processo até o exp (0 desativa)
+    JWT_CACHE_SIZE: int = int(os.getenv("JWT_CACHE_SIZE", 10000))
+    # Snapshot do usuário autenticado mantido em cache por processo (TTL 0 desativa)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 30))
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+    # Hashing de senhas: pool dedicado (tarefas além de workers + fila recebem 503) e parâmetros do Argon2
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 32))
+    ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", 3))
+    ARGON2_MEMORY_COST: int = int(os.getenv("ARGON2_MEMORY_COST", 65536))  # KiB
+    ARGON2_PARALLELISM: int = int(os.getenv("ARGON2_PARALLELISM", 4))
     
     # CORS settings
     BACKEND_CORS_ORIGINS: List[str] = os.getenv("BACKEND_CORS_ORIGINS", "http://localhost:3000,http://localhost:8080,http://localhost:4200")
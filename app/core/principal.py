@@ -0,0 +1,256 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+import threading
+import time
+import uuid
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.permission import Permission
+from app.models.role import Role
+from app.models.role_permission import RolePermission
+from app.models.user import User
+from app.models.user_role import UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Snapshot imutável do usuário autenticado, usado pelas dependências e rotas.
+
+    Não está vinculado a nenhuma sessão: os atributos podem ser lidos após commits sem
+    recarregar o usuário do banco.
+    """
+    id: int
+    guid: uuid.UUID
+    email: str
+    is_active: bool
+    is_verified: bool
+    profile_type: str
+    perm_version: int
+    permissions: FrozenSet[str]
+
+
+# Mapa papel -> permissões compartilhado pelo processo; recarregado após alterações em papéis
+# ou permissões feitas por este processo e, nos demais casos, ao fim de PRINCIPAL_CACHE_TTL_SECONDS
+_role_permissions: Optional[Dict[int, FrozenSet[str]]] = None
+_role_permissions_expires = 0.0
+_role_permissions_lock = threading.Lock()
+
+
+def get_role_permissions(db: Session) -> Dict[int, FrozenSet[str]]:
+    """Retorna o mapa id do papel -> nomes das permissões, carregado com uma única consulta"""
+    global _role_permissions, _role_permissions_expires
+    role_permissions = _role_permissions
+    if role_permissions is not None and _role_permissions_expires > time.monotonic():
+        return role_permissions
+
+    with _role_permissions_lock:
+        if _role_permissions is None or _role_permissions_expires <= time.monotonic():
+            rows = db.execute(
+                select(RolePermission.role_id, Permission.name)
+                .join(Permission, Permission.id == RolePermission.permission_id)
+            ).all()
+            permissions_by_role: Dict[int, set] = {}
+            for role_id, name in rows:
+                permissions_by_role.setdefault(role_id, set()).add(name)
+            _role_permissions = {role_id: frozenset(names) for role_id, names in permissions_by_role.items()}
+            _role_permissions_expires = time.monotonic() + settings.PRINCIPAL_CACHE_TTL_SECONDS
+        return _role_permissions
+
+
+def reset_role_permissions() -> None:
+    """Descarta o mapa de permissões; o próximo acesso o recarrega do banco"""
+    global _role_permissions
+    with _role_permissions_lock:
+        _role_permissions = None
+
+
+def resolve_permissions(db: Session, user_id: int) -> FrozenSet[str]:
+    """Resolve as permissões do usuário: uma consulta pelos papéis e a união dos conjuntos do mapa"""
+    role_ids = db.execute(select(UserRole.role_id).where(UserRole.user_id == user_id)).scalars().all()
+    role_permissions = get_role_permissions(db)
+    return frozenset().union(*(role_permissions.get(role_id, frozenset()) for role_id in role_ids))
+
+
+def permission_claims(db: Session, user: User) -> Dict[str, Any]:
+    """
+    Claims de autorização incluídas no token de acesso: permissões efetivas e sua versão.
+
+    As permissões são lidas diretamente do banco (usuário -> papéis -> permissões), e não
+    do mapa em cache: o token vale por ACCESS_TOKEN_EXPIRE_MINUTES com a perm_version
+    atual, então um mapa desatualizado em algum processo assinaria permissões revogadas.
+    """
+    permissions = db.execute(
+        select(Permission.name)
+        .join(RolePermission, RolePermission.permission_id == Permission.id)
+        .join(UserRole, UserRole.role_id == RolePermission.role_id)
+        .where(UserRole.user_id == user.id)
+        .distinct()
+    ).scalars().all()
+    return {
+        "permissions": sorted(permissions),
+        "perm_version": user.perm_version or 0
+    }
+
+
+def build_principal(db: Session, user: User, claims: Optional[Dict[str, Any]] = None) -> Principal:
+    """
+    Monta o snapshot de um usuário carregado do banco, incluindo suas permissões.
+
+    Se as claims do token trouxerem as permissões na mesma perm_version do usuário, elas
+    são usadas sem consultar os papéis; caso contrário (tokens sem essas claims), as
+    permissões são resolvidas no banco.
+    """
+    perm_version = user.perm_version or 0
+    if claims and claims.get("perm_version") == perm_version and "permissions" in claims:
+        permissions = frozenset(claims["permissions"])
+    else:
+        permissions = resolve_permissions(db, user.id)
+    return Principal(
+        id=user.id,
+        guid=user.guid,
+        email=user.email,
+        is_active=bool(user.is_active),
+        is_verified=bool(user.is_verified),
+        profile_type=user.profile_type,
+        perm_version=perm_version,
+        permissions=permissions
+    )
+
+
+# Usuários autenticados: guid (claim sub do token) -> (snapshot, expiração)
+_principal_cache: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+_principal_cache_lock = threading.Lock()
+
+
+def get_cached_principal(guid: str) -> Optional[Principal]:
+    """Retorna o snapshot em cache do usuário, ou None se não houver entrada válida"""
+    now = time.monotonic()
+    with _principal_cache_lock:
+        cached = _principal_cache.get(guid)
+        if cached is None:
+            return None
+        if cached[1] <= now:
+            del _principal_cache[guid]
+            return None
+        _principal_cache.move_to_end(guid)
+        return cached[0]
+
+
+def store_principal(guid: str, principal: Principal) -> None:
+    """Grava o snapshot do usuário no cache por PRINCIPAL_CACHE_TTL_SECONDS"""
+    if settings.PRINCIPAL_CACHE_TTL_SECONDS <= 0:
+        return
+    with _principal_cache_lock:
+        _principal_cache[guid] = (principal, time.monotonic() + settings.PRINCIPAL_CACHE_TTL_SECONDS)
+        _principal_cache.move_to_end(guid)
+        while len(_principal_cache) > settings.PRINCIPAL_CACHE_SIZE:
+            _principal_cache.popitem(last=False)
+
+
+def invalidate_principal(guid: str) -> None:
+    """Remove o usuário do cache"""
+    with _principal_cache_lock:
+        _principal_cache.pop(str(guid), None)
+
+
+def clear_principal_cache() -> None:
+    """Descarta todos os usuários em cache"""
+    with _principal_cache_lock:
+        _principal_cache.clear()
+
+
+# Revogação das claims de permissão: alterações de papéis incrementam a perm_version dos
+# usuários afetados na mesma transação, invalidando os tokens emitidos antes delas
+def _bump_perm_version(connection, user_ids) -> None:
+    user_table = User.__table__
+    connection.execute(
+        update(user_table)
+        .where(user_table.c.id.in_(user_ids))
+        .values(perm_version=user_table.c.perm_version + 1)
+    )
+
+
+def _bump_user_role(mapper, connection, target: UserRole) -> None:
+    _bump_perm_version(connection, [target.user_id])
+
+
+def _bump_role_users(mapper, connection, target) -> None:
+    role_id = target.id if isinstance(target, Role) else target.role_id
+    _bump_perm_version(connection, select(UserRole.user_id).where(UserRole.role_id == role_id))
+
+
+def _bump_permission_users(mapper, connection, target: Permission) -> None:
+    _bump_perm_version(
+        connection,
+        select(UserRole.user_id)
+        .join(RolePermission, RolePermission.role_id == UserRole.role_id)
+        .where(RolePermission.permission_id == target.id)
+    )
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(UserRole, _event, _bump_user_role)
+    event.listen(RolePermission, _event, _bump_role_users)
+for _event in ("after_update", "after_delete"):
+    event.listen(Role, _event, _bump_role_users)
+    event.listen(Permission, _event, _bump_permission_users)
+
+
+# Invalidação após o commit: alterações em usuários descartam o snapshot do próprio
+# usuário; alterações de papéis dos usuários descartam o cache inteiro; alterações em
+# papéis ou permissões (raras) também recarregam o mapa de permissões.
+# Outros processos (e alterações feitas fora do ORM) só são vistos ao fim do TTL do
+# snapshot e do mapa de permissões.
+_PENDING_KEY = "principal_invalidations"
+_ALL_PRINCIPALS = "*"
+_ROLE_PERMISSIONS = "role_permissions"
+
+
+def _mark_pending(target, key: str) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(key)
+
+
+def _mark_user_changed(mapper, connection, target: User) -> None:
+    _mark_pending(target, str(target.guid))
+
+
+def _mark_user_roles_changed(mapper, connection, target: UserRole) -> None:
+    _mark_pending(target, _ALL_PRINCIPALS)
+
+
+def _mark_role_permissions_changed(mapper, connection, target) -> None:
+    _mark_pending(target, _ROLE_PERMISSIONS)
+
+
+for _event in ("after_update", "after_delete"):
+    event.listen(User, _event, _mark_user_changed)
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(UserRole, _event, _mark_user_roles_changed)
+    for _model in (Role, Permission, RolePermission):
+        event.listen(_model, _event, _mark_role_permissions_changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_principal_invalidations(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if _ROLE_PERMISSIONS in pending:
+        reset_role_permissions()
+    if _ALL_PRINCIPALS in pending or _ROLE_PERMISSIONS in pending:
+        clear_principal_cache()
+        return
+    for guid in pending:
+        invalidate_principal(guid)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,7 +1,10 @@
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union, Dict, Tuple
+from typing import Any, Callable, Optional, Union, Dict, Tuple
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
+import threading
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -13,7 +16,11 @@ from app.core.logger import get_logger
 logger = get_logger(__name__)
 
 password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-argon2_hasher = PasswordHasher()
+argon2_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM
+)
 
 JWT_ALGORITHM = "HS256"
 
@@ -154,6 +161,9 @@ def create_access_token(subject: str, expires_delta: timedelta = None, user_data
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica a senha contra um hash, detectando o algoritmo"""
 
+    if not hashed_password:
+        # Usuários OAuth não têm senha
+        return False
     if hashed_password.startswith("$argon2"):
         # Verifica usando Argon2
         try:
@@ -168,4 +178,64 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Generate a password hash using Argon2"""
-    return argon2_hasher.hash(password)
\ No newline at end of file
+    return argon2_hasher.hash(password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Indica se o hash deve ser refeito: bcrypt legado ou Argon2 com parâmetros diferentes dos atuais"""
+    if not hashed_password.startswith("$argon2"):
+        return True
+    return argon2_hasher.check_needs_rehash(hashed_password)
+
+
+class PasswordHashingBusy(Exception):
+    """Lançada quando a fila do pool de hashing de senhas está cheia"""
+
+
+class PasswordHashingPool:
+    """
+    Pool dedicado e limitado para o hashing de senhas (Argon2/bcrypt).
+
+    O hashing é intencionalmente caro; executá-lo no threadpool compartilhado das rotas
+    síncronas faz um pico de logins atrasar as demais requisições. Aqui ele roda em
+    max_workers threads próprias (Argon2 e bcrypt liberam o GIL), com no máximo
+    max_queue tarefas aguardando; além disso, submit falha imediatamente com
+    PasswordHashingBusy, que as rotas convertem em 503.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hashing")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Executa fn(*args) no pool e aguarda o resultado sem bloquear o event loop"""
+        if not self._slots.acquire(blocking=False):
+            logger.warning("Password hashing queue is full")
+            raise PasswordHashingBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """Aguarda as tarefas em andamento e encerra as threads"""
+        self._executor.shutdown(wait=True)
+
+
+password_hashing_pool = PasswordHashingPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password executado no pool de hashing"""
+    return await password_hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash executado no pool de hashing"""
+    return await password_hashing_pool.run(get_password_hash, password)
@@ -5,4 +5,6 @@ from .user_role import UserRole
 from .role_permission import RolePermission
 from .video import Video
 from .video_credit import VideoCredit
-from .video_credit_transaction import VideoCreditTransaction
\ No newline at end of file
+from .video_credit_transaction import VideoCreditTransaction
+from .video_credit_hold import VideoCreditHold
+from .video_credit_checkpoint import VideoCreditCheckpoint
\ No newline at end of file
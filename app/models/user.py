@@ -10,6 +10,7 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
     profile_type = Column(Enum('Free', 'Gold', name='profile_types'), default='Free')
+    perm_version = Column(Integer, default=0, server_default="0", nullable=False)  # Incrementado quando as permissões efetivas mudam
     
     # OAuth related fields
     oauth_provider = Column(String, nullable=True)  # 'google', etc.
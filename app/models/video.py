@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Float, JSON, ARRAY, DateTime
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Float, JSON, ARRAY, DateTime, Enum
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 from datetime import datetime
@@ -9,6 +9,14 @@ class Video(Base):
     title = Column(String, nullable=False, index=True)
     description = Column(String, nullable=True)
     url = Column(String, nullable=True)
+    blob_container = Column(String, nullable=True)  # Container do vídeo no Blob Storage
+    blob_name = Column(String, nullable=True)  # Nome do blob do vídeo no Blob Storage
+    poster_url = Column(String, nullable=True)  # URL do poster (JPEG) no armazenamento
+    thumbnail_url = Column(String, nullable=True)  # URL da faixa de miniaturas (JPEG) no armazenamento
+    hls_prefix = Column(String, nullable=True)  # Prefixo do pacote HLS no container de vídeos
+    upload_state = Column(Enum('pending', 'uploading', 'done', 'failed', name='upload_states'), nullable=True)  # Estado do upload para o Blob Storage
+    upload_owner = Column(String, nullable=True)  # Processo (nó:token) que enfileirou o upload
+    upload_heartbeat_at = Column(DateTime, nullable=True)  # Última renovação da posse do upload pelo dono
     is_validated = Column(Boolean, default=False)
     user_id = Column(Integer, ForeignKey("tb_user.id"), nullable=False)
     duration = Column(Integer, nullable=True)  # Duração do vídeo em segundos
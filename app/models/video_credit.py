@@ -10,10 +10,17 @@ class VideoCredit(Base):
     """
     user_id = Column(Integer, ForeignKey("tb_user.id"), nullable=False, unique=True)
     balance = Column(Integer, default=10, nullable=False)  # Saldo inicial de 10 vídeos
+    held = Column(Integer, default=0, server_default="0", nullable=False)  # Soma das reservas ativas
     
     # Relacionamentos
     user = relationship("User", backref="video_credit")
     transactions = relationship("VideoCreditTransaction", back_populates="video_credit")
+    holds = relationship("VideoCreditHold", back_populates="video_credit")
+    
+    @property
+    def available(self) -> int:
+        """Saldo disponível: saldo menos as reservas ativas"""
+        return self.balance - (self.held or 0)
     
     def __repr__(self):
         return f"<VideoCredit user_id={self.user_id} balance={self.balance}>"
\ No newline at end of file
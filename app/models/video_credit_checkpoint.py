@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, ForeignKey
+
+from app.db.base_class import Base
+
+class VideoCreditCheckpoint(Base):
+    """
+    Ponto de verificação da conciliação do histórico de créditos de uma conta.
+    Guarda até qual transação o histórico já foi somado e o saldo esperado nesse ponto,
+    para que a próxima conciliação some apenas as transações novas.
+    """
+    video_credit_id = Column(Integer, ForeignKey("tb_video_credit.id"), nullable=False, unique=True)
+    last_transaction_id = Column(Integer, nullable=False, default=0)  # Última transação somada
+    expected_balance = Column(Integer, nullable=False)  # Saldo inicial somado às transações até last_transaction_id
+    drift = Column(Integer, nullable=False, default=0)  # Saldo gravado menos o esperado na última conciliação
+    
+    def __repr__(self):
+        return f"<VideoCreditCheckpoint video_credit_id={self.video_credit_id} drift={self.drift}>"
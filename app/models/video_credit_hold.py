@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, Enum, DateTime, Index
+from sqlalchemy.orm import relationship
+
+from app.db.base_class import Base
+
+class VideoCreditHold(Base):
+    """
+    Modelo para reservas de créditos durante gerações de vídeo longas.
+    Uma reserva ativa bloqueia o valor no saldo disponível até ser capturada
+    (vira uma transação de consumo) ou liberada (falha ou expiração).
+    """
+    video_credit_id = Column(Integer, ForeignKey("tb_video_credit.id"), nullable=False)
+    amount = Column(Integer, nullable=False)  # Créditos reservados
+    status = Column(Enum('active', 'captured', 'released', name='credit_hold_states'), nullable=False, default='active')
+    expires_at = Column(DateTime, nullable=False)  # Após esta data a reserva é liberada pelo sweeper
+    description = Column(String, nullable=True)  # Descrição opcional da reserva
+    transaction_id = Column(Integer, ForeignKey("tb_video_credit_transaction.id"), nullable=True)  # Transação gerada na captura
+    
+    # Relacionamentos
+    video_credit = relationship("VideoCredit", back_populates="holds")
+    
+    __table_args__ = (
+        Index("ix_tb_video_credit_hold_status_expires_at", "status", "expires_at"),
+    )
+    
+    def __repr__(self):
+        return f"<VideoCreditHold id={self.id} status={self.status} amount={self.amount}>"
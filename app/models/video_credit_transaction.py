@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Enum
+from sqlalchemy import Column, Integer, ForeignKey, String, Enum, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -18,4 +18,13 @@ class VideoCreditTransaction(Base):
     video_credit = relationship("VideoCredit", back_populates="transactions")
     
     def __repr__(self):
-        return f"<VideoCreditTransaction id={self.id} type={self.transaction_type} amount={self.amount}>"
\ No newline at end of file
+        return f"<VideoCreditTransaction id={self.id} type={self.transaction_type} amount={self.amount}>"
+
+
+# Cobre o histórico paginado por cursor: filtra pelo crédito e já entrega as linhas na ordem (created_at, id) decrescente
+Index(
+    "ix_tb_video_credit_transaction_credit_created_at_id",
+    VideoCreditTransaction.video_credit_id,
+    VideoCreditTransaction.created_at.desc(),
+    VideoCreditTransaction.id.desc()
+)
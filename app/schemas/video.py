@@ -21,6 +21,9 @@ class Video(VideoBase):
     user_id: int
     duration: Optional[int] = None
     generation_time: Optional[float] = None
+    upload_state: Optional[str] = None
+    poster_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
     
     class Config:
         from_attributes = True
\ No newline at end of file
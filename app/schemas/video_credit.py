@@ -1,6 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Esquema para transações de crédito
 class VideoCreditTransactionBase(BaseModel):
@@ -23,6 +23,8 @@ class VideoCreditBase(BaseModel):
 class VideoCredit(VideoCreditBase):
     id: int
     user_id: int
+    held: int = 0
+    available: int
     created_at: datetime
     updated_at: datetime
     
@@ -33,4 +35,20 @@ class VideoCreditWithTransactions(VideoCredit):
     transactions: List[VideoCreditTransaction] = []
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Esquemas para concessão de créditos em lote
+class CreditGrant(BaseModel):
+    user_id: int
+    amount: int
+    description: Optional[str] = None
+
+class BulkCreditGrantRequest(BaseModel):
+    grants: List[CreditGrant] = Field(..., min_length=1, max_length=10000)
+
+class CreditGrantResult(BaseModel):
+    user_id: int
+    amount: int
+    status: str  # granted, invalid_amount, user_not_found ou failed
+    balance_after: Optional[int] = None
+    error_id: Optional[str] = None
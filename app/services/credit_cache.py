@@ -0,0 +1,181 @@
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+import select
+import threading
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.models.video_credit import VideoCredit
+
+logger = get_logger("credit_cache")
+
+# Canal do Postgres usado para invalidar o cache de saldos entre processos
+NOTIFY_CHANNEL = "credit_balance_changed"
+
+# Identifica as notificações enviadas por este processo, que já atualizou o próprio cache
+_PROCESS_TOKEN = uuid.uuid4().hex
+
+_balance_cache: "OrderedDict[int, Tuple[VideoCredit, float]]" = OrderedDict()
+_balance_cache_lock = threading.Lock()
+
+
+def _snapshot(credit: VideoCredit) -> VideoCredit:
+    # Cópia desvinculada da sessão: o cache nunca guarda nem entrega objetos gerenciados pelo ORM
+    return VideoCredit(**{column.key: getattr(credit, column.key) for column in VideoCredit.__table__.columns})
+
+
+def get_cached_balance(user_id: int) -> Optional[VideoCredit]:
+    """Retorna uma cópia do crédito do usuário em cache, ou None se não houver entrada válida"""
+    now = time.monotonic()
+    with _balance_cache_lock:
+        cached = _balance_cache.get(user_id)
+        if not cached:
+            return None
+        if cached[1] <= now:
+            del _balance_cache[user_id]
+            return None
+        _balance_cache.move_to_end(user_id)
+        credit = cached[0]
+    return _snapshot(credit)
+
+
+def store_balance(credit: VideoCredit) -> None:
+    """
+    Grava o crédito no cache (write-through após commit ou preenchimento após leitura).
+
+    Uma entrada com updated_at mais recente não é substituída, para que uma leitura
+    antiga ou um commit concorrente que termine depois não sobrescreva o saldo atual.
+    """
+    if settings.CREDIT_BALANCE_CACHE_TTL_SECONDS <= 0:
+        return
+    snapshot = _snapshot(credit)
+    expires = time.monotonic() + settings.CREDIT_BALANCE_CACHE_TTL_SECONDS
+    with _balance_cache_lock:
+        cached = _balance_cache.get(snapshot.user_id)
+        if cached and cached[1] > time.monotonic() and cached[0].updated_at > snapshot.updated_at:
+            return
+        _balance_cache[snapshot.user_id] = (snapshot, expires)
+        _balance_cache.move_to_end(snapshot.user_id)
+        while len(_balance_cache) > settings.CREDIT_BALANCE_CACHE_SIZE:
+            _balance_cache.popitem(last=False)
+
+
+def invalidate_balances(user_ids: Iterable[int]) -> None:
+    """Remove do cache os saldos dos usuários informados"""
+    with _balance_cache_lock:
+        for user_id in user_ids:
+            _balance_cache.pop(user_id, None)
+
+
+def clear_balance_cache() -> None:
+    """Descarta todos os saldos em cache"""
+    with _balance_cache_lock:
+        _balance_cache.clear()
+
+
+def publish_balance_change(db: Session, user_ids: Iterable[int]) -> None:
+    """
+    Avisa os demais processos que os saldos dos usuários mudaram.
+
+    Deve ser chamada antes do commit: o Postgres só entrega o NOTIFY quando a transação
+    é confirmada, e o descarta se ela for desfeita.
+    """
+    if not settings.CREDIT_BALANCE_NOTIFY_ENABLED:
+        return
+    for user_id in set(user_ids):
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": NOTIFY_CHANNEL, "payload": f"{_PROCESS_TOKEN}:{user_id}"}
+        )
+
+
+class BalanceInvalidationListener:
+    """
+    Escuta o canal NOTIFY_CHANNEL em uma conexão dedicada e invalida os saldos alterados
+    por outros processos.
+
+    Se a conexão cair, o cache inteiro é descartado (notificações podem ter sido perdidas)
+    e a escuta é retomada após poll_interval segundos.
+    """
+
+    def __init__(self, poll_interval: float = 5.0):
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia a thread de escuta, se ainda não estiver em execução"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="credit-balance-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe a escuta"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(self.poll_interval)
+            self._thread = None
+
+    def _handle(self, payload: str) -> None:
+        token, _, user_id = payload.partition(":")
+        if token != _PROCESS_TOKEN and user_id.isdigit():
+            invalidate_balances([int(user_id)])
+
+    def _listen(self) -> None:
+        from app.db.session import engine
+
+        # Conexão retirada do pool: fica presa ao LISTEN enquanto o processo estiver ativo
+        fairy = engine.raw_connection()
+        fairy.detach()
+        connection = fairy.connection
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            clear_balance_cache()
+            logger.info(
+                "Escutando invalidações do cache de saldos",
+                extra={
+                    "channel": NOTIFY_CHANNEL,
+                    "operation": "credit_balance_listen"
+                }
+            )
+            while not self._stop_event.is_set():
+                if select.select([connection], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    self._handle(connection.notifies.pop(0).payload)
+        finally:
+            connection.close()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                clear_balance_cache()
+                logger.error(
+                    "Erro na escuta de invalidações do cache de saldos",
+                    extra={
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                        "operation": "credit_balance_listen"
+                    }
+                )
+                self._stop_event.wait(self.poll_interval)
+
+
+_balance_invalidation_listener = BalanceInvalidationListener()
+
+
+def get_balance_invalidation_listener() -> BalanceInvalidationListener:
+    """Retorna o listener de invalidações compartilhado pelo processo"""
+    return _balance_invalidation_listener
@@ -1,17 +1,32 @@
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
+import base64
+import binascii
+import threading
 import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
 
+from sqlalchemy import Integer, bindparam, column, insert, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.models.user import User
 from app.models.video_credit import VideoCredit
 from app.models.video_credit_transaction import VideoCreditTransaction
+from app.models.video_credit_hold import VideoCreditHold
+from app.core.config import settings
+from app.services.credit_cache import (
+    get_cached_balance, invalidate_balances, publish_balance_change, store_balance
+)
 from app.core.exceptions import DomainException
 from app.core.logger import get_logger
 
 logger = get_logger("credit_service")
 
+# Saldo concedido a cada novo usuário
+INITIAL_CREDIT_BALANCE = 10
+
 
 class InsufficientCreditsException(DomainException):
     """Lançada quando um usuário não tem créditos suficientes para gerar um vídeo"""
@@ -28,36 +43,64 @@ class CreditTransactionException(DomainException):
         super().__init__(self.detail)
 
 
-def get_user_credit(db: Session, user_id: int) -> VideoCredit:
+def provision_user_credit(db: Session, user_id: int) -> None:
     """
-    Obtém o registro de crédito do usuário. Se não existir, cria um novo com saldo inicial.
+    Cria o registro de crédito do usuário com o saldo inicial, se ainda não existir.
+    
+    Usa INSERT ... ON CONFLICT DO NOTHING, então chamadas concorrentes ou repetidas são
+    seguras. Não faz commit: o registro é gravado na transação do chamador (cadastro do usuário).
+    
+    Args:
+        db: Sessão do banco de dados
+        user_id: ID do usuário
+    """
+    db.execute(
+        pg_insert(VideoCredit.__table__)
+        .values(user_id=user_id, balance=INITIAL_CREDIT_BALANCE)
+        .on_conflict_do_nothing(index_elements=["user_id"])
+    )
+
+
+def get_user_credit(db: Session, user_id: int) -> Optional[VideoCredit]:
+    """
+    Obtém o registro de crédito do usuário.
+    
+    O registro é criado no cadastro (provision_user_credit); esta função apenas consulta.
     
     Args:
         db: Sessão do banco de dados
         user_id: ID do usuário
         
     Returns:
-        VideoCredit: O objeto de crédito do usuário
+        Optional[VideoCredit]: O objeto de crédito do usuário ou None se não existir
     """
-    credit = db.query(VideoCredit).filter(VideoCredit.user_id == user_id).first()
+    return db.query(VideoCredit).filter(VideoCredit.user_id == user_id).first()
+
+
+def get_cached_user_credit(db: Session, user_id: int) -> Optional[VideoCredit]:
+    """
+    Obtém o crédito do usuário a partir do cache de saldos, consultando o banco só na falta.
     
-    if not credit:
-        # Cria um novo registro de crédito com saldo inicial de 10
-        credit = VideoCredit(user_id=user_id, balance=10)
-        db.add(credit)
-        db.commit()
-        db.refresh(credit)
+    Todas as alterações de saldo feitas por este módulo atualizam o cache após o commit;
+    alterações feitas por outros processos são vistas ao fim de CREDIT_BALANCE_CACHE_TTL_SECONDS
+    ou imediatamente, com CREDIT_BALANCE_NOTIFY_ENABLED.
+    
+    Args:
+        db: Sessão do banco de dados
+        user_id: ID do usuário
         
-        logger.info(
-            "Registro de crédito criado para usuário",
-            extra={
-                "user_id": user_id,
-                "initial_balance": credit.balance,
-                "operation": "create_credit"
-            }
-        )
+    Returns:
+        Optional[VideoCredit]: Cópia desvinculada da sessão do crédito do usuário, ou None se não existir
+    """
+    credit = get_cached_balance(user_id)
+    if credit is not None:
+        return credit
     
-    return credit
+    credit = get_user_credit(db, user_id)
+    if credit is None:
+        return None
+    store_balance(credit)
+    return get_cached_balance(user_id) or credit
 
 
 def check_user_credit_balance(db: Session, user_id: int) -> int:
@@ -69,10 +112,84 @@ def check_user_credit_balance(db: Session, user_id: int) -> int:
         user_id: ID do usuário
         
     Returns:
-        int: Saldo atual de créditos
+        int: Saldo disponível, descontadas as reservas ativas
     """
-    credit = get_user_credit(db, user_id)
-    return credit.balance
+    credit = get_cached_user_credit(db, user_id)
+    return credit.available if credit else 0
+
+
+def _apply_credit_change(
+    db: Session,
+    user_id: int,
+    amount: int,
+    transaction_type: str,
+    description: str
+) -> Optional[Tuple[VideoCredit, VideoCreditTransaction]]:
+    """
+    Aplica uma variação de saldo e registra a transação no mesmo commit.
+    
+    O saldo é alterado por um único UPDATE ... RETURNING, sem leitura prévia; para
+    débitos, a condição balance - held >= valor fica no próprio UPDATE, de modo que
+    requisições concorrentes nunca perdem atualizações nem consomem créditos reservados.
+    
+    Args:
+        db: Sessão do banco de dados
+        user_id: ID do usuário
+        amount: Variação do saldo (negativa para consumo)
+        transaction_type: Tipo da transação (purchase, consumption, refund)
+        description: Descrição da transação
+        
+    Returns:
+        Optional[Tuple[VideoCredit, VideoCreditTransaction]]: O crédito e a transação, ou None
+        se nenhuma linha foi atualizada (usuário sem registro ou saldo insuficiente)
+    """
+    credit_table = VideoCredit.__table__
+    statement = (
+        update(credit_table)
+        .where(credit_table.c.user_id == user_id)
+        .values(balance=credit_table.c.balance + amount)
+        .returning(*credit_table.c)
+    )
+    if amount < 0:
+        statement = statement.where(credit_table.c.balance - credit_table.c.held >= -amount)
+    
+    credit_row = db.execute(statement).first()
+    if credit_row is None:
+        return None
+    
+    transaction_row = db.execute(
+        insert(VideoCreditTransaction.__table__)
+        .values(
+            video_credit_id=credit_row.id,
+            amount=amount,
+            balance_after=credit_row.balance,
+            transaction_type=transaction_type,
+            description=description
+        )
+        .returning(*VideoCreditTransaction.__table__.c)
+    ).first()
+    publish_balance_change(db, [user_id])
+    db.commit()
+    
+    # Objetos montados a partir do RETURNING, sem novas consultas ao banco
+    credit = VideoCredit(**credit_row._mapping)
+    store_balance(credit)
+    return credit, VideoCreditTransaction(**transaction_row._mapping)
+
+
+def _change_credit(
+    db: Session,
+    user_id: int,
+    amount: int,
+    transaction_type: str,
+    description: str
+) -> Optional[Tuple[VideoCredit, VideoCreditTransaction]]:
+    """Aplica a variação de saldo, provisionando o registro de crédito se o usuário ainda não tiver um"""
+    result = _apply_credit_change(db, user_id, amount, transaction_type, description)
+    if result is None and db.query(VideoCredit.id).filter(VideoCredit.user_id == user_id).first() is None:
+        provision_user_credit(db, user_id)
+        result = _apply_credit_change(db, user_id, amount, transaction_type, description)
+    return result
 
 
 def consume_credit(
@@ -98,37 +215,21 @@ def consume_credit(
         CreditTransactionException: Se ocorrer um erro na transação
     """
     try:
-        credit = get_user_credit(db, user_id)
+        result = _change_credit(db, user_id, -amount, "consumption", description)
         
-        # Verifica se o usuário tem créditos suficientes
-        if credit.balance < amount:
+        # Nenhuma linha atualizada: o saldo não cobre o valor solicitado
+        if result is None:
             logger.warning(
                 "Usuário sem créditos suficientes",
                 extra={
                     "user_id": user_id,
-                    "current_balance": credit.balance,
                     "requested_amount": amount,
                     "operation": "consume_credit"
                 }
             )
             raise InsufficientCreditsException()
         
-        # Atualiza o saldo
-        credit.balance -= amount
-        
-        # Registra a transação
-        transaction = VideoCreditTransaction(
-            video_credit_id=credit.id,
-            amount=-amount,  # Valor negativo para consumo
-            balance_after=credit.balance,
-            transaction_type="consumption",
-            description=description
-        )
-        
-        db.add(transaction)
-        db.commit()
-        db.refresh(credit)
-        db.refresh(transaction)
+        credit, transaction = result
         
         logger.info(
             "Crédito consumido com sucesso",
@@ -189,24 +290,7 @@ def add_credits(
         CreditTransactionException: Se ocorrer um erro na transação
     """
     try:
-        credit = get_user_credit(db, user_id)
-        
-        # Atualiza o saldo
-        credit.balance += amount
-        
-        # Registra a transação
-        transaction = VideoCreditTransaction(
-            video_credit_id=credit.id,
-            amount=amount,  # Valor positivo para adição
-            balance_after=credit.balance,
-            transaction_type="purchase",
-            description=description
-        )
-        
-        db.add(transaction)
-        db.commit()
-        db.refresh(credit)
-        db.refresh(transaction)
+        credit, transaction = _change_credit(db, user_id, amount, "purchase", description)
         
         logger.info(
             "Créditos adicionados com sucesso",
@@ -263,24 +347,7 @@ def refund_credit(
         CreditTransactionException: Se ocorrer um erro na transação
     """
     try:
-        credit = get_user_credit(db, user_id)
-        
-        # Atualiza o saldo
-        credit.balance += amount
-        
-        # Registra a transação
-        transaction = VideoCreditTransaction(
-            video_credit_id=credit.id,
-            amount=amount,  # Valor positivo para estorno
-            balance_after=credit.balance,
-            transaction_type="refund",
-            description=description
-        )
-        
-        db.add(transaction)
-        db.commit()
-        db.refresh(credit)
-        db.refresh(transaction)
+        credit, transaction = _change_credit(db, user_id, amount, "refund", description)
         
         logger.info(
             "Crédito estornado com sucesso",
@@ -315,26 +382,649 @@ def refund_credit(
         )
 
 
-def get_credit_transactions(db: Session, user_id: int, skip: int = 0, limit: int = 100):
+def grant_credits_bulk(
+    db: Session,
+    grants: List[Dict[str, Any]],
+    batch_size: int = 500
+) -> List[Dict[str, Any]]:
+    """
+    Concede créditos a vários usuários de uma vez (campanhas promocionais, bonificações).
+    
+    Cada lote roda em uma única transação: os saldos são alterados por um único
+    UPDATE ... FROM (VALUES ...) e as transações do histórico são gravadas com um
+    executemany. Concessões repetidas para o mesmo usuário no mesmo lote são somadas
+    no UPDATE e geram uma transação cada, com o saldo acumulado em balance_after.
+    Um lote com erro é desfeito por inteiro sem interromper os seguintes.
+    
+    Args:
+        db: Sessão do banco de dados
+        grants: Lista de concessões com user_id, amount e description (opcional)
+        batch_size: Quantidade de concessões por transação
+        
+    Returns:
+        List[Dict[str, Any]]: Um resultado por concessão, na ordem recebida, com user_id, amount,
+        status ("granted", "invalid_amount", "user_not_found" ou "failed") e balance_after
+        ou error_id quando aplicável
+    """
+    results: List[Dict[str, Any]] = [
+        {"user_id": grant["user_id"], "amount": grant["amount"], "status": "pending"}
+        for grant in grants
+    ]
+    for start in range(0, len(grants), batch_size):
+        _grant_credits_batch(db, grants[start:start + batch_size], results[start:start + batch_size])
+    
+    logger.info(
+        "Concessão de créditos em lote concluída",
+        extra={
+            "total": len(results),
+            "granted": sum(1 for result in results if result["status"] == "granted"),
+            "operation": "grant_credits_bulk"
+        }
+    )
+    return results
+
+
+def _grant_credits_batch(db: Session, grants: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> None:
+    """Aplica um lote de grant_credits_bulk em uma transação, preenchendo os resultados recebidos"""
+    for result in results:
+        if result["amount"] <= 0:
+            result["status"] = "invalid_amount"
+    
+    requested_ids = {result["user_id"] for result in results if result["status"] == "pending"}
+    try:
+        existing_ids = set(db.execute(select(User.id).where(User.id.in_(requested_ids))).scalars()) if requested_ids else set()
+        for result in results:
+            if result["status"] == "pending" and result["user_id"] not in existing_ids:
+                result["status"] = "user_not_found"
+        
+        totals: Dict[int, int] = defaultdict(int)
+        for result in results:
+            if result["status"] == "pending":
+                totals[result["user_id"]] += result["amount"]
+        if not totals:
+            db.rollback()
+            return
+        
+        db.execute(
+            pg_insert(VideoCredit.__table__)
+            .values([{"user_id": user_id, "balance": INITIAL_CREDIT_BALANCE} for user_id in totals])
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        
+        credit_table = VideoCredit.__table__
+        batch_values = values(
+            column("user_id", Integer), column("amount", Integer), name="grants"
+        ).data(list(totals.items()))
+        credit_rows = db.execute(
+            update(credit_table)
+            .where(credit_table.c.user_id == batch_values.c.user_id)
+            .values(balance=credit_table.c.balance + batch_values.c.amount)
+            .returning(*credit_table.c)
+        ).all()
+        credits = {row.user_id: row for row in credit_rows}
+        
+        # Saldo anterior ao lote; cada transação registra o saldo acumulado até ela
+        running_balance = {user_id: credits[user_id].balance - total for user_id, total in totals.items()}
+        ledger_rows = []
+        for grant, result in zip(grants, results):
+            if result["status"] != "pending":
+                continue
+            user_id = result["user_id"]
+            running_balance[user_id] += result["amount"]
+            result["balance_after"] = running_balance[user_id]
+            ledger_rows.append({
+                "video_credit_id": credits[user_id].id,
+                "amount": result["amount"],
+                "balance_after": running_balance[user_id],
+                "transaction_type": "purchase",
+                "description": grant.get("description") or "Concessão de créditos"
+            })
+        db.execute(insert(VideoCreditTransaction.__table__), ledger_rows)
+        publish_balance_change(db, totals)
+        db.commit()
+    
+    except Exception as e:
+        db.rollback()
+        error_id = str(uuid.uuid4())
+        logger.error(
+            "Erro ao conceder lote de créditos",
+            extra={
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                "error_id": error_id,
+                "batch_size": len(results),
+                "operation": "grant_credits_bulk"
+            }
+        )
+        for result in results:
+            if result["status"] == "pending":
+                result.pop("balance_after", None)
+                result["status"] = "failed"
+                result["error_id"] = error_id
+        return
+    
+    for row in credit_rows:
+        store_balance(VideoCredit(**row._mapping))
+    for result in results:
+        if result["status"] == "pending":
+            result["status"] = "granted"
+
+
+def place_credit_hold(
+    db: Session,
+    user_id: int,
+    amount: int = 1,
+    description: str = "Geração de vídeo",
+    ttl_minutes: Optional[int] = None
+) -> VideoCreditHold:
     """
-    Obtém o histórico de transações de crédito do usuário.
+    Reserva créditos do usuário para uma geração de vídeo.
+    
+    A reserva reduz o saldo disponível (balance - held) sem gerar transação no histórico.
+    Ela deve ser capturada (capture_credit_hold) se a geração terminar com sucesso, ou
+    liberada (release_credit_hold) em caso de falha; reservas esquecidas são liberadas
+    pelo sweeper após CREDIT_HOLD_TTL_MINUTES.
     
     Args:
         db: Sessão do banco de dados
         user_id: ID do usuário
-        skip: Número de registros para pular (paginação)
+        amount: Quantidade de créditos a reservar (padrão: 1)
+        description: Descrição da reserva, usada na transação de consumo
+        ttl_minutes: Validade da reserva em minutos (padrão: CREDIT_HOLD_TTL_MINUTES)
+        
+    Returns:
+        VideoCreditHold: A reserva criada
+        
+    Raises:
+        InsufficientCreditsException: Se o saldo disponível não cobrir a reserva
+        CreditTransactionException: Se ocorrer um erro na reserva
+    """
+    ttl_minutes = ttl_minutes or settings.CREDIT_HOLD_TTL_MINUTES
+    credit_table = VideoCredit.__table__
+    statement = (
+        update(credit_table)
+        .where(
+            credit_table.c.user_id == user_id,
+            credit_table.c.balance - credit_table.c.held >= amount
+        )
+        .values(held=credit_table.c.held + amount)
+        .returning(*credit_table.c)
+    )
+    
+    try:
+        credit_row = db.execute(statement).first()
+        if credit_row is None and db.query(VideoCredit.id).filter(VideoCredit.user_id == user_id).first() is None:
+            provision_user_credit(db, user_id)
+            credit_row = db.execute(statement).first()
+        
+        if credit_row is None:
+            db.rollback()
+            logger.warning(
+                "Usuário sem créditos disponíveis para reserva",
+                extra={
+                    "user_id": user_id,
+                    "requested_amount": amount,
+                    "operation": "place_credit_hold"
+                }
+            )
+            raise InsufficientCreditsException()
+        
+        hold_row = db.execute(
+            insert(VideoCreditHold.__table__)
+            .values(
+                video_credit_id=credit_row.id,
+                amount=amount,
+                status="active",
+                expires_at=datetime.utcnow() + timedelta(minutes=ttl_minutes),
+                description=description
+            )
+            .returning(*VideoCreditHold.__table__.c)
+        ).first()
+        publish_balance_change(db, [user_id])
+        db.commit()
+        store_balance(VideoCredit(**credit_row._mapping))
+        
+        logger.info(
+            "Créditos reservados",
+            extra={
+                "user_id": user_id,
+                "hold_id": hold_row.id,
+                "amount": amount,
+                "operation": "place_credit_hold"
+            }
+        )
+        
+        return VideoCreditHold(**hold_row._mapping)
+    
+    except InsufficientCreditsException:
+        raise
+    
+    except Exception as e:
+        db.rollback()
+        error_id = str(uuid.uuid4())
+        logger.error(
+            "Erro ao reservar créditos",
+            extra={
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                "error_id": error_id,
+                "user_id": user_id,
+                "amount": amount,
+                "operation": "place_credit_hold"
+            }
+        )
+        raise CreditTransactionException(
+            detail="Falha ao processar reserva de créditos",
+            error_id=error_id
+        )
+
+
+def _finish_credit_hold(db: Session, hold_id: int, status: str):
+    """Encerra uma reserva ativa; retorna (video_credit_id, amount, description) ou None se ela não estava ativa"""
+    hold_table = VideoCreditHold.__table__
+    return db.execute(
+        update(hold_table)
+        .where(hold_table.c.id == hold_id, hold_table.c.status == "active")
+        .values(status=status)
+        .returning(hold_table.c.video_credit_id, hold_table.c.amount, hold_table.c.description)
+    ).first()
+
+
+def _capture_released_hold(
+    db: Session,
+    hold_id: int,
+    description: Optional[str]
+) -> Tuple[VideoCredit, VideoCreditTransaction]:
+    """
+    Captura uma reserva já liberada pelo sweeper (geração mais longa que a validade da
+    reserva): debita o valor do saldo disponível, com a mesma condição de consume_credit.
+    """
+    hold_table = VideoCreditHold.__table__
+    credit_table = VideoCredit.__table__
+    # Marca a reserva como capturada na mesma transação do débito, evitando capturá-la duas vezes
+    hold = db.execute(
+        update(hold_table)
+        .where(hold_table.c.id == hold_id, hold_table.c.status == "released")
+        .values(status="captured")
+        .returning(hold_table.c.video_credit_id, hold_table.c.amount, hold_table.c.description)
+    ).first()
+    if hold is None:
+        db.rollback()
+        raise CreditTransactionException(detail="Reserva de créditos não está ativa")
+    
+    user_id = db.execute(
+        select(credit_table.c.user_id).where(credit_table.c.id == hold.video_credit_id)
+    ).scalar_one()
+    result = _apply_credit_change(db, user_id, -hold.amount, "consumption", description or hold.description)
+    if result is None:
+        db.rollback()
+        raise InsufficientCreditsException()
+    
+    credit, transaction = result
+    db.execute(update(hold_table).where(hold_table.c.id == hold_id).values(transaction_id=transaction.id))
+    db.commit()
+    
+    logger.warning(
+        "Reserva de créditos expirada capturada com débito do saldo disponível",
+        extra={
+            "user_id": user_id,
+            "hold_id": hold_id,
+            "transaction_id": transaction.id,
+            "amount": hold.amount,
+            "new_balance": credit.balance,
+            "operation": "capture_credit_hold"
+        }
+    )
+    return credit, transaction
+
+
+def capture_credit_hold(
+    db: Session,
+    hold_id: int,
+    description: Optional[str] = None
+) -> Tuple[VideoCredit, VideoCreditTransaction]:
+    """
+    Captura uma reserva: debita o valor reservado e registra a transação de consumo.
+    
+    Se a reserva já tiver sido liberada pelo sweeper, o valor é debitado do saldo
+    disponível, desde que ele o cubra.
+    
+    Args:
+        db: Sessão do banco de dados
+        hold_id: ID da reserva
+        description: Descrição da transação (padrão: a descrição da reserva)
+        
+    Returns:
+        Tuple[VideoCredit, VideoCreditTransaction]: O objeto de crédito atualizado e a transação criada
+        
+    Raises:
+        InsufficientCreditsException: Se a reserva expirou e o saldo disponível não cobre o débito
+        CreditTransactionException: Se a reserva já tiver sido capturada ou ocorrer um erro na transação
+    """
+    try:
+        hold = _finish_credit_hold(db, hold_id, "captured")
+        if hold is None:
+            db.rollback()
+            return _capture_released_hold(db, hold_id, description)
+        
+        credit_table = VideoCredit.__table__
+        credit_row = db.execute(
+            update(credit_table)
+            .where(credit_table.c.id == hold.video_credit_id)
+            .values(balance=credit_table.c.balance - hold.amount, held=credit_table.c.held - hold.amount)
+            .returning(*credit_table.c)
+        ).first()
+        transaction_row = db.execute(
+            insert(VideoCreditTransaction.__table__)
+            .values(
+                video_credit_id=credit_row.id,
+                amount=-hold.amount,
+                balance_after=credit_row.balance,
+                transaction_type="consumption",
+                description=description or hold.description
+            )
+            .returning(*VideoCreditTransaction.__table__.c)
+        ).first()
+        db.execute(
+            update(VideoCreditHold.__table__)
+            .where(VideoCreditHold.__table__.c.id == hold_id)
+            .values(transaction_id=transaction_row.id)
+        )
+        publish_balance_change(db, [credit_row.user_id])
+        db.commit()
+        store_balance(VideoCredit(**credit_row._mapping))
+        
+        logger.info(
+            "Reserva de créditos capturada",
+            extra={
+                "user_id": credit_row.user_id,
+                "hold_id": hold_id,
+                "transaction_id": transaction_row.id,
+                "amount": hold.amount,
+                "new_balance": credit_row.balance,
+                "operation": "capture_credit_hold"
+            }
+        )
+        
+        return VideoCredit(**credit_row._mapping), VideoCreditTransaction(**transaction_row._mapping)
+    
+    except (CreditTransactionException, InsufficientCreditsException):
+        raise
+    
+    except Exception as e:
+        db.rollback()
+        error_id = str(uuid.uuid4())
+        logger.error(
+            "Erro ao capturar reserva de créditos",
+            extra={
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                "error_id": error_id,
+                "hold_id": hold_id,
+                "operation": "capture_credit_hold"
+            }
+        )
+        raise CreditTransactionException(
+            detail="Falha ao processar consumo de crédito",
+            error_id=error_id
+        )
+
+
+def release_credit_hold(db: Session, hold_id: int) -> bool:
+    """
+    Libera uma reserva ativa, devolvendo o valor ao saldo disponível sem registrar transação.
+    
+    Args:
+        db: Sessão do banco de dados
+        hold_id: ID da reserva
+        
+    Returns:
+        bool: True se a reserva foi liberada, False se ela já não estava ativa
+        
+    Raises:
+        CreditTransactionException: Se ocorrer um erro ao liberar a reserva
+    """
+    try:
+        hold = _finish_credit_hold(db, hold_id, "released")
+        if hold is None:
+            db.rollback()
+            return False
+        
+        credit_table = VideoCredit.__table__
+        credit_row = db.execute(
+            update(credit_table)
+            .where(credit_table.c.id == hold.video_credit_id)
+            .values(held=credit_table.c.held - hold.amount)
+            .returning(*credit_table.c)
+        ).first()
+        publish_balance_change(db, [credit_row.user_id])
+        db.commit()
+        store_balance(VideoCredit(**credit_row._mapping))
+        
+        logger.info(
+            "Reserva de créditos liberada",
+            extra={
+                "hold_id": hold_id,
+                "amount": hold.amount,
+                "operation": "release_credit_hold"
+            }
+        )
+        return True
+    
+    except Exception as e:
+        db.rollback()
+        error_id = str(uuid.uuid4())
+        logger.error(
+            "Erro ao liberar reserva de créditos",
+            extra={
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                "error_id": error_id,
+                "hold_id": hold_id,
+                "operation": "release_credit_hold"
+            }
+        )
+        raise CreditTransactionException(
+            detail="Falha ao liberar reserva de créditos",
+            error_id=error_id
+        )
+
+
+def release_expired_holds(db: Session, batch_size: int = 500) -> int:
+    """
+    Libera as reservas ativas já expiradas (gerações interrompidas sem captura nem liberação).
+    
+    As reservas são travadas com FOR UPDATE SKIP LOCKED, então vários processos podem
+    executar o sweeper ao mesmo tempo sem liberar a mesma reserva duas vezes.
+    
+    Args:
+        db: Sessão do banco de dados
+        batch_size: Quantidade máxima de reservas liberadas
+        
+    Returns:
+        int: Quantidade de reservas liberadas
+    """
+    hold_table = VideoCreditHold.__table__
+    expired_ids = (
+        select(hold_table.c.id)
+        .where(hold_table.c.status == "active", hold_table.c.expires_at < datetime.utcnow())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    released = db.execute(
+        update(hold_table)
+        .where(hold_table.c.id.in_(expired_ids))
+        .values(status="released")
+        .returning(hold_table.c.video_credit_id, hold_table.c.amount)
+    ).all()
+    if not released:
+        db.rollback()
+        return 0
+    
+    held_by_credit = defaultdict(int)
+    for video_credit_id, amount in released:
+        held_by_credit[video_credit_id] += amount
+    
+    credit_table = VideoCredit.__table__
+    # Atualiza os créditos em ordem de id, para que sweepers e requisições concorrentes
+    # travem as linhas na mesma ordem e não entrem em deadlock
+    db.execute(
+        update(credit_table)
+        .where(credit_table.c.id == bindparam("credit_id"))
+        .values(held=credit_table.c.held - bindparam("released_amount")),
+        [{"credit_id": credit_id, "released_amount": amount} for credit_id, amount in sorted(held_by_credit.items())]
+    )
+    user_ids = db.execute(
+        select(credit_table.c.user_id).where(credit_table.c.id.in_(list(held_by_credit)))
+    ).scalars().all()
+    publish_balance_change(db, user_ids)
+    db.commit()
+    invalidate_balances(user_ids)
+    
+    logger.warning(
+        "Reservas de créditos expiradas liberadas",
+        extra={
+            "released_holds": len(released),
+            "accounts": len(held_by_credit),
+            "operation": "release_expired_holds"
+        }
+    )
+    return len(released)
+
+
+def encode_transaction_cursor(transaction: VideoCreditTransaction) -> str:
+    """
+    Gera o cursor opaco que aponta para a posição de uma transação no histórico.
+    
+    Args:
+        transaction: Última transação da página retornada
+        
+    Returns:
+        str: Cursor para o parâmetro after da próxima página
+    """
+    raw = f"{transaction.created_at.isoformat()}|{transaction.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_transaction_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodifica um cursor gerado por encode_transaction_cursor.
+    
+    Args:
+        cursor: Cursor recebido no parâmetro after
+        
+    Returns:
+        Tuple[datetime, int]: Data de criação e ID da última transação já retornada
+        
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, transaction_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(transaction_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Cursor inválido: {cursor}") from e
+
+
+def get_credit_transactions(
+    db: Session,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None
+):
+    """
+    Obtém o histórico de transações de crédito do usuário, das mais recentes para as mais antigas.
+    
+    Com after, a página começa logo depois da transação apontada pelo cursor, buscando
+    direto no índice (video_credit_id, created_at, id), sem percorrer as páginas
+    anteriores. A paginação por skip é mantida apenas por compatibilidade.
+    
+    Args:
+        db: Sessão do banco de dados
+        user_id: ID do usuário
+        skip: Número de registros para pular (paginação por deslocamento)
         limit: Número máximo de registros a retornar
+        after: Cursor da última transação da página anterior (paginação por cursor)
         
     Returns:
         List[VideoCreditTransaction]: Lista de transações do usuário
+        
+    Raises:
+        ValueError: Se o cursor for inválido
     """
-    credit = get_user_credit(db, user_id)
+    # Uma única consulta: o registro de crédito é resolvido em uma subconsulta
+    credit_id = db.query(VideoCredit.id).filter(VideoCredit.user_id == user_id).scalar_subquery()
+    
+    query = db.query(VideoCreditTransaction)\
+        .filter(VideoCreditTransaction.video_credit_id == credit_id)
+    
+    if after:
+        created_at, transaction_id = decode_transaction_cursor(after)
+        query = query.filter(
+            tuple_(VideoCreditTransaction.created_at, VideoCreditTransaction.id) < tuple_(created_at, transaction_id)
+        )
+    elif skip:
+        query = query.offset(skip)
     
-    transactions = db.query(VideoCreditTransaction)\
-        .filter(VideoCreditTransaction.video_credit_id == credit.id)\
-        .order_by(VideoCreditTransaction.created_at.desc())\
-        .offset(skip)\
+    transactions = query\
+        .order_by(VideoCreditTransaction.created_at.desc(), VideoCreditTransaction.id.desc())\
         .limit(limit)\
         .all()
     
-    return transactions
\ No newline at end of file
+    return transactions
+
+
+class CreditHoldSweeper:
+    """
+    Libera periodicamente, em uma thread em segundo plano, as reservas de créditos expiradas.
+    """
+    
+    def __init__(self, interval_seconds: int):
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Inicia a thread do sweeper, se ainda não estiver em execução"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="credit-hold-sweeper", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Interrompe o sweeper"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(self.interval_seconds)
+            self._thread = None
+    
+    def _run(self) -> None:
+        from app.db.session import SessionLocal
+        
+        while not self._stop_event.wait(self.interval_seconds):
+            db = SessionLocal()
+            try:
+                release_expired_holds(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(
+                    "Erro ao liberar reservas de créditos expiradas",
+                    extra={
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                        "operation": "release_expired_holds"
+                    }
+                )
+            finally:
+                db.close()
+
+
+_credit_hold_sweeper = CreditHoldSweeper(interval_seconds=settings.CREDIT_HOLD_SWEEP_INTERVAL_SECONDS)
+
+
+def get_credit_hold_sweeper() -> CreditHoldSweeper:
+    """Retorna o sweeper de reservas compartilhado pelo processo"""
+    return _credit_hold_sweeper
@@ -0,0 +1,186 @@
+from typing import Dict, Optional
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.models.video import Video
+from app.services.storage_backends import StorageBackend, get_storage_backend
+from app.services.storage_service import parse_blob_url
+
+logger = get_logger("faststart_service")
+
+# Limite de caixas de nível superior percorridas antes de desistir da verificação
+MAX_TOP_LEVEL_BOXES = 64
+
+
+def is_faststart(backend: StorageBackend, container: str, key: str) -> bool:
+    """Verifica se o moov de um MP4 armazenado vem antes do mdat
+
+    Percorre apenas os cabeçalhos das caixas de nível superior com leituras por
+    intervalo, sem baixar o arquivo. MP4 fragmentados (moov vazio no início) também
+    são considerados faststart.
+
+    Args:
+        backend: Backend de armazenamento do vídeo
+        container: Container do vídeo
+        key: Chave do vídeo
+
+    Returns:
+        bool: True se o moov aparece antes do mdat
+    """
+    offset = 0
+    for _ in range(MAX_TOP_LEVEL_BOXES):
+        header = backend.get_range(container, key, offset, 16)
+        if len(header) < 8:
+            return False
+        size, box_type = struct.unpack(">I4s", header[:8])
+        if box_type == b"moov":
+            return True
+        if box_type == b"mdat":
+            return False
+        if size == 1:
+            # Tamanho em 64 bits logo após o tipo
+            size = struct.unpack(">Q", header[8:16])[0]
+        if size < 8:
+            # size == 0 indica que a caixa vai até o fim do arquivo
+            return False
+        offset += size
+    return False
+
+
+def get_ffmpeg_path() -> str:
+    ffmpeg_path = os.environ.get("FFMPEG_PATH") or shutil.which("ffmpeg")
+    if ffmpeg_path:
+        return ffmpeg_path
+    # Binário distribuído com o imageio-ffmpeg, dependência do moviepy
+    import imageio_ffmpeg
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+
+def remux_faststart(input_path: str, output_path: str) -> None:
+    """Reescreve um MP4 com o moov no início, copiando as trilhas sem recodificar
+
+    Args:
+        input_path: Caminho do MP4 original
+        output_path: Caminho do MP4 faststart gerado
+    """
+    subprocess.run(
+        [
+            get_ffmpeg_path(), "-y", "-loglevel", "error",
+            "-i", input_path,
+            "-map", "0", "-c", "copy",
+            "-movflags", "+faststart",
+            output_path
+        ],
+        check=True,
+        capture_output=True
+    )
+
+
+def _download(backend: StorageBackend, container: str, key: str, path: str) -> None:
+    chunk_size = settings.AZURE_STORAGE_MAX_BLOCK_SIZE
+    offset = 0
+    with open(path, "wb") as f:
+        while True:
+            chunk = backend.get_range(container, key, offset, chunk_size)
+            f.write(chunk)
+            offset += len(chunk)
+            if len(chunk) < chunk_size:
+                break
+
+
+def migrate_blob_to_faststart(container: str, key: str, dry_run: bool = False) -> str:
+    """Converte um vídeo armazenado para faststart, regravando-o na mesma chave
+
+    A chave não muda, de modo que URLs e SAS já emitidas continuam válidas.
+
+    Args:
+        container: Container do vídeo
+        key: Chave do vídeo
+        dry_run: Apenas verifica, sem regravar
+
+    Returns:
+        str: "skipped" se já era faststart, "pending" em dry_run, "remuxed" se foi convertido
+    """
+    backend = get_storage_backend()
+    if is_faststart(backend, container, key):
+        return "skipped"
+    if dry_run:
+        return "pending"
+
+    with tempfile.TemporaryDirectory(prefix="faststart-") as tmp_dir:
+        original = os.path.join(tmp_dir, "original.mp4")
+        remuxed = os.path.join(tmp_dir, "faststart.mp4")
+        _download(backend, container, key, original)
+        remux_faststart(original, remuxed)
+        with open(remuxed, "rb") as data:
+            backend.put(container, key, data, length=os.path.getsize(remuxed), overwrite=True)
+    return "remuxed"
+
+
+def migrate_videos_to_faststart(db: Session, batch_size: int = 100, dry_run: bool = False) -> Dict[str, int]:
+    """Converte para faststart todos os vídeos já enviados ao armazenamento
+
+    Job de execução única: vídeos que já são faststart são ignorados, então pode ser
+    interrompido e executado novamente.
+
+    Args:
+        db: Sessão do banco de dados
+        batch_size: Quantidade de vídeos lidos por consulta
+        dry_run: Apenas conta os vídeos que precisam de conversão
+
+    Returns:
+        Dict[str, int]: Contagem de vídeos por resultado (remuxed, pending, skipped, failed)
+    """
+    totals = {"remuxed": 0, "pending": 0, "skipped": 0, "failed": 0}
+    last_id = 0
+    while True:
+        videos = (
+            db.query(Video.id, Video.url, Video.blob_container, Video.blob_name)
+            .filter(Video.id > last_id, Video.url.isnot(None))
+            .order_by(Video.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not videos:
+            break
+        for video in videos:
+            last_id = video.id
+            location: Optional[tuple] = None
+            if video.blob_container and video.blob_name:
+                location = (video.blob_container, video.blob_name)
+            elif video.url.startswith("https://"):
+                location = parse_blob_url(video.url)
+            if not location:
+                continue
+
+            try:
+                result = migrate_blob_to_faststart(*location, dry_run=dry_run)
+            except Exception as e:
+                result = "failed"
+                logger.error(
+                    "Erro ao converter vídeo para faststart",
+                    extra={
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                        "video_id": video.id,
+                        "operation": "migrate_video_faststart_error"
+                    }
+                )
+            totals[result] += 1
+            if result == "remuxed":
+                logger.info(
+                    "Vídeo convertido para faststart",
+                    extra={
+                        "video_id": video.id,
+                        "blob_name": location[1],
+                        "operation": "migrate_video_faststart"
+                    }
+                )
+    return totals
@@ -1,7 +1,8 @@
 import math
 import os
 import random
-from typing import List, Optional
+from typing import Any, Callable, List, Optional, Tuple
+from PIL import Image
 from moviepy import vfx, afx
 from moviepy.audio.io.AudioFileClip import AudioFileClip
 from moviepy.video.VideoClip import ImageClip, TextClip, VideoClip
@@ -16,16 +17,27 @@ class EditorVideo:
     e gera um arquivo final a partir de imagens e áudio.
     """
 
-    def __init__(self, width: int = 480, height: int = 480):
+    def __init__(self, width: int = 480, height: int = 480, fragmentado: bool = False,
+                 ao_iniciar_render: Optional[Callable[[str], Any]] = None):
         """
         Inicializa o EditorVideo com dimensões padrão para o vídeo.
 
         Parâmetros:
             width: Largura padrão do vídeo (padrão: 480).
             height: Altura padrão do vídeo (padrão: 480).
+            fragmentado: Gera MP4 fragmentado, gravado apenas por acréscimo, permitindo
+                         ler o arquivo enquanto ele é renderizado (padrão: False).
+            ao_iniciar_render: Função chamada com o caminho de saída antes da renderização.
+                               Pode retornar um objeto com finish() e abort(), chamados
+                               ao fim ou em caso de falha da renderização.
         """
         self.width = width
         self.height = height
+        self.fragmentado = fragmentado
+        self.ao_iniciar_render = ao_iniciar_render
+        # Poster e faixa de miniaturas da última renderização (ver extrair_imagens)
+        self.arquivo_poster: Optional[str] = None
+        self.arquivo_miniaturas: Optional[str] = None
 
     def zoom_in(self, clip: VideoClip, fact: float = 1.2, x_center: float = None, y_center: float = None) -> VideoClip:
         """
@@ -283,19 +295,85 @@ class EditorVideo:
         # --- Memory Optimization ---
         # Reduced threads (e.g., 4) can lower memory usage during encoding,
         # potentially at the cost of speed. logger='bar' hides verbose FFMPEG output.
-        video.write_videofile(
-            output,
-            fps=30,
-            codec='libx264',
-            threads=4,  # Reduced from 8
-            preset="fast",
-            logger='bar' # Suppress verbose ffmpeg output
-        )
+        if self.fragmentado:
+            # Fragmentos autocontidos com moov vazio no início: o arquivo nunca é reescrito
+            ffmpeg_params = ["-movflags", "+frag_keyframe+empty_moov+default_base_moof"]
+        else:
+            # Move o moov para o início (faststart): o player começa a reproduzir
+            # sem precisar baixar o final do arquivo
+            ffmpeg_params = ["-movflags", "+faststart"]
+
+        # O upload durante a renderização é opcional: se não puder ser iniciado, o vídeo é
+        # renderizado normalmente e enviado depois
+        sessao = None
+        if self.ao_iniciar_render:
+            try:
+                sessao = self.ao_iniciar_render(output)
+            except Exception as e:
+                print(f"Falha ao iniciar o upload durante a renderização de {identificador}: {e}")
+
+        try:
+            video.write_videofile(
+                output,
+                fps=30,
+                codec='libx264',
+                threads=4,  # Reduced from 8
+                preset="fast",
+                ffmpeg_params=ffmpeg_params,
+                logger='bar' # Suppress verbose ffmpeg output
+            )
+        except Exception:
+            if sessao is not None:
+                sessao.abort()
+            raise
+
+        if sessao is not None:
+            sessao.finish()
+
+        # Poster e miniaturas são opcionais: uma falha aqui não invalida o vídeo renderizado
+        try:
+            self.arquivo_poster, self.arquivo_miniaturas = self.extrair_imagens(video, identificador)
+        except Exception as e:
+            self.arquivo_poster, self.arquivo_miniaturas = None, None
+            print(f"Falha ao extrair poster e miniaturas de {identificador}: {e}")
 
         print(os.path.abspath(output))
 
         return output
 
+    def extrair_imagens(self, video: VideoClip, identificador: str, qtd_miniaturas: int = 5,
+                        largura_miniatura: int = 192) -> Tuple[str, str]:
+        """
+        Gera o poster e uma faixa de miniaturas a partir dos frames do clipe já composto,
+        sem decodificar o MP4 renderizado.
+
+        Parâmetros:
+            video: Clipe final do vídeo.
+            identificador: Identificador usado para nomear os arquivos.
+            qtd_miniaturas: Quantidade de frames na faixa de miniaturas (padrão: 5).
+            largura_miniatura: Largura de cada miniatura em pixels (padrão: 192).
+
+        Retorna:
+            Tuple[str, str]: Caminhos absolutos do poster e da faixa de miniaturas (JPEG).
+        """
+        duracao = video.duration
+
+        # Poster a 20% do vídeo, depois da abertura com o título
+        poster = Image.fromarray(video.get_frame(duracao * 0.2).astype("uint8"))
+        arquivo_poster = os.path.abspath(f"{identificador}_poster.jpg")
+        poster.save(arquivo_poster, "JPEG", quality=85, optimize=True, progressive=True)
+
+        # Faixa horizontal com frames distribuídos ao longo do vídeo
+        altura_miniatura = round(largura_miniatura * poster.height / poster.width)
+        faixa = Image.new("RGB", (largura_miniatura * qtd_miniaturas, altura_miniatura))
+        for i in range(qtd_miniaturas):
+            frame = Image.fromarray(video.get_frame(duracao * (i + 0.5) / qtd_miniaturas).astype("uint8"))
+            faixa.paste(frame.resize((largura_miniatura, altura_miniatura), Image.LANCZOS), (i * largura_miniatura, 0))
+        arquivo_miniaturas = os.path.abspath(f"{identificador}_miniaturas.jpg")
+        faixa.save(arquivo_miniaturas, "JPEG", quality=80, optimize=True)
+
+        return arquivo_poster, arquivo_miniaturas
+
 # audio_r = AudioFileClip('teste3.mp3')
 # x = EditorVideo()
 # a = x.aplicar_efeito_voz_profunda(audio_r, octaves=-0.17)
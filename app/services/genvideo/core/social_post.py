@@ -16,7 +16,7 @@ class SistemaPostsAutomaticos:
         self.editor_video = editor_video
         self.editor_audio = editor_audio
 
-    def executar_fluxo(self, tema, modelo, duracao, qtd_imagens):
+    def executar_fluxo(self, tema, modelo, duracao, qtd_imagens) -> PostData:
         identificador = str(uuid.uuid4())
 
         # 1. Geração de conteúdo
@@ -50,23 +50,29 @@ class SistemaPostsAutomaticos:
                                                          identificador=identificador)
 
                                                         
-        post_data = {
-            "guid": identificador,
-            "solicitacao": tema,
-            "titulo": titulo,
-            "roteiro": roteiro,
-            "frases": frases,
-            "hashtags": hashtags,
-            "conteudo": conteudo,
-            "imagens": imagens,
-            "narracao_marcada": texto_para_audio_ssml,
-            "arquivo_narracao_raw": narracao_raw,
-            "arquivo_narracao_remix": narracao_remix,
-            "arquivo_video": arquivo_video,
-            "data_registro": datetime.now().isoformat()
-        }
-        save_data.append_data_to_json(post_data)
+        post_data = PostData(
+            guid=identificador,
+            solicitacao=tema,
+            titulo=titulo,
+            roteiro=roteiro,
+            frases=frases,
+            hashtags=hashtags,
+            conteudo=conteudo,
+            imagens=imagens,
+            narracao_marcada=texto_para_audio_ssml,
+            arquivo_narracao_raw=narracao_raw,
+            arquivo_narracao_remix=narracao_remix,
+            arquivo_video=os.path.abspath(arquivo_video),
+            arquivo_poster=getattr(self.editor_video, "arquivo_poster", None),
+            arquivo_miniaturas=getattr(self.editor_video, "arquivo_miniaturas", None),
+        )
 
-        print(os.path.abspath(arquivo_video))
+        # Persistir no histórico é um efeito colateral: uma falha aqui não invalida o vídeo gerado
+        try:
+            save_data.append_data_to_json(post_data.to_dict())
+        except Exception as e:
+            print(f"Falha ao registrar post {identificador} no histórico: {e}")
 
-        return os.path.abspath(arquivo_video)
\ No newline at end of file
+        print(post_data.arquivo_video)
+
+        return post_data
@@ -1,11 +1,7 @@
-import json
+from app.services.genvideo.post_store import get_post_store
 
-# Abrir e carregar o arquivo JSON
-with open("dados.json", "r", encoding="utf-8") as arquivo:
-    dados = json.load(arquivo)
-
-# Filtrar e imprimir apenas os títulos
-for item in dados:
+# Percorrer o armazenamento de posts e imprimir apenas os títulos
+for item in get_post_store().iter_posts():
     titulo = item.get("titulo")
     if titulo:
         print(titulo)
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
+from typing import Optional
 
 @dataclass
 class PostData:
@@ -15,4 +16,12 @@ class PostData:
     arquivo_narracao_raw: str
     arquivo_narracao_remix: str
     arquivo_video: str
-    data_registro: datetime = datetime.now()
\ No newline at end of file
+    data_registro: datetime = field(default_factory=datetime.now)
+    arquivo_poster: Optional[str] = None
+    arquivo_miniaturas: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Converte o post em um dicionário serializável em JSON."""
+        data = asdict(self)
+        data["data_registro"] = self.data_registro.isoformat()
+        return data
\ No newline at end of file
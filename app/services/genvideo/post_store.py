@@ -0,0 +1,237 @@
+import json
+import os
+import threading
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem flock, conta apenas com O_APPEND
+    fcntl = None
+
+
+DEFAULT_STORE_FILENAME = "dados.jsonl"
+LEGACY_JSON_FILENAME = "dados.json"
+
+
+class PostStore:
+    """
+    Armazenamento append-only dos posts gerados em formato JSONL (um registro por linha).
+
+    Cada gravação acrescenta uma única linha ao final do arquivo, sem reler nem
+    reescrever o histórico. Um índice em memória (guid -> offset) permite buscar
+    um registro com um único seek, e é atualizado incrementalmente lendo apenas
+    as linhas acrescentadas por outros processos desde a última leitura.
+    """
+
+    def __init__(self, filename: str = DEFAULT_STORE_FILENAME):
+        """
+        Inicializa o armazenamento.
+
+        Parâmetros:
+            filename: Caminho do arquivo JSONL (padrão: 'dados.jsonl').
+        """
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._indexed_size = 0
+
+    def append(self, registro: dict) -> int:
+        """
+        Acrescenta um registro ao final do arquivo de forma atômica.
+
+        A linha é gravada com uma única chamada write() em um descritor aberto com
+        O_APPEND e, quando disponível, sob flock exclusivo, de modo que workers
+        concorrentes nunca intercalam nem corrompem registros. Se o arquivo terminar
+        em uma linha incompleta (gravação interrompida por uma queda), uma quebra de
+        linha é gravada antes do registro, para que ele não seja colado ao fragmento.
+
+        Parâmetros:
+            registro: Dicionário serializável em JSON.
+
+        Retorna:
+            int: Offset em bytes em que o registro foi gravado.
+        """
+        linha = (json.dumps(registro, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+        with self._lock:
+            fd = os.open(self.filename, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    fim = os.lseek(fd, 0, os.SEEK_END)
+                    separador = b""
+                    if fim > 0:
+                        os.lseek(fd, fim - 1, os.SEEK_SET)
+                        if os.read(fd, 1) != b"\n":
+                            print(f"Linha incompleta no final de {self.filename} (offset {fim}); registro gravado na linha seguinte")
+                            separador = b"\n"
+                    offset = fim + len(separador)
+                    os.write(fd, separador + linha)
+                finally:
+                    if fcntl:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+
+            # Só registra no índice se ele já cobria tudo até este ponto;
+            # caso contrário a próxima busca reindexa o trecho que falta.
+            if offset == self._indexed_size:
+                guid = registro.get("guid")
+                if guid:
+                    self._index[str(guid)] = offset
+                self._indexed_size = offset + len(linha)
+
+        return offset
+
+    def get(self, guid: str) -> Optional[dict]:
+        """
+        Busca um registro pelo GUID.
+
+        Parâmetros:
+            guid: Identificador do post.
+
+        Retorna:
+            Optional[dict]: O registro encontrado ou None.
+        """
+        guid = str(guid)
+        with self._lock:
+            offset = self._index.get(guid)
+            if offset is None:
+                self._atualizar_indice()
+                offset = self._index.get(guid)
+        if offset is None:
+            return None
+
+        with open(self.filename, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def iter_posts(self) -> Iterator[dict]:
+        """
+        Percorre todos os registros em ordem de gravação, um por vez,
+        sem carregar o arquivo inteiro em memória.
+
+        Retorna:
+            Iterator[dict]: Registros do armazenamento.
+        """
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, "rb") as f:
+            for linha in f:
+                if not linha.endswith(b"\n"):
+                    # Linha ainda em gravação por outro processo
+                    break
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    print(f"Linha inválida ignorada em {self.filename}: {linha[:80]!r}")
+                    continue
+                yield registro
+
+    def _atualizar_indice(self) -> None:
+        """Indexa apenas as linhas acrescentadas desde a última leitura do índice."""
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, "rb") as f:
+            f.seek(self._indexed_size)
+            offset = self._indexed_size
+            for linha in f:
+                if not linha.endswith(b"\n"):
+                    break
+                try:
+                    guid = json.loads(linha).get("guid")
+                except json.JSONDecodeError:
+                    print(f"Linha inválida ignorada no índice de {self.filename} (offset {offset})")
+                    guid = None
+                if guid:
+                    self._index[str(guid)] = offset
+                offset += len(linha)
+            self._indexed_size = offset
+
+
+def migrar_json_legado(origem: str = LEGACY_JSON_FILENAME, store: Optional["PostStore"] = None) -> int:
+    """
+    Importa os registros do antigo dados.json (lista JSON) para o armazenamento JSONL.
+
+    A importação pode ser repetida: registros já presentes no armazenamento (pelo GUID
+    ou, sem GUID, pelo conteúdo) não são gravados de novo.
+
+    Parâmetros:
+        origem: Caminho do arquivo JSON legado.
+        store: Armazenamento de destino (padrão: o armazenamento global).
+
+    Retorna:
+        int: Quantidade de registros importados nesta execução.
+    """
+    store = store or get_post_store()
+    if not os.path.exists(origem):
+        return 0
+    with open(origem, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError:
+            return 0
+    if not isinstance(data, list):
+        data = [data]
+
+    def chave(registro: dict) -> str:
+        return str(registro.get("guid") or json.dumps(registro, sort_keys=True, ensure_ascii=False, default=str))
+
+    existentes = {chave(registro) for registro in store.iter_posts()}
+    importados = 0
+    for registro in data:
+        if chave(registro) in existentes:
+            continue
+        store.append(registro)
+        existentes.add(chave(registro))
+        importados += 1
+    return importados
+
+
+def _importar_json_legado(store: PostStore, origem: str = LEGACY_JSON_FILENAME) -> None:
+    """
+    Na primeira abertura, importa o dados.json legado se o arquivo JSONL ainda não existir.
+
+    Os registros são gravados em um arquivo temporário e publicados com os.link, que
+    falha se o destino já existir: se vários processos abrirem o armazenamento ao mesmo
+    tempo, apenas um deles publica a importação.
+    """
+    if os.path.exists(store.filename) or not os.path.exists(origem):
+        return
+    temporario = f"{store.filename}.{os.getpid()}.tmp"
+    try:
+        total = migrar_json_legado(origem, PostStore(temporario))
+        if not total:
+            print(f"Nenhum registro importado de {origem}; o arquivo está vazio ou inválido")
+            return
+        os.link(temporario, store.filename)
+        print(f"{total} registros importados de {origem} para {store.filename}")
+    except FileExistsError:
+        pass  # Outro processo publicou a importação primeiro
+    except Exception as e:
+        print(f"Falha ao importar {origem} para {store.filename}: {e}")
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+_post_store: Optional[PostStore] = None
+_post_store_lock = threading.Lock()
+
+
+def get_post_store() -> PostStore:
+    """Retorna a instância do armazenamento de posts compartilhada pelo processo."""
+    global _post_store
+    if _post_store is None:
+        with _post_store_lock:
+            if _post_store is None:
+                store = PostStore()
+                _importar_json_legado(store)
+                _post_store = store
+    return _post_store
+
+
+if __name__ == '__main__':
+    total = migrar_json_legado()
+    print(f"{total} registros importados de {LEGACY_JSON_FILENAME} para {DEFAULT_STORE_FILENAME}")
@@ -1,60 +1,41 @@
-import json
-import os
 from datetime import datetime
 
+from app.services.genvideo.post_store import PostStore, get_post_store
 
-def load_data_from_json(filename="dados.json"):
+
+def _get_store(filename=None):
+    """Retorna o armazenamento global ou um armazenamento dedicado ao arquivo informado."""
+    if filename is None:
+        return get_post_store()
+    return PostStore(filename)
+
+
+def load_data_from_json(filename=None):
     """
-    Carrega todos os dados de um arquivo JSON.
+    Carrega todos os dados do armazenamento de posts (JSONL).
     Se o arquivo não existir ou estiver vazio, retorna uma lista vazia.
 
-    :param filename: Nome do arquivo JSON.
-    :return: Lista com todos os dados do arquivo JSON.
+    Prefira `PostStore.iter_posts` para varreduras e `PostStore.get` para buscas
+    por GUID; esta função materializa o histórico inteiro em memória.
+
+    :param filename: Caminho do arquivo JSONL (padrão: armazenamento global).
+    :return: Lista com todos os registros.
     """
-    if os.path.exists(filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-                if not isinstance(data, list):
-                    data = [data]
-                return data
-            except json.JSONDecodeError:
-                return []
-    else:
-        return []
+    return list(_get_store(filename).iter_posts())
 
 
-def append_data_to_json(new_data, filename="dados.json"):
+def append_data_to_json(new_data, filename=None):
     """
-    Adiciona (apenda) os novos dados a um arquivo JSON existente.
-    Se o arquivo não existir ou estiver vazio, ele é criado.
+    Adiciona (apenda) os novos dados ao armazenamento de posts (JSONL).
+    Grava apenas uma linha no final do arquivo, sem reler o histórico.
 
     :param new_data: Dados a serem adicionados (por exemplo, um dicionário)
-    :param filename: Nome do arquivo JSON.
+    :param filename: Caminho do arquivo JSONL (padrão: armazenamento global).
     """
-    # Verifica se o arquivo já existe
-    if os.path.exists(filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            try:
-                # Tenta carregar os dados existentes
-                data = json.load(f)
-                # Se os dados não forem uma lista, os transforma em uma lista
-                if not isinstance(data, list):
-                    data = [data]
-            except json.JSONDecodeError:
-                # Caso o arquivo esteja vazio ou com erro, inicia com lista vazia
-                data = []
-    else:
-        data = []
-
-    # Adiciona os novos dados à lista
-    data.append(new_data)
-
-    # Escreve de volta para o arquivo, preservando os dados existentes
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    store = _get_store(filename)
+    store.append(new_data)
 
-    print(f"Dados adicionados em {filename}")
+    print(f"Dados adicionados em {store.filename}")
 
 
 # Exemplo de uso:
@@ -77,4 +58,4 @@ if __name__ == '__main__':
     }
 
     # Apende os dados no arquivo JSON
-    append_data_to_json(post_data, filename="posts.json")
+    append_data_to_json(post_data, filename="posts.jsonl")
@@ -1,10 +1,7 @@
-import json
+from app.services.genvideo.post_store import get_post_store
 
 def carregar_registro_por_guid(guid: str) -> dict:
-    """Carrega um registro do arquivo dados.json pelo GUID"""
-    with open('dados.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    if registro := next((item for item in data if item.get('guid') == guid), None):
+    """Carrega um registro do armazenamento de posts pelo GUID"""
+    if registro := get_post_store().get(guid):
         return registro
     raise ValueError(f"Nenhum registro encontrado para o GUID: {guid}")
\ No newline at end of file
@@ -0,0 +1,290 @@
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import hashlib
+import hmac
+import math
+import os
+import posixpath
+import subprocess
+import tempfile
+import time
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.db.session import SessionLocal
+from app.models.video import Video
+from app.services.faststart_service import get_ffmpeg_path
+from app.services.storage_backends import get_storage_backend
+
+logger = get_logger("hls_service")
+
+MASTER_PLAYLIST = "master.m3u8"
+AUDIO_BITRATE = "128k"
+
+# Tipos MIME gravados com os arquivos do pacote
+CONTENT_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+}
+
+
+def parse_renditions(spec: str) -> List[Tuple[int, str]]:
+    """Converte a configuração HLS_RENDITIONS em uma lista de (altura, bitrate de vídeo)
+
+    Args:
+        spec: Renditions no formato "720:2800k,480:1200k"
+
+    Returns:
+        List[Tuple[int, str]]: Renditions da maior para a menor altura
+    """
+    renditions = []
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        height, bitrate = item.strip().split(":")
+        renditions.append((int(height), bitrate))
+    return sorted(renditions, reverse=True)
+
+
+def _bitrate_kbps(bitrate: str) -> int:
+    bitrate = bitrate.lower()
+    if bitrate.endswith("m"):
+        return int(float(bitrate[:-1]) * 1000)
+    if bitrate.endswith("k"):
+        return int(float(bitrate[:-1]))
+    return int(bitrate) // 1000
+
+
+def package_hls(
+    input_path: str,
+    output_dir: str,
+    renditions: Optional[List[Tuple[int, str]]] = None,
+    segment_seconds: Optional[int] = None
+) -> str:
+    """Gera as renditions H.264 e a playlist master HLS de um vídeo
+
+    Uma única execução do ffmpeg decodifica o vídeo uma vez e codifica todas as
+    renditions, com keyframes alinhados ao início de cada segmento para que o player
+    possa trocar de rendition entre segmentos.
+
+    Args:
+        input_path: Caminho do MP4 renderizado
+        output_dir: Diretório de saída (v<n>/index.m3u8, v<n>/seg_<k>.ts e master.m3u8)
+        renditions: Lista de (altura, bitrate de vídeo); padrão: HLS_RENDITIONS
+        segment_seconds: Duração dos segmentos; padrão: HLS_SEGMENT_SECONDS
+
+    Returns:
+        str: Caminho da playlist master
+    """
+    renditions = renditions or parse_renditions(settings.HLS_RENDITIONS)
+    segment_seconds = segment_seconds or settings.HLS_SEGMENT_SECONDS
+
+    splits = "".join(f"[v{i}]" for i in range(len(renditions)))
+    filters = [f"[0:v]split={len(renditions)}{splits}"]
+    command = [get_ffmpeg_path(), "-y", "-loglevel", "error", "-i", input_path]
+    stream_map = []
+    for i, (height, bitrate) in enumerate(renditions):
+        filters.append(f"[v{i}]scale=-2:{height}[v{i}out]")
+        max_kbps = _bitrate_kbps(bitrate) * 107 // 100
+        command += [
+            "-map", f"[v{i}out]",
+            f"-c:v:{i}", "libx264",
+            f"-b:v:{i}", bitrate,
+            f"-maxrate:v:{i}", f"{max_kbps}k",
+            f"-bufsize:v:{i}", f"{max_kbps * 3 // 2}k",
+            "-map", "0:a:0",
+            f"-c:a:{i}", "aac",
+            f"-b:a:{i}", AUDIO_BITRATE,
+        ]
+        stream_map.append(f"v:{i},a:{i}")
+        os.makedirs(os.path.join(output_dir, f"v{i}"), exist_ok=True)
+
+    command[6:6] = ["-filter_complex", ";".join(filters)]
+    command += [
+        "-preset", "fast",
+        "-pix_fmt", "yuv420p",
+        "-sc_threshold", "0",
+        "-force_key_frames", f"expr:gte(t,n_forced*{segment_seconds})",
+        "-f", "hls",
+        "-hls_time", str(segment_seconds),
+        "-hls_playlist_type", "vod",
+        "-hls_flags", "independent_segments",
+        "-hls_segment_filename", os.path.join(output_dir, "v%v", "seg_%03d.ts"),
+        "-master_pl_name", MASTER_PLAYLIST,
+        "-var_stream_map", " ".join(stream_map),
+        os.path.join(output_dir, "v%v", "index.m3u8"),
+    ]
+    subprocess.run(command, check=True, capture_output=True)
+    return os.path.join(output_dir, MASTER_PLAYLIST)
+
+
+def upload_hls_package(output_dir: str, prefix: str) -> int:
+    """Envia os arquivos de um pacote HLS para o container de vídeos, sob o prefixo informado
+
+    Args:
+        output_dir: Diretório gerado por package_hls
+        prefix: Prefixo das chaves no armazenamento
+
+    Returns:
+        int: Quantidade de arquivos enviados
+    """
+    backend = get_storage_backend()
+    container = settings.AZURE_STORAGE_CONTAINER_NAME
+    uploaded = 0
+    # A playlist master é enviada por último: enquanto ela não existe o pacote não é usado
+    for root, _, files in os.walk(output_dir):
+        for filename in sorted(files):
+            if root == output_dir and filename == MASTER_PLAYLIST:
+                continue
+            path = os.path.join(root, filename)
+            key = posixpath.join(prefix, os.path.relpath(path, output_dir).replace(os.sep, "/"))
+            with open(path, "rb") as data:
+                backend.put(
+                    container, key, data,
+                    length=os.path.getsize(path),
+                    content_type=CONTENT_TYPES.get(os.path.splitext(filename)[1])
+                )
+            uploaded += 1
+    with open(os.path.join(output_dir, MASTER_PLAYLIST), "rb") as data:
+        backend.put(
+            container, posixpath.join(prefix, MASTER_PLAYLIST), data,
+            content_type=CONTENT_TYPES[".m3u8"]
+        )
+    return uploaded + 1
+
+
+def package_and_upload_hls(video_id: int) -> Optional[str]:
+    """Empacota em HLS o vídeo renderizado e grava o prefixo do pacote no vídeo
+
+    A sessão do banco só é usada para ler o vídeo e para gravar o prefixo ao final: a
+    transcodificação e o envio dos segmentos não prendem uma conexão do pool.
+
+    Args:
+        video_id: ID do vídeo no banco de dados
+
+    Returns:
+        Optional[str]: Prefixo do pacote no armazenamento, ou None se o vídeo não puder ser empacotado
+    """
+    db = SessionLocal()
+    try:
+        video = db.query(Video.guid, Video.arquivo_video).filter(Video.id == video_id).first()
+    finally:
+        db.close()
+    if not video or not video.arquivo_video or not os.path.exists(video.arquivo_video):
+        logger.warning(
+            "Arquivo de vídeo não encontrado para empacotamento HLS",
+            extra={
+                "video_id": video_id,
+                "operation": "package_hls"
+            }
+        )
+        return None
+
+    prefix = f"hls/{video.guid}"
+    start_time = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="hls-") as output_dir:
+        package_hls(video.arquivo_video, output_dir)
+        files = upload_hls_package(output_dir, prefix)
+
+    db = SessionLocal()
+    try:
+        db.execute(update(Video.__table__).where(Video.__table__.c.id == video_id).values(hls_prefix=prefix))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    logger.info(
+        "Pacote HLS gerado e enviado",
+        extra={
+            "video_id": video_id,
+            "hls_prefix": prefix,
+            "files": files,
+            "elapsed": round(time.perf_counter() - start_time, 3),
+            "operation": "package_hls_success"
+        }
+    )
+    return prefix
+
+
+def _hls_signature(video_guid: str, expires: int) -> str:
+    message = f"hls/{video_guid}\n{expires}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def sign_hls_query(video_guid: str, expiry_hours: int = 2) -> str:
+    """Gera a query string assinada que dá acesso às playlists HLS de um vídeo
+
+    Uma única assinatura cobre a playlist master e as playlists das renditions, que a
+    repassam nas URLs relativas. A expiração é arredondada como a das SAS.
+
+    Args:
+        video_guid: GUID do vídeo
+        expiry_hours: Número de horas até a expiração (padrão: 2)
+
+    Returns:
+        str: Query string no formato exp=<timestamp>&sig=<assinatura>
+    """
+    bucket_seconds = settings.AZURE_STORAGE_SAS_EXPIRY_BUCKET_MINUTES * 60
+    expires = int(math.ceil((time.time() + expiry_hours * 3600) / bucket_seconds) * bucket_seconds)
+    return f"exp={expires}&sig={_hls_signature(video_guid, expires)}"
+
+
+def verify_hls_signature(video_guid: str, expires: int, signature: str) -> bool:
+    """Valida a assinatura e a expiração de uma query string gerada por sign_hls_query"""
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(_hls_signature(video_guid, expires), signature)
+
+
+@lru_cache(maxsize=1024)
+def _read_playlist(container: str, key: str) -> str:
+    # Playlists VOD não mudam depois de enviadas
+    return get_storage_backend().get_range(container, key).decode("utf-8")
+
+
+def render_playlist(video_guid: str, hls_prefix: str, path: str, expires: int, signature: str) -> str:
+    """Lê uma playlist do pacote HLS e assina as URIs que ela referencia
+
+    Playlists referenciadas (renditions) continuam relativas e recebem a mesma query
+    string assinada; segmentos são trocados por URLs assinadas do armazenamento, com o
+    mesmo prazo de validade.
+
+    Args:
+        video_guid: GUID do vídeo
+        hls_prefix: Prefixo do pacote no armazenamento
+        path: Caminho da playlist dentro do pacote
+        expires: Expiração da query string recebida
+        signature: Assinatura da query string recebida
+
+    Returns:
+        str: Conteúdo da playlist com as URIs assinadas
+
+    Raises:
+        ValueError: Se o caminho não for uma playlist do pacote
+    """
+    path = posixpath.normpath(path)
+    if not path.endswith(".m3u8") or path.startswith(("..", "/")):
+        raise ValueError(f"Playlist inválida: {path}")
+
+    container = settings.AZURE_STORAGE_CONTAINER_NAME
+    playlist = _read_playlist(container, posixpath.join(hls_prefix, path))
+    directory = posixpath.dirname(path)
+    # Horas inteiras para aproveitar o cache de URLs assinadas entre requisições
+    expiry_hours = max(math.ceil((expires - time.time()) / 3600), 1)
+    backend = get_storage_backend()
+
+    lines = []
+    for line in playlist.splitlines():
+        if line and not line.startswith("#"):
+            if line.endswith(".m3u8"):
+                line = f"{line}?exp={expires}&sig={signature}"
+            else:
+                key = posixpath.join(hls_prefix, directory, line)
+                line = backend.signed_url(container, key, expiry_hours)
+        lines.append(line)
+    return "\n".join(lines) + "\n"
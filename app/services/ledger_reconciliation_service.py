@@ -0,0 +1,201 @@
+from typing import Dict
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.logger import get_logger
+from app.models.video_credit import VideoCredit
+from app.models.video_credit_checkpoint import VideoCreditCheckpoint
+from app.models.video_credit_transaction import VideoCreditTransaction
+from app.services.credit_service import INITIAL_CREDIT_BALANCE
+
+logger = get_logger("ledger_reconciliation_service")
+
+
+def _reconcile_batch(db: Session, last_credit_id: int, batch_size: int, totals: Dict[str, int]) -> int:
+    """Concilia um lote de contas com id maior que last_credit_id; retorna o maior id do lote (0 se vazio)"""
+    # Saldos e histórico lidos no mesmo snapshot: alteração de saldo e transação são gravadas juntas
+    db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    credit_table = VideoCredit.__table__
+    transaction_table = VideoCreditTransaction.__table__
+    checkpoint_table = VideoCreditCheckpoint.__table__
+
+    credits = db.execute(
+        select(credit_table.c.id, credit_table.c.user_id, credit_table.c.balance)
+        .where(credit_table.c.id > last_credit_id)
+        .order_by(credit_table.c.id)
+        .limit(batch_size)
+    ).all()
+    if not credits:
+        db.rollback()
+        return 0
+    credit_ids = [credit.id for credit in credits]
+
+    checkpoints = {
+        row.video_credit_id: row
+        for row in db.execute(
+            select(checkpoint_table).where(checkpoint_table.c.video_credit_id.in_(credit_ids))
+        )
+    }
+
+    # Apenas as transações posteriores ao checkpoint de cada conta
+    new_transactions = {
+        row.video_credit_id: row
+        for row in db.execute(
+            select(
+                transaction_table.c.video_credit_id,
+                func.sum(transaction_table.c.amount).label("amount"),
+                func.max(transaction_table.c.id).label("last_transaction_id"),
+                func.count().label("transactions")
+            )
+            .select_from(
+                transaction_table.outerjoin(
+                    checkpoint_table,
+                    checkpoint_table.c.video_credit_id == transaction_table.c.video_credit_id
+                )
+            )
+            .where(
+                transaction_table.c.video_credit_id.in_(credit_ids),
+                transaction_table.c.id > func.coalesce(checkpoint_table.c.last_transaction_id, 0)
+            )
+            .group_by(transaction_table.c.video_credit_id)
+        )
+    }
+
+    # Saldo anterior à primeira transação das contas ainda sem checkpoint, conferido com a âncora
+    unchecked_ids = [credit_id for credit_id in credit_ids if credit_id not in checkpoints]
+    openings = {}
+    if unchecked_ids:
+        openings = dict(
+            db.execute(
+                select(
+                    transaction_table.c.video_credit_id,
+                    transaction_table.c.balance_after - transaction_table.c.amount
+                )
+                .where(transaction_table.c.video_credit_id.in_(unchecked_ids))
+                .distinct(transaction_table.c.video_credit_id)
+                .order_by(transaction_table.c.video_credit_id, transaction_table.c.id)
+            ).all()
+        )
+
+    updates = []
+    for credit in credits:
+        checkpoint = checkpoints.get(credit.id)
+        new = new_transactions.get(credit.id)
+        if checkpoint:
+            expected_balance = checkpoint.expected_balance
+            last_transaction_id = checkpoint.last_transaction_id
+        else:
+            # Toda conta nasce com INITIAL_CREDIT_BALANCE; a primeira transação não define a abertura
+            expected_balance = INITIAL_CREDIT_BALANCE
+            last_transaction_id = 0
+            opening = openings.get(credit.id)
+            if opening is not None and opening != INITIAL_CREDIT_BALANCE:
+                logger.error(
+                    "Saldo anterior à primeira transação diverge do saldo inicial",
+                    extra={
+                        "video_credit_id": credit.id,
+                        "user_id": credit.user_id,
+                        "opening_balance": opening,
+                        "initial_balance": INITIAL_CREDIT_BALANCE,
+                        "operation": "ledger_opening_mismatch"
+                    }
+                )
+        if new:
+            expected_balance += new.amount
+            last_transaction_id = new.last_transaction_id
+            totals["transactions"] += new.transactions
+
+        drift = credit.balance - expected_balance
+        totals["accounts"] += 1
+        if drift:
+            totals["drifted_accounts"] += 1
+            totals["total_drift"] += abs(drift)
+
+        previous_drift = checkpoint.drift if checkpoint else 0
+        if drift != previous_drift:
+            # Alerta apenas quando a divergência surge ou muda; as métricas contam todas
+            logger.error(
+                "Divergência entre saldo e histórico de créditos",
+                extra={
+                    "video_credit_id": credit.id,
+                    "user_id": credit.user_id,
+                    "balance": credit.balance,
+                    "expected_balance": expected_balance,
+                    "drift": drift,
+                    "previous_drift": previous_drift,
+                    "operation": "ledger_drift_detected"
+                }
+            )
+
+        if checkpoint is None or new or drift != previous_drift:
+            updates.append({
+                "video_credit_id": credit.id,
+                "last_transaction_id": last_transaction_id,
+                "expected_balance": expected_balance,
+                "drift": drift
+            })
+
+    if updates:
+        statement = pg_insert(checkpoint_table).values(updates)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["video_credit_id"],
+                set_={
+                    "last_transaction_id": statement.excluded.last_transaction_id,
+                    "expected_balance": statement.excluded.expected_balance,
+                    "drift": statement.excluded.drift,
+                    "updated_at": statement.excluded.updated_at
+                }
+            )
+        )
+    db.commit()
+    return credit_ids[-1]
+
+
+def reconcile_credit_ledger(db: Session, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Confere se o saldo de cada conta bate com o histórico de transações.
+
+    O saldo esperado é o saldo inicial da conta (INITIAL_CREDIT_BALANCE, gravado no cadastro
+    por provision_user_credit e no backfill dos usuários antigos) somado às transações do
+    histórico. A primeira transação não é usada como abertura: o saldo anterior a ela
+    (balance_after - amount) precisa bater com o saldo inicial, e quando não bate a diferença
+    é registrada (operation=ledger_opening_mismatch) e aparece como divergência da conta, de
+    modo que alterações de saldo anteriores ao histórico também são detectadas.
+    Cada conta guarda um checkpoint com a última transação somada e o saldo esperado até
+    ela, então cada execução lê apenas as transações novas. Dentro de uma conta, os ids
+    das transações seguem a ordem de commit (a alteração do saldo trava a linha do
+    crédito antes da inserção), de modo que nenhuma transação fica para trás do checkpoint.
+
+    Divergências são registradas em log como erro (operation=ledger_drift_detected) quando
+    surgem ou mudam, e o saldo nunca é corrigido automaticamente.
+
+    Args:
+        db: Sessão do banco de dados
+        batch_size: Quantidade de contas conciliadas por transação
+
+    Returns:
+        Dict[str, int]: Métricas da execução (accounts, transactions, drifted_accounts, total_drift)
+    """
+    totals = {"accounts": 0, "transactions": 0, "drifted_accounts": 0, "total_drift": 0}
+    start_time = time.perf_counter()
+    last_credit_id = 0
+    while True:
+        last_credit_id = _reconcile_batch(db, last_credit_id, batch_size, totals)
+        if not last_credit_id:
+            break
+
+    log = logger.warning if totals["drifted_accounts"] else logger.info
+    log(
+        "Conciliação do histórico de créditos concluída",
+        extra={
+            **totals,
+            "elapsed": round(time.perf_counter() - start_time, 3),
+            "operation": "reconcile_credit_ledger"
+        }
+    )
+    return totals
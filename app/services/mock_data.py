@@ -4,6 +4,8 @@ import json
 from datetime import datetime
 from typing import Dict, Any, List
 
+from app.services.genvideo.models.post_data import PostData
+
 def mock_video_data(titulo: str, duracao_segundos: int) -> Dict[str, Any]:
     """
     Gera dados simulados (mock) para um vídeo.
@@ -95,21 +97,20 @@ Comentários? Deixe abaixo! 👇
 </speak>"""
     
     # Cria o objeto post_data simulado
-    post_data = {
-        "guid": identificador,
-        "solicitacao": titulo,
-        "titulo": titulo,
-        "roteiro": roteiro,
-        "frases": frases,
-        "hashtags": hashtags,
-        "conteudo": conteudo,
-        "imagens": imagens,
-        "narracao_marcada": narracao_marcada,
-        "arquivo_narracao_raw": arquivo_narracao_raw,
-        "arquivo_narracao_remix": arquivo_narracao_remix,
-        "arquivo_video": arquivo_video,
-        "data_registro": datetime.now().isoformat()
-    }
+    post_data = PostData(
+        guid=identificador,
+        solicitacao=titulo,
+        titulo=titulo,
+        roteiro=roteiro,
+        frases=frases,
+        hashtags=hashtags,
+        conteudo=conteudo,
+        imagens=imagens,
+        narracao_marcada=narracao_marcada,
+        arquivo_narracao_raw=arquivo_narracao_raw,
+        arquivo_narracao_remix=arquivo_narracao_remix,
+        arquivo_video=arquivo_video
+    )
     
     # Retorna o resultado simulado
     return {
@@ -0,0 +1,309 @@
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Callable, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit
+import hashlib
+import hmac
+import math
+import os
+import tempfile
+import threading
+import time
+
+from azure.core.exceptions import HttpResponseError, ResourceExistsError, ResourceNotFoundError
+from azure.storage.blob import ContentSettings
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger("storage_backends")
+
+# Conta de desenvolvimento padrão do emulador Azurite (pública, documentada pela Microsoft)
+AZURITE_CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;"
+    "AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;"
+    "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
+)
+
+
+class StorageBackend(ABC):
+    """
+    Interface dos backends de armazenamento de vídeos e artefatos.
+
+    Os objetos são identificados por container e chave; os backends compatíveis com
+    o Azure Blob (azure_compatible) também aceitam upload assíncrono e upload em blocos
+    durante a renderização.
+    """
+
+    name: str = ""
+    azure_compatible: bool = False
+
+    @abstractmethod
+    def ensure_container(self, container: str) -> None:
+        """Garante que o container exista"""
+
+    @abstractmethod
+    def put(
+        self,
+        container: str,
+        key: str,
+        stream: BinaryIO,
+        length: Optional[int] = None,
+        overwrite: bool = True,
+        progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+        content_type: Optional[str] = None
+    ) -> str:
+        """Grava um objeto lendo o conteúdo do stream em partes
+
+        Args:
+            container: Nome do container
+            key: Chave (nome) do objeto
+            stream: Arquivo ou stream binário com o conteúdo
+            length: Tamanho do conteúdo em bytes, se conhecido
+            overwrite: Se False, falha com FileExistsError quando o objeto já existir
+            progress_callback: Função chamada com (bytes enviados, total de bytes)
+            content_type: Tipo MIME gravado com o objeto, quando o backend o armazena
+
+        Returns:
+            str: URL (não assinada) do objeto
+        """
+
+    @abstractmethod
+    def url(self, container: str, key: str) -> str:
+        """Retorna a URL (não assinada) do objeto"""
+
+    @abstractmethod
+    def parse_url(self, url: str) -> Optional[Tuple[str, str]]:
+        """Extrai o container e a chave de uma URL gerada por url(), ou None se não pertencer ao backend"""
+
+    @abstractmethod
+    def exists(self, container: str, key: str) -> bool:
+        """Verifica se o objeto existe"""
+
+    @abstractmethod
+    def get_range(self, container: str, key: str, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """Lê um intervalo de bytes do objeto"""
+
+    @abstractmethod
+    def signed_url(self, container: str, key: str, expiry_hours: int, permission: str = "r") -> str:
+        """Gera uma URL assinada e temporária para o objeto"""
+
+    @abstractmethod
+    def delete(self, container: str, key: str) -> None:
+        """Remove o objeto, se existir"""
+
+
+class AzureBlobStorageBackend(StorageBackend):
+    """Backend do Azure Blob Storage, usando o cliente compartilhado de storage_service"""
+
+    name = "azure"
+    azure_compatible = True
+
+    def ensure_container(self, container: str) -> None:
+        from app.services.storage_service import ensure_container_exists
+        ensure_container_exists(container)
+
+    def _blob_client(self, container: str, key: str):
+        from app.services.storage_service import ensure_container_exists
+        return ensure_container_exists(container).get_blob_client(key)
+
+    def put(self, container, key, stream, length=None, overwrite=True, progress_callback=None,
+            content_type=None) -> str:
+        blob_client = self._blob_client(container, key)
+        upload_kwargs = {"max_concurrency": settings.AZURE_STORAGE_MAX_CONCURRENCY}
+        if content_type:
+            upload_kwargs["content_settings"] = ContentSettings(content_type=content_type)
+        if progress_callback:
+            upload_kwargs["progress_hook"] = progress_callback
+        if not overwrite:
+            upload_kwargs["if_none_match"] = "*"
+        try:
+            blob_client.upload_blob(stream, length=length, overwrite=overwrite, **upload_kwargs)
+        except ResourceExistsError as e:
+            raise FileExistsError(f"{container}/{key}") from e
+        return blob_client.url
+
+    def url(self, container, key) -> str:
+        # Apenas monta a URL: os containers são provisionados na inicialização da aplicação
+        from app.services.storage_service import get_blob_service_client
+        return get_blob_service_client().get_blob_client(container, key).url
+
+    def parse_url(self, url) -> Optional[Tuple[str, str]]:
+        from app.services.storage_service import parse_blob_url
+        return parse_blob_url(url)
+
+    def exists(self, container, key) -> bool:
+        return self._blob_client(container, key).exists()
+
+    def get_range(self, container, key, offset=0, length=None) -> bytes:
+        try:
+            return self._blob_client(container, key).download_blob(offset=offset, length=length).readall()
+        except ResourceNotFoundError as e:
+            raise FileNotFoundError(f"{container}/{key}") from e
+        except HttpResponseError as e:
+            # Intervalo iniciado além do fim do blob: mesmo comportamento de read() no fim do arquivo
+            if e.status_code == 416:
+                return b""
+            raise
+
+    def signed_url(self, container, key, expiry_hours, permission="r") -> str:
+        from app.services.storage_service import _generate_sas_url
+        return _generate_sas_url(container, key, expiry_hours, permission)
+
+    def delete(self, container, key) -> None:
+        try:
+            self._blob_client(container, key).delete_blob()
+        except ResourceNotFoundError:
+            pass
+
+
+class AzuriteStorageBackend(AzureBlobStorageBackend):
+    """Backend do emulador Azurite; usa a conta de desenvolvimento se nenhuma string de conexão for definida"""
+
+    name = "azurite"
+
+
+class LocalFileSystemStorageBackend(StorageBackend):
+    """
+    Backend em sistema de arquivos local, para desenvolvimento, CI e testes de carga.
+
+    Os objetos ficam em <LOCAL_STORAGE_PATH>/<container>/<chave> e são servidos pela
+    rota /storage, que valida URLs assinadas com HMAC-SHA256 usando a
+    LOCAL_STORAGE_SIGNING_KEY, que precisa ser a mesma em todos os processos.
+    """
+
+    name = "local"
+
+    def __init__(self, root: str, base_url: str, secret_key: str):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+        self._secret_key = secret_key.encode()
+
+    def path_for(self, container: str, key: str) -> str:
+        """Resolve o caminho local do objeto, impedindo chaves fora do container"""
+        container_root = os.path.join(self.root, container)
+        path = os.path.abspath(os.path.join(container_root, key))
+        if not path.startswith(container_root + os.sep):
+            raise ValueError(f"Chave inválida: {key}")
+        return path
+
+    def ensure_container(self, container: str) -> None:
+        os.makedirs(os.path.join(self.root, container), exist_ok=True)
+
+    def put(self, container, key, stream, length=None, overwrite=True, progress_callback=None,
+            content_type=None) -> str:
+        # O tipo MIME é deduzido da extensão ao servir o arquivo
+        path = self.path_for(container, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not overwrite and os.path.exists(path):
+            raise FileExistsError(f"{container}/{key}")
+
+        # Grava em um arquivo temporário e renomeia, para que leitores nunca vejam objetos parciais
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".upload-")
+        try:
+            written = 0
+            with os.fdopen(fd, "wb") as f:
+                for chunk in iter(lambda: stream.read(settings.AZURE_STORAGE_MAX_BLOCK_SIZE), b""):
+                    f.write(chunk)
+                    written += len(chunk)
+                    if progress_callback:
+                        progress_callback(written, length)
+            if not overwrite and os.path.exists(path):
+                raise FileExistsError(f"{container}/{key}")
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return self.url(container, key)
+
+    def url(self, container, key) -> str:
+        return f"{self.base_url}/{quote(container)}/{quote(key)}"
+
+    def parse_url(self, url) -> Optional[Tuple[str, str]]:
+        path = urlsplit(url).path
+        base_path = urlsplit(self.base_url).path
+        if not url.startswith(self.base_url + "/"):
+            return None
+        container, _, key = path[len(base_path) + 1:].partition("/")
+        if not container or not key:
+            return None
+        return unquote(container), unquote(key)
+
+    def exists(self, container, key) -> bool:
+        return os.path.exists(self.path_for(container, key))
+
+    def get_range(self, container, key, offset=0, length=None) -> bytes:
+        with open(self.path_for(container, key), "rb") as f:
+            f.seek(offset)
+            return f.read() if length is None else f.read(length)
+
+    def _signature(self, container: str, key: str, expires: int, permission: str) -> str:
+        message = f"{container}/{key}\n{expires}\n{permission}".encode()
+        return hmac.new(self._secret_key, message, hashlib.sha256).hexdigest()
+
+    def signed_url(self, container, key, expiry_hours, permission="r") -> str:
+        # Mesmo arredondamento da SAS do Azure: pedidos no mesmo intervalo geram a mesma URL
+        bucket_seconds = settings.AZURE_STORAGE_SAS_EXPIRY_BUCKET_MINUTES * 60
+        expires = time.time() + expiry_hours * 3600
+        expires = int(math.ceil(expires / bucket_seconds) * bucket_seconds)
+        signature = self._signature(container, key, expires, permission)
+        return f"{self.url(container, key)}?exp={expires}&perm={permission}&sig={signature}"
+
+    def verify_signature(self, container: str, key: str, expires: int, permission: str, signature: str) -> bool:
+        """Valida a assinatura e a expiração de uma URL gerada por signed_url"""
+        if expires < time.time():
+            return False
+        expected = self._signature(container, key, expires, permission)
+        return hmac.compare_digest(expected, signature)
+
+    def delete(self, container, key) -> None:
+        try:
+            os.remove(self.path_for(container, key))
+        except FileNotFoundError:
+            pass
+
+
+_storage_backend: Optional[StorageBackend] = None
+_storage_backend_lock = threading.Lock()
+
+
+def _create_storage_backend() -> StorageBackend:
+    backend = settings.STORAGE_BACKEND.lower()
+    if backend == "azure":
+        return AzureBlobStorageBackend()
+    if backend == "azurite":
+        return AzuriteStorageBackend()
+    if backend == "local":
+        # Uma chave gerada por processo invalidaria as URLs assinadas por outros workers ou antes de um reinício
+        if not settings.LOCAL_STORAGE_SIGNING_KEY:
+            raise ValueError("LOCAL_STORAGE_SIGNING_KEY deve ser definida para STORAGE_BACKEND=local")
+        return LocalFileSystemStorageBackend(
+            root=settings.LOCAL_STORAGE_PATH,
+            base_url=settings.LOCAL_STORAGE_BASE_URL,
+            secret_key=settings.LOCAL_STORAGE_SIGNING_KEY
+        )
+    raise ValueError(f"Backend de armazenamento desconhecido: {settings.STORAGE_BACKEND}")
+
+
+def get_storage_backend() -> StorageBackend:
+    """Retorna o backend de armazenamento configurado em STORAGE_BACKEND, compartilhado pelo processo"""
+    global _storage_backend
+    if _storage_backend is None:
+        with _storage_backend_lock:
+            if _storage_backend is None:
+                _storage_backend = _create_storage_backend()
+                logger.info(
+                    "Backend de armazenamento inicializado",
+                    extra={
+                        "backend": _storage_backend.name,
+                        "operation": "get_storage_backend"
+                    }
+                )
+    return _storage_backend
+
+
+def reset_storage_backend() -> None:
+    """Descarta o backend atual; o próximo acesso usa a configuração vigente"""
+    global _storage_backend
+    with _storage_backend_lock:
+        _storage_backend = None
@@ -1,16 +1,64 @@
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
+from collections import OrderedDict
+from urllib.parse import quote, unquote
+import base64
+import hashlib
+import math
 import os
+import time
 import uuid
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient, generate_blob_sas, BlobSasPermissions
+import requests
+from requests.adapters import HTTPAdapter
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobServiceClient, BlobClient, BlobBlock, ContainerClient, generate_blob_sas, BlobSasPermissions
 from app.core.config import settings
 from app.core.logger import get_logger
 
 logger = get_logger("storage_service")
 
+_blob_service_client: Optional[BlobServiceClient] = None
+_blob_service_client_lock = threading.Lock()
+
+
+def get_connection_string() -> str:
+    """Obtém a string de conexão do Blob Storage
+    
+    Com STORAGE_BACKEND=azurite e sem string de conexão definida, usa a conta de
+    desenvolvimento padrão do emulador.
+    """
+    if not settings.AZURE_STORAGE_CONNECTION_STRING and settings.STORAGE_BACKEND.lower() == "azurite":
+        from app.services.storage_backends import AZURITE_CONNECTION_STRING
+        return AZURITE_CONNECTION_STRING
+    return settings.AZURE_STORAGE_CONNECTION_STRING
+
+
+def _build_transport() -> RequestsTransport:
+    """Cria o transporte HTTP com pool de conexões e timeouts configurados"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.AZURE_STORAGE_POOL_CONNECTIONS,
+        pool_maxsize=settings.AZURE_STORAGE_POOL_MAXSIZE
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return RequestsTransport(
+        session=session,
+        session_owner=True,
+        connection_timeout=settings.AZURE_STORAGE_CONNECTION_TIMEOUT,
+        read_timeout=settings.AZURE_STORAGE_READ_TIMEOUT
+    )
+
+
 def get_blob_service_client() -> BlobServiceClient:
-    """Obtém um cliente do serviço de Blob Storage do Azure
+    """Obtém o cliente do serviço de Blob Storage do Azure compartilhado pelo processo
+    
+    O cliente é criado na primeira chamada e reutilizado nas seguintes, mantendo
+    o mesmo pool de conexões HTTP entre uploads e gerações de URL.
     
     Returns:
         BlobServiceClient: Cliente do serviço de Blob Storage
@@ -18,30 +66,134 @@ def get_blob_service_client() -> BlobServiceClient:
     Raises:
         Exception: Se não for possível conectar ao serviço de Blob Storage
     """
-    try:
-        # Cria um cliente do serviço de Blob Storage usando a string de conexão
-        blob_service_client = BlobServiceClient.from_connection_string(settings.AZURE_STORAGE_CONNECTION_STRING)
-        return blob_service_client
-    except Exception as e:
-        logger.error(
-            "Erro ao conectar ao serviço de Blob Storage",
-            extra={
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-                "operation": "get_blob_service_client"
-            }
-        )
-        raise
+    global _blob_service_client
+    if _blob_service_client is not None:
+        return _blob_service_client
+    
+    with _blob_service_client_lock:
+        if _blob_service_client is not None:
+            return _blob_service_client
+        try:
+            # Cria um cliente do serviço de Blob Storage usando a string de conexão
+            _blob_service_client = BlobServiceClient.from_connection_string(
+                get_connection_string(),
+                transport=_build_transport(),
+                max_block_size=settings.AZURE_STORAGE_MAX_BLOCK_SIZE,
+                max_single_put_size=settings.AZURE_STORAGE_MAX_SINGLE_PUT_SIZE
+            )
+            logger.info(
+                "Cliente do Blob Storage inicializado",
+                extra={
+                    "pool_maxsize": settings.AZURE_STORAGE_POOL_MAXSIZE,
+                    "operation": "get_blob_service_client"
+                }
+            )
+            return _blob_service_client
+        except Exception as e:
+            logger.error(
+                "Erro ao conectar ao serviço de Blob Storage",
+                extra={
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "operation": "get_blob_service_client"
+                }
+            )
+            raise
+
+
+def reset_blob_service_client() -> None:
+    """Descarta o cliente compartilhado do Blob Storage
+    
+    Deve ser chamado após a rotação de credenciais; a próxima chamada a
+    get_blob_service_client cria um novo cliente com a string de conexão atual.
+    Também descarta a chave da conta e as URLs com SAS em cache.
+    """
+    global _blob_service_client, _account_credentials
+    with _blob_service_client_lock:
+        client, _blob_service_client = _blob_service_client, None
+        _ready_containers.clear()
+        _account_credentials = None
+    with _sas_cache_lock:
+        _sas_cache.clear()
+    if client is not None:
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning(
+                "Erro ao fechar cliente do Blob Storage",
+                extra={
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "operation": "reset_blob_service_client"
+                }
+            )
+    logger.info(
+        "Cliente do Blob Storage descartado",
+        extra={"operation": "reset_blob_service_client"}
+    )
+
+_ready_containers = set()
+_container_lock = threading.Lock()
+
+
+def ensure_container_exists(container_name: Optional[str] = None) -> ContainerClient:
+    """Garante que o container exista, verificando apenas uma vez por processo
+    
+    Cria o container somente quando o serviço responde 404; qualquer outro erro
+    é propagado e a verificação é refeita na próxima chamada.
+    
+    Args:
+        container_name: Nome do container (padrão: container de vídeos)
+        
+    Returns:
+        ContainerClient: Cliente do container
+        
+    Raises:
+        Exception: Se não for possível verificar ou criar o container
+    """
+    container_name = container_name or settings.AZURE_STORAGE_CONTAINER_NAME
+    container_client = get_blob_service_client().get_container_client(container_name)
+    if container_name in _ready_containers:
+        return container_client
+    
+    with _container_lock:
+        if container_name in _ready_containers:
+            return container_client
+        try:
+            container_client.get_container_properties()
+        except ResourceNotFoundError:
+            try:
+                container_client.create_container()
+                logger.info(
+                    f"Container {container_name} criado com sucesso",
+                    extra={"operation": "create_container"}
+                )
+            except ResourceExistsError:
+                # Criado por outro processo entre a verificação e a criação
+                pass
+        _ready_containers.add(container_name)
+    
+    return container_client
+
 
-def upload_video_to_blob_storage(file_path: str, video_id: int) -> Optional[str]:
+def upload_video_to_blob_storage(
+    file_path: str,
+    video_id: int,
+    progress_callback: Optional[Callable[[int, Optional[int]], None]] = None
+) -> Optional[Dict[str, str]]:
     """Faz upload de um vídeo para o Azure Blob Storage
     
+    O upload usa o backend configurado em STORAGE_BACKEND. No Azure Blob, arquivos maiores
+    que AZURE_STORAGE_MAX_SINGLE_PUT_SIZE são enviados em blocos de AZURE_STORAGE_MAX_BLOCK_SIZE,
+    com até AZURE_STORAGE_MAX_CONCURRENCY blocos em paralelo.
+    
     Args:
         file_path: Caminho local do arquivo de vídeo
         video_id: ID do vídeo no banco de dados
+        progress_callback: Função chamada com (bytes enviados, total de bytes) durante o upload
         
     Returns:
-        str: URL do blob no Azure Storage ou None em caso de falha
+        Dict[str, str]: URL, container e nome do blob no armazenamento, ou None em caso de falha
         
     Raises:
         Exception: Se ocorrer um erro durante o upload
@@ -58,45 +210,42 @@ def upload_video_to_blob_storage(file_path: str, video_id: int) -> Optional[str]
         return None
     
     try:
+        from app.services.storage_backends import get_storage_backend
+        
         # Gera um nome único para o blob baseado no ID do vídeo
         blob_name = f"video_{video_id}_{uuid.uuid4()}.mp4"
         
-        # Obtém o cliente do serviço de Blob Storage
-        blob_service_client = get_blob_service_client()
-        
-        # Obtém o cliente do container
-        container_client = blob_service_client.get_container_client(settings.AZURE_STORAGE_CONTAINER_NAME)
-        
-        # Verifica se o container existe, se não, cria
-        try:
-            container_client.get_container_properties()
-        except Exception:
-            container_client.create_container()
-            logger.info(
-                f"Container {settings.AZURE_STORAGE_CONTAINER_NAME} criado com sucesso",
-                extra={"operation": "create_container"}
-            )
-        
-        # Obtém o cliente do blob
-        blob_client = container_client.get_blob_client(blob_name)
-        
-        # Faz upload do arquivo para o blob
+        # Faz upload do arquivo (existência do container verificada uma única vez por processo)
+        file_size = os.path.getsize(file_path)
+        start_time = time.perf_counter()
         with open(file_path, "rb") as data:
-            blob_client.upload_blob(data, overwrite=True)
-        
-        # Retorna a URL do blob
-        blob_url = blob_client.url
+            blob_url = get_storage_backend().put(
+                settings.AZURE_STORAGE_CONTAINER_NAME,
+                blob_name,
+                data,
+                length=file_size,
+                progress_callback=progress_callback
+            )
+        upload_time = time.perf_counter() - start_time
         
         logger.info(
             "Vídeo enviado para o Blob Storage com sucesso",
             extra={
                 "video_id": video_id,
                 "blob_name": blob_name,
+                "size_bytes": file_size,
+                "upload_time": round(upload_time, 3),
+                "throughput_mbps": round(file_size * 8 / 1_000_000 / upload_time, 2) if upload_time > 0 else None,
+                "max_concurrency": settings.AZURE_STORAGE_MAX_CONCURRENCY,
                 "operation": "upload_video_to_blob_storage_success"
             }
         )
         
-        return blob_url
+        return {
+            "url": blob_url,
+            "container": settings.AZURE_STORAGE_CONTAINER_NAME,
+            "blob_name": blob_name
+        }
     except Exception as e:
         logger.error(
             "Erro ao fazer upload do vídeo para o Blob Storage",
@@ -110,63 +259,371 @@ def upload_video_to_blob_storage(file_path: str, video_id: int) -> Optional[str]
         )
         return None
 
-def generate_download_url(blob_url: str, video_id: int, expiry_hours: int = 24) -> Optional[str]:
-    """Gera uma URL de download com SAS (Shared Access Signature) para um blob
+_known_artifacts = set()
+
+
+def _sha256_file(file_path: str) -> str:
+    """Calcula o SHA-256 de um arquivo em blocos, sem carregá-lo inteiro em memória"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def upload_artifact(file_path: str) -> Optional[str]:
+    """Envia um artefato do pipeline (imagem, narração) para o armazenamento endereçado por conteúdo
+    
+    O blob é nomeado pelo SHA-256 do conteúdo (sha256/<2 primeiros>/<hash><extensão>),
+    no container AZURE_STORAGE_ARTIFACTS_CONTAINER_NAME. Se um blob com o mesmo hash
+    já existir, o upload é ignorado e a URL existente é reutilizada.
     
     Args:
-        blob_url: URL do blob no Azure Storage
-        video_id: ID do vídeo no banco de dados
-        expiry_hours: Número de horas até a expiração da URL (padrão: 24)
+        file_path: Caminho local do artefato
         
     Returns:
-        str: URL de download com SAS ou None em caso de falha
-        
-    Raises:
-        Exception: Se ocorrer um erro ao gerar a URL
+        str: URL do blob do artefato ou None em caso de falha
     """
+    if not file_path or not os.path.exists(file_path):
+        logger.warning(
+            "Artefato não encontrado para upload",
+            extra={
+                "file_path": file_path,
+                "operation": "upload_artifact"
+            }
+        )
+        return None
+    
     try:
-        # Extrai o nome do container e do blob da URL
-        # Formato da URL: https://<storage-account>.blob.core.windows.net/<container>/<blob>
-        blob_service_client = get_blob_service_client()
-        account_name = blob_service_client.account_name
+        digest = _sha256_file(file_path)
+        extension = os.path.splitext(file_path)[1].lower()
+        blob_name = f"sha256/{digest[:2]}/{digest}{extension}"
+        
+        from app.services.storage_backends import get_storage_backend
+        backend = get_storage_backend()
+        container_name = settings.AZURE_STORAGE_ARTIFACTS_CONTAINER_NAME
+        
+        # Verifica a existência antes de enviar os bytes; overwrite=False cobre a
+        # corrida com outro processo enviando o mesmo conteúdo ao mesmo tempo
+        uploaded = False
+        if blob_name not in _known_artifacts and not backend.exists(container_name, blob_name):
+            try:
+                with open(file_path, "rb") as data:
+                    backend.put(
+                        container_name,
+                        blob_name,
+                        data,
+                        length=os.path.getsize(file_path),
+                        overwrite=False
+                    )
+                uploaded = True
+            except FileExistsError:
+                pass
+        
+        _known_artifacts.add(blob_name)
+        
+        logger.info(
+            "Artefato armazenado por conteúdo",
+            extra={
+                "blob_name": blob_name,
+                "uploaded": uploaded,
+                "operation": "upload_artifact_success"
+            }
+        )
+        
+        return backend.url(container_name, blob_name)
+    except Exception as e:
+        logger.error(
+            "Erro ao enviar artefato para o Blob Storage",
+            extra={
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                "file_path": file_path,
+                "operation": "upload_artifact_error"
+            }
+        )
+        return None
+
+
+class StagedBlobUpload:
+    """Envia um vídeo para o Blob Storage enquanto ele ainda está sendo renderizado
+    
+    Acompanha o arquivo de saída do encoder (MP4 fragmentado, gravado apenas por
+    acréscimo) e envia cada trecho completo de AZURE_STORAGE_MAX_BLOCK_SIZE bytes como
+    um bloco não confirmado (stage_block). Quando o encoder termina, envia o restante
+    e confirma a lista de blocos, de forma que o upload se sobrepõe à renderização.
+    """
+    
+    def __init__(self, file_path: str, blob_name: Optional[str] = None, poll_interval: float = 0.5):
+        """
+        Args:
+            file_path: Caminho do arquivo que está sendo gravado pelo encoder
+            blob_name: Nome do blob de destino (padrão: derivado do nome do arquivo)
+            poll_interval: Intervalo, em segundos, entre verificações do arquivo
+        """
+        self.file_path = file_path
+        self.blob_name = blob_name or f"video_{os.path.splitext(os.path.basename(file_path))[0]}_{uuid.uuid4()}.mp4"
+        self.poll_interval = poll_interval
+        self.block_size = settings.AZURE_STORAGE_MAX_BLOCK_SIZE
+        self.result: Optional[Dict[str, str]] = None
+        self._block_ids = []
+        self._futures = []
+        self._offset = 0
+        self._finished = threading.Event()
+        self._aborted = False
+        self._error: Optional[Exception] = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers=settings.AZURE_STORAGE_MAX_CONCURRENCY)
+        # Limita os blocos em memória: no máximo dois por thread de envio aguardando ou em envio
+        self._slots = threading.BoundedSemaphore(settings.AZURE_STORAGE_MAX_CONCURRENCY * 2)
+        self._blob_client: Optional[BlobClient] = None
+    
+    def start(self) -> "StagedBlobUpload":
+        """Inicia o acompanhamento do arquivo em uma thread separada"""
+        try:
+            self._blob_client = ensure_container_exists().get_blob_client(self.blob_name)
+        except Exception:
+            self._executor.shutdown(wait=False)
+            raise
+        self._thread = threading.Thread(target=self._tail, name=f"staged-upload-{self.blob_name}", daemon=True)
+        self._start_time = time.perf_counter()
+        self._thread.start()
+        return self
+    
+    def finish(self) -> Optional[Dict[str, str]]:
+        """Sinaliza o fim da renderização, envia o restante e confirma os blocos
         
-        # Extrai o nome do blob da URL
-        parts = blob_url.split(f"{account_name}.blob.core.windows.net/")
-        if len(parts) != 2:
+        Returns:
+            Dict[str, str]: URL, container e nome do blob, ou None em caso de falha
+        """
+        self._finished.set()
+        self._thread.join()
+        try:
+            if self._error:
+                raise self._error
+            if not self._block_ids:
+                raise FileNotFoundError(f"Nenhum dado gravado em {self.file_path}")
+            for future in self._futures:
+                future.result()
+            self._blob_client.commit_block_list([BlobBlock(block_id=block_id) for block_id in self._block_ids])
+        except Exception as e:
             logger.error(
-                "Formato de URL de blob inválido",
+                "Erro ao confirmar upload durante a renderização",
                 extra={
-                    "blob_url": blob_url,
-                    "video_id": video_id,
-                    "operation": "generate_download_url"
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "blob_name": self.blob_name,
+                    "operation": "staged_blob_upload_error"
                 }
             )
             return None
+        finally:
+            self._executor.shutdown(wait=False)
         
-        container_blob_path = parts[1]
-        container_name, blob_name = container_blob_path.split("/", 1)
+        upload_time = time.perf_counter() - self._start_time
+        self.result = {
+            "url": self._blob_client.url,
+            "container": settings.AZURE_STORAGE_CONTAINER_NAME,
+            "blob_name": self.blob_name
+        }
+        logger.info(
+            "Vídeo enviado para o Blob Storage durante a renderização",
+            extra={
+                "blob_name": self.blob_name,
+                "size_bytes": self._offset,
+                "blocks": len(self._block_ids),
+                "upload_time": round(upload_time, 3),
+                "operation": "staged_blob_upload_success"
+            }
+        )
+        return self.result
+    
+    def abort(self) -> None:
+        """Interrompe o upload; os blocos não confirmados são descartados pelo serviço"""
+        self._aborted = True
+        self._finished.set()
+        if self._thread:
+            self._thread.join()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _stage(self, data: bytes) -> bool:
+        # Se o envio estiver atrasado em relação ao encoder, aguarda um bloco terminar
+        while not self._slots.acquire(timeout=self.poll_interval):
+            if self._aborted:
+                return False
+        block_id = base64.b64encode(f"{len(self._block_ids):08d}".encode()).decode()
+        try:
+            future = self._executor.submit(self._blob_client.stage_block, block_id, data)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._block_ids.append(block_id)
+        self._futures.append(future)
+        self._offset += len(data)
+        return True
+    
+    def _tail(self) -> None:
+        try:
+            while not os.path.exists(self.file_path):
+                if self._finished.wait(self.poll_interval):
+                    break
+            if self._aborted or not os.path.exists(self.file_path):
+                return
+            
+            with open(self.file_path, "rb") as f:
+                while True:
+                    finished = self._finished.is_set()
+                    if self._aborted:
+                        return
+                    available = os.path.getsize(self.file_path) - self._offset
+                    # Envia apenas blocos completos enquanto o encoder ainda escreve
+                    while available >= self.block_size:
+                        f.seek(self._offset)
+                        if not self._stage(f.read(self.block_size)):
+                            return
+                        available -= self.block_size
+                    if finished:
+                        if available > 0:
+                            f.seek(self._offset)
+                            self._stage(f.read())
+                        return
+                    self._finished.wait(self.poll_interval)
+        except Exception as e:
+            self._error = e
+
+
+_account_credentials: Optional[Tuple[str, str, str]] = None
+_sas_cache: "OrderedDict[Tuple[str, str, str, int], Tuple[str, datetime]]" = OrderedDict()
+_sas_cache_lock = threading.Lock()
+
+
+def _get_account_credentials() -> Tuple[str, str, str]:
+    """Obtém (nome da conta, chave da conta, endpoint de blobs) a partir da string de conexão
+    
+    A string de conexão é interpretada uma única vez por processo, sem criar clientes do SDK.
+    
+    Returns:
+        Tuple[str, str, str]: Nome da conta, chave da conta e URL base do serviço de blobs
         
-        # Obtém o cliente do blob
-        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+    Raises:
+        ValueError: Se a string de conexão não contiver nome e chave da conta
+    """
+    global _account_credentials
+    if _account_credentials is not None:
+        return _account_credentials
+    
+    parts = dict(
+        item.split("=", 1) for item in get_connection_string().split(";") if "=" in item
+    )
+    account_name = parts.get("AccountName")
+    account_key = parts.get("AccountKey")
+    if not account_name or not account_key:
+        raise ValueError("String de conexão do Blob Storage sem AccountName/AccountKey")
+    
+    blob_endpoint = parts.get("BlobEndpoint")
+    if not blob_endpoint:
+        protocol = parts.get("DefaultEndpointsProtocol", "https")
+        suffix = parts.get("EndpointSuffix", "core.windows.net")
+        blob_endpoint = f"{protocol}://{account_name}.blob.{suffix}"
+    
+    _account_credentials = (account_name, account_key, blob_endpoint.rstrip("/"))
+    return _account_credentials
+
+
+def parse_blob_url(blob_url: str) -> Optional[Tuple[str, str]]:
+    """Extrai o container e o nome do blob de uma URL do Blob Storage
+    
+    Usado para vídeos antigos, gravados antes de o container e o blob serem
+    armazenados no registro do vídeo, e para as URLs de poster e miniaturas.
+    
+    Args:
+        blob_url: URL do blob no formato <endpoint>/<container>/<blob>
         
-        # Define as permissões e o tempo de expiração
-        sas_permissions = BlobSasPermissions(read=True)
-        expiry_time = datetime.utcnow() + timedelta(hours=expiry_hours)
+    Returns:
+        Optional[Tuple[str, str]]: Container e nome do blob, ou None se a URL não pertencer à conta
+    """
+    _, _, blob_endpoint = _get_account_credentials()
+    prefix = f"{blob_endpoint}/"
+    if not blob_url or not blob_url.startswith(prefix):
+        return None
+    container_blob_path = unquote(blob_url[len(prefix):])
+    if "/" not in container_blob_path:
+        return None
+    container_name, blob_name = container_blob_path.split("/", 1)
+    return container_name, blob_name
+
+
+def _generate_sas_url(container_name: str, blob_name: str, expiry_hours: int, permission: str = "r") -> str:
+    """Gera (ou reaproveita do cache) uma URL com SAS para um blob
+    
+    A SAS é assinada localmente com a chave da conta. A expiração é arredondada para
+    cima em intervalos de AZURE_STORAGE_SAS_EXPIRY_BUCKET_MINUTES, e a URL é reutilizada
+    enquanto restar mais de AZURE_STORAGE_SAS_MIN_REMAINING_MINUTES de validade.
+    
+    Args:
+        container_name: Nome do container
+        blob_name: Nome do blob
+        expiry_hours: Validade mínima da URL em horas
+        permission: Permissões da SAS (padrão: leitura)
         
-        # Gera a SAS
-        sas_token = generate_blob_sas(
-            account_name=account_name,
-            container_name=container_name,
-            blob_name=blob_name,
-            account_key=blob_service_client.credential.account_key,
-            permission=sas_permissions,
-            expiry=expiry_time
-        )
+    Returns:
+        str: URL do blob com a SAS
+    """
+    key = (container_name, blob_name, permission, expiry_hours)
+    now = datetime.now(timezone.utc)
+    min_remaining = timedelta(minutes=settings.AZURE_STORAGE_SAS_MIN_REMAINING_MINUTES)
+    
+    with _sas_cache_lock:
+        cached = _sas_cache.get(key)
+        if cached and cached[1] - now > min_remaining:
+            _sas_cache.move_to_end(key)
+            return cached[0]
+    
+    account_name, account_key, blob_endpoint = _get_account_credentials()
+    
+    # Arredonda a expiração para cima, de forma que todos os pedidos no mesmo intervalo gerem a mesma URL
+    bucket_seconds = settings.AZURE_STORAGE_SAS_EXPIRY_BUCKET_MINUTES * 60
+    expiry_ts = time.time() + expiry_hours * 3600
+    expiry_ts = math.ceil(expiry_ts / bucket_seconds) * bucket_seconds
+    expiry_time = datetime.fromtimestamp(expiry_ts, timezone.utc)
+    
+    sas_token = generate_blob_sas(
+        account_name=account_name,
+        container_name=container_name,
+        blob_name=blob_name,
+        account_key=account_key,
+        permission=BlobSasPermissions.from_string(permission),
+        expiry=expiry_time
+    )
+    sas_url = f"{blob_endpoint}/{quote(container_name)}/{quote(blob_name)}?{sas_token}"
+    
+    with _sas_cache_lock:
+        _sas_cache[key] = (sas_url, expiry_time)
+        _sas_cache.move_to_end(key)
+        while len(_sas_cache) > settings.AZURE_STORAGE_SAS_CACHE_SIZE:
+            _sas_cache.popitem(last=False)
+    
+    return sas_url
+
+
+def generate_download_url(container_name: str, blob_name: str, video_id: int, expiry_hours: int = 24) -> Optional[str]:
+    """Gera uma URL de download com SAS (Shared Access Signature) para um blob
+    
+    Args:
+        container_name: Nome do container do blob
+        blob_name: Nome do blob
+        video_id: ID do vídeo no banco de dados
+        expiry_hours: Número de horas até a expiração da URL (padrão: 24)
         
-        # Constrói a URL de download com a SAS
-        download_url = f"{blob_client.url}?{sas_token}"
+    Returns:
+        str: URL de download com SAS ou None em caso de falha
+    """
+    try:
+        from app.services.storage_backends import get_storage_backend
+        download_url = get_storage_backend().signed_url(container_name, blob_name, expiry_hours)
         
-        logger.info(
+        logger.debug(
             "URL de download gerada com sucesso",
             extra={
                 "video_id": video_id,
@@ -182,71 +639,32 @@ def generate_download_url(blob_url: str, video_id: int, expiry_hours: int = 24)
             extra={
                 "error_type": type(e).__name__,
                 "error_message": str(e),
-                "blob_url": blob_url,
+                "blob_name": blob_name,
                 "video_id": video_id,
                 "operation": "generate_download_url_error"
             }
         )
         return None
 
-def generate_streaming_url(blob_url: str, video_id: int, expiry_hours: int = 2) -> Optional[str]:
+
+def generate_streaming_url(container_name: str, blob_name: str, video_id: int, expiry_hours: int = 2) -> Optional[str]:
     """Gera uma URL de streaming com SAS (Shared Access Signature) para um blob
     
     Args:
-        blob_url: URL do blob no Azure Storage
+        container_name: Nome do container do blob
+        blob_name: Nome do blob
         video_id: ID do vídeo no banco de dados
         expiry_hours: Número de horas até a expiração da URL (padrão: 2)
         
     Returns:
         str: URL de streaming com SAS ou None em caso de falha
-        
-    Raises:
-        Exception: Se ocorrer um erro ao gerar a URL
     """
     try:
-        # Extrai o nome do container e do blob da URL
-        # Formato da URL: https://<storage-account>.blob.core.windows.net/<container>/<blob>
-        blob_service_client = get_blob_service_client()
-        account_name = blob_service_client.account_name
-        
-        # Extrai o nome do blob da URL
-        parts = blob_url.split(f"{account_name}.blob.core.windows.net/")
-        if len(parts) != 2:
-            logger.error(
-                "Formato de URL de blob inválido",
-                extra={
-                    "blob_url": blob_url,
-                    "video_id": video_id,
-                    "operation": "generate_streaming_url"
-                }
-            )
-            return None
-        
-        container_blob_path = parts[1]
-        container_name, blob_name = container_blob_path.split("/", 1)
-        
-        # Obtém o cliente do blob
-        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
-        
-        # Define as permissões e o tempo de expiração
         # Para streaming, precisamos apenas da permissão de leitura
-        sas_permissions = BlobSasPermissions(read=True)
-        expiry_time = datetime.utcnow() + timedelta(hours=expiry_hours)
+        from app.services.storage_backends import get_storage_backend
+        streaming_url = get_storage_backend().signed_url(container_name, blob_name, expiry_hours)
         
-        # Gera a SAS
-        sas_token = generate_blob_sas(
-            account_name=account_name,
-            container_name=container_name,
-            blob_name=blob_name,
-            account_key=blob_service_client.credential.account_key,
-            permission=sas_permissions,
-            expiry=expiry_time
-        )
-        
-        # Constrói a URL de streaming com a SAS
-        streaming_url = f"{blob_client.url}?{sas_token}"
-        
-        logger.info(
+        logger.debug(
             "URL de streaming gerada com sucesso",
             extra={
                 "video_id": video_id,
@@ -262,9 +680,42 @@ def generate_streaming_url(blob_url: str, video_id: int, expiry_hours: int = 2)
             extra={
                 "error_type": type(e).__name__,
                 "error_message": str(e),
-                "blob_url": blob_url,
+                "blob_name": blob_name,
                 "video_id": video_id,
                 "operation": "generate_streaming_url_error"
             }
         )
-        return None
\ No newline at end of file
+        return None
+
+
+def generate_image_url(image_url: Optional[str], expiry_hours: int = 24) -> Optional[str]:
+    """Gera uma URL assinada para uma imagem de vídeo (poster ou miniaturas)
+    
+    Args:
+        image_url: URL (não assinada) da imagem gravada no vídeo
+        expiry_hours: Número de horas até a expiração da URL (padrão: 24)
+        
+    Returns:
+        str: URL assinada, ou None se a imagem não existir ou em caso de falha
+    """
+    if not image_url:
+        return None
+    
+    try:
+        from app.services.storage_backends import get_storage_backend
+        backend = get_storage_backend()
+        location = backend.parse_url(image_url)
+        if not location:
+            return None
+        return backend.signed_url(*location, expiry_hours)
+    except Exception as e:
+        logger.error(
+            "Erro ao gerar URL de imagem do vídeo",
+            extra={
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                "image_url": image_url,
+                "operation": "generate_image_url_error"
+            }
+        )
+        return None
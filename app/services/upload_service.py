@@ -0,0 +1,698 @@
+from typing import Optional, Dict, Any, Awaitable, Callable
+import asyncio
+import functools
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.db.session import SessionLocal
+from app.models.video import Video
+from app.services.hls_service import package_and_upload_hls
+from app.services.storage_backends import get_storage_backend
+from app.services.storage_service import (
+    ensure_container_exists,
+    get_connection_string,
+    upload_artifact,
+    upload_video_to_blob_storage
+)
+
+logger = get_logger("upload_service")
+
+# Estados do upload de um vídeo para o Blob Storage
+UPLOAD_PENDING = "pending"
+UPLOAD_UPLOADING = "uploading"
+UPLOAD_DONE = "done"
+UPLOAD_FAILED = "failed"
+
+# Identifica este processo como dono dos uploads que ele enfileirou (nó:token)
+UPLOAD_NODE = socket.gethostname()
+UPLOAD_OWNER = f"{UPLOAD_NODE}:{uuid.uuid4().hex}"
+
+
+def _update_video_upload(video_id: int, upload_state: str, blob_location: Optional[Dict[str, str]] = None) -> None:
+    """Atualiza o estado do upload do vídeo e, quando concluído, a URL e a localização do blob
+
+    Args:
+        video_id: ID do vídeo no banco de dados
+        upload_state: Novo estado do upload
+        blob_location: URL, container e nome do blob (apenas para uploads concluídos)
+    """
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if not video:
+            logger.warning(
+                "Vídeo não encontrado ao atualizar estado do upload",
+                extra={
+                    "video_id": video_id,
+                    "upload_state": upload_state,
+                    "operation": "update_video_upload"
+                }
+            )
+            return
+        video.upload_state = upload_state
+        if blob_location:
+            video.url = blob_location["url"]
+            video.blob_container = blob_location["container"]
+            video.blob_name = blob_location["blob_name"]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _save_video_fields(video_id: int, **values) -> None:
+    """Grava campos do vídeo em uma transação curta, aberta só depois dos envios"""
+    db = SessionLocal()
+    try:
+        db.execute(update(Video.__table__).where(Video.__table__.c.id == video_id).values(**values))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def store_video_artifacts(video_id: int) -> None:
+    """Envia as imagens e narrações de um vídeo para o armazenamento endereçado por conteúdo
+
+    Substitui os caminhos locais gravados no vídeo pelas URLs dos artefatos, para que
+    qualquer nó possa renderizar novamente o vídeo. Caminhos que já são URLs são mantidos.
+    Nenhuma transação fica aberta durante os envios.
+
+    Args:
+        video_id: ID do vídeo no banco de dados
+    """
+    def to_uri(path: Optional[str]) -> Optional[str]:
+        if not path or path.startswith(("http://", "https://")):
+            return path
+        return upload_artifact(path) or path
+
+    db = SessionLocal()
+    try:
+        video = db.query(
+            Video.imagens, Video.arquivo_narracao_raw, Video.arquivo_narracao_remix
+        ).filter(Video.id == video_id).first()
+    finally:
+        db.close()
+    if not video:
+        return
+    _save_video_fields(
+        video_id,
+        imagens=[to_uri(path) for path in (video.imagens or [])],
+        arquivo_narracao_raw=to_uri(video.arquivo_narracao_raw),
+        arquivo_narracao_remix=to_uri(video.arquivo_narracao_remix)
+    )
+
+
+def store_video_images(video_id: int, arquivo_poster: Optional[str], arquivo_miniaturas: Optional[str]) -> None:
+    """Envia o poster e a faixa de miniaturas de um vídeo e grava as URLs no vídeo
+
+    As imagens ficam no container de vídeos, em images/<guid>/. Nenhuma transação fica
+    aberta durante os envios.
+
+    Args:
+        video_id: ID do vídeo no banco de dados
+        arquivo_poster: Caminho local do poster
+        arquivo_miniaturas: Caminho local da faixa de miniaturas
+    """
+    db = SessionLocal()
+    try:
+        video_guid = db.query(Video.guid).filter(Video.id == video_id).scalar()
+    finally:
+        db.close()
+    if not video_guid:
+        return
+    backend = get_storage_backend()
+    urls = {}
+    for path, name, attribute in (
+        (arquivo_poster, "poster.jpg", "poster_url"),
+        (arquivo_miniaturas, "thumbnails.jpg", "thumbnail_url"),
+    ):
+        if not path or not os.path.exists(path):
+            continue
+        with open(path, "rb") as data:
+            urls[attribute] = backend.put(
+                settings.AZURE_STORAGE_CONTAINER_NAME,
+                f"images/{video_guid}/{name}",
+                data,
+                length=os.path.getsize(path),
+                content_type="image/jpeg"
+            )
+    if urls:
+        _save_video_fields(video_id, **urls)
+
+
+class BackgroundUploader:
+    """
+    Envia vídeos para o Blob Storage em segundo plano.
+
+    Mantém um event loop próprio em uma thread dedicada, com uma fila limitada de
+    uploads (vídeos e artefatos do pipeline) consumida por AZURE_STORAGE_UPLOAD_WORKERS workers que usam o cliente
+    assíncrono do SDK (azure.storage.blob.aio). O empacotamento HLS, que transcodifica o
+    vídeo, tem fila e workers próprios (HLS_QUEUE_SIZE e HLS_WORKERS) e não ocupa os
+    workers de upload.
+    """
+
+    def __init__(self, workers: int, queue_size: int, hls_workers: int, hls_queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.hls_workers = hls_workers
+        self.hls_queue_size = hls_queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._hls_queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[AsyncBlobServiceClient] = None
+        self._startup_error: Optional[Exception] = None
+        # Vídeos com upload enfileirado ou em andamento neste processo (acessado só pelo event loop)
+        self._owned_uploads = set()
+        self._tasks = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Inicia o event loop e os workers, se ainda não estiverem em execução
+
+        Raises:
+            Exception: O erro da inicialização (ex.: connection string inválida)
+        """
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            ready = threading.Event()
+            self._startup_error = None
+            self._thread = threading.Thread(
+                target=self._run, args=(ready,), name="blob-uploader", daemon=True
+            )
+            self._thread.start()
+            ready.wait()
+            if self._startup_error is not None:
+                self._thread.join()
+                self._thread = None
+                raise self._startup_error
+        logger.info(
+            "Uploader em segundo plano iniciado",
+            extra={
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "hls_workers": self.hls_workers,
+                "hls_queue_size": self.hls_queue_size,
+                "operation": "background_uploader_start"
+            }
+        )
+
+    def stop(self, timeout: float = 30) -> None:
+        """Aguarda os uploads enfileirados e encerra o event loop
+
+        Args:
+            timeout: Tempo máximo de espera, em segundos, pelos uploads pendentes
+        """
+        with self._lock:
+            if not self._thread or not self._thread.is_alive():
+                return
+            future = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+            try:
+                future.result(timeout)
+            except Exception as e:
+                logger.warning(
+                    "Uploads pendentes não concluídos ao encerrar o uploader",
+                    extra={
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                        "operation": "background_uploader_stop"
+                    }
+                )
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, video_id: int, file_path: str) -> bool:
+        """Enfileira o upload de um vídeo
+
+        Args:
+            video_id: ID do vídeo no banco de dados
+            file_path: Caminho local do arquivo de vídeo
+
+        Returns:
+            bool: True se o upload foi enfileirado, False se a fila estiver cheia
+        """
+        return self._submit(video_id, functools.partial(self._upload, video_id, file_path), owned=True)
+
+    def submit_artifacts(self, video_id: int) -> bool:
+        """Enfileira o upload dos artefatos (imagens e narrações) de um vídeo
+
+        Args:
+            video_id: ID do vídeo no banco de dados
+
+        Returns:
+            bool: True se o upload foi enfileirado, False se a fila estiver cheia
+        """
+        return self._submit(video_id, functools.partial(self._upload_artifacts, video_id))
+
+    def submit_images(self, video_id: int, arquivo_poster: Optional[str], arquivo_miniaturas: Optional[str]) -> bool:
+        """Enfileira o upload do poster e das miniaturas de um vídeo
+
+        Args:
+            video_id: ID do vídeo no banco de dados
+            arquivo_poster: Caminho local do poster
+            arquivo_miniaturas: Caminho local da faixa de miniaturas
+
+        Returns:
+            bool: True se o upload foi enfileirado, False se a fila estiver cheia
+        """
+        return self._submit(
+            video_id, functools.partial(self._upload_images, video_id, arquivo_poster, arquivo_miniaturas)
+        )
+
+    def submit_hls(self, video_id: int) -> bool:
+        """Enfileira o empacotamento HLS de um vídeo
+
+        Args:
+            video_id: ID do vídeo no banco de dados
+
+        Returns:
+            bool: True se o empacotamento foi enfileirado, False se a fila estiver cheia
+        """
+        return self._submit(video_id, functools.partial(self._package_hls, video_id), hls=True)
+
+    def _submit(
+        self, video_id: int, job: Callable[[], Awaitable[None]], hls: bool = False, owned: bool = False
+    ) -> bool:
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(self._enqueue(video_id, job, hls, owned), self._loop)
+        return future.result()
+
+    def _run(self, ready: threading.Event) -> None:
+        # ready é sempre sinalizado, mesmo se a inicialização falhar: start() relança o erro
+        try:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._hls_queue = asyncio.Queue(maxsize=self.hls_queue_size)
+            # O cliente assíncrono só é usado pelos backends compatíveis com o Azure Blob
+            self._client = None
+            if get_storage_backend().azure_compatible:
+                self._client = AsyncBlobServiceClient.from_connection_string(
+                    get_connection_string(),
+                    max_block_size=settings.AZURE_STORAGE_MAX_BLOCK_SIZE,
+                    max_single_put_size=settings.AZURE_STORAGE_MAX_SINGLE_PUT_SIZE
+                )
+            self._tasks = [self._loop.create_task(self._worker(self._queue)) for _ in range(self.workers)]
+            self._tasks += [self._loop.create_task(self._worker(self._hls_queue)) for _ in range(self.hls_workers)]
+            self._tasks.append(self._loop.create_task(self._heartbeat()))
+        except Exception as e:
+            self._startup_error = e
+            if self._loop:
+                self._loop.close()
+            return
+        finally:
+            ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _enqueue(self, video_id: int, job: Callable[[], Awaitable[None]], hls: bool, owned: bool) -> bool:
+        try:
+            (self._hls_queue if hls else self._queue).put_nowait((video_id, job, owned))
+        except asyncio.QueueFull:
+            return False
+        if owned:
+            self._owned_uploads.add(video_id)
+        return True
+
+    async def _shutdown(self) -> None:
+        await self._queue.join()
+        await self._hls_queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._client:
+            await self._client.close()
+
+    async def _heartbeat(self) -> None:
+        # Renova a posse dos uploads deste processo enquanto estão na fila ou em andamento,
+        # para que a recuperação de uploads interrompidos não os reenfileire
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._owned_uploads:
+                try:
+                    await loop.run_in_executor(None, _renew_upload_ownership, list(self._owned_uploads))
+                except Exception as e:
+                    logger.warning(
+                        "Falha ao renovar a posse dos uploads em andamento",
+                        extra={
+                            "error_type": type(e).__name__,
+                            "error_message": str(e),
+                            "operation": "upload_heartbeat"
+                        }
+                    )
+            await asyncio.sleep(settings.AZURE_STORAGE_UPLOAD_HEARTBEAT_SECONDS)
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            video_id, job, owned = await queue.get()
+            try:
+                await job()
+            except Exception as e:
+                logger.error(
+                    "Erro não tratado no worker de upload",
+                    extra={
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                        "video_id": video_id,
+                        "operation": "background_upload_worker"
+                    }
+                )
+            finally:
+                if owned:
+                    self._owned_uploads.discard(video_id)
+                queue.task_done()
+
+    async def _upload(self, video_id: int, file_path: str) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _update_video_upload, video_id, UPLOAD_UPLOADING)
+
+        if not get_storage_backend().azure_compatible:
+            # Backends sem cliente assíncrono gravam de forma síncrona em uma thread do executor
+            blob_location = await loop.run_in_executor(None, upload_video_to_blob_storage, file_path, video_id)
+            state = UPLOAD_DONE if blob_location else UPLOAD_FAILED
+            await loop.run_in_executor(None, _update_video_upload, video_id, state, blob_location)
+            return
+
+        try:
+            # Verificação em cache; só acessa o serviço na primeira vez
+            await loop.run_in_executor(None, ensure_container_exists)
+
+            blob_name = f"video_{video_id}_{uuid.uuid4()}.mp4"
+            blob_client = self._client.get_blob_client(settings.AZURE_STORAGE_CONTAINER_NAME, blob_name)
+            file_size = os.path.getsize(file_path)
+
+            start_time = time.perf_counter()
+            with open(file_path, "rb") as data:
+                await blob_client.upload_blob(
+                    data,
+                    length=file_size,
+                    overwrite=True,
+                    max_concurrency=settings.AZURE_STORAGE_MAX_CONCURRENCY
+                )
+            upload_time = time.perf_counter() - start_time
+        except Exception as e:
+            logger.error(
+                "Erro ao fazer upload do vídeo em segundo plano",
+                extra={
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "file_path": file_path,
+                    "video_id": video_id,
+                    "operation": "background_upload_error"
+                }
+            )
+            await loop.run_in_executor(None, _update_video_upload, video_id, UPLOAD_FAILED)
+            return
+
+        blob_location = {
+            "url": blob_client.url,
+            "container": settings.AZURE_STORAGE_CONTAINER_NAME,
+            "blob_name": blob_name
+        }
+        await loop.run_in_executor(None, _update_video_upload, video_id, UPLOAD_DONE, blob_location)
+
+        logger.info(
+            "Vídeo enviado para o Blob Storage em segundo plano",
+            extra={
+                "video_id": video_id,
+                "blob_name": blob_name,
+                "size_bytes": file_size,
+                "upload_time": round(upload_time, 3),
+                "throughput_mbps": round(file_size * 8 / 1_000_000 / upload_time, 2) if upload_time > 0 else None,
+                "operation": "background_upload_success"
+            }
+        )
+
+    async def _upload_artifacts(self, video_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, store_video_artifacts, video_id)
+
+    async def _upload_images(self, video_id: int, arquivo_poster: Optional[str], arquivo_miniaturas: Optional[str]) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, store_video_images, video_id, arquivo_poster, arquivo_miniaturas)
+
+    async def _package_hls(self, video_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, package_and_upload_hls, video_id)
+
+
+_background_uploader = BackgroundUploader(
+    workers=settings.AZURE_STORAGE_UPLOAD_WORKERS,
+    queue_size=settings.AZURE_STORAGE_UPLOAD_QUEUE_SIZE,
+    hls_workers=settings.HLS_WORKERS,
+    hls_queue_size=settings.HLS_QUEUE_SIZE
+)
+
+
+def get_background_uploader() -> BackgroundUploader:
+    """Retorna o uploader em segundo plano compartilhado pelo processo"""
+    return _background_uploader
+
+
+def _renew_upload_ownership(video_ids) -> None:
+    """Marca este processo como dono dos uploads informados e renova o heartbeat"""
+    video_table = Video.__table__
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(video_table)
+            .where(
+                video_table.c.id.in_(sorted(video_ids)),
+                video_table.c.upload_state.in_([UPLOAD_PENDING, UPLOAD_UPLOADING])
+            )
+            .values(upload_owner=UPLOAD_OWNER, upload_heartbeat_at=datetime.utcnow())
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def recover_stale_uploads(db: Session, batch_size: int = 100) -> int:
+    """Reenfileira os uploads interrompidos (a fila do uploader existe apenas em memória)
+
+    O processo que enfileira um upload renova o heartbeat do vídeo a cada
+    AZURE_STORAGE_UPLOAD_HEARTBEAT_SECONDS enquanto ele estiver na fila ou em andamento.
+    Vídeos pendentes ou em upload cujo heartbeat (ou, sem dono registrado, o updated_at)
+    tem mais de AZURE_STORAGE_UPLOAD_STALE_MINUTES são recuperados: reenfileirados se o
+    arquivo local existir neste nó, ou marcados como falhos se o arquivo não existir e o
+    dono anterior for deste nó (ou desconhecido). Vídeos de outros nós sem o arquivo
+    local ficam para a recuperação do próprio nó.
+
+    Os vídeos são travados com FOR UPDATE SKIP LOCKED e reivindicados com o novo dono,
+    então vários processos podem executar a recuperação sem reenfileirar o mesmo vídeo
+    duas vezes.
+
+    Args:
+        db: Sessão do banco de dados
+        batch_size: Quantidade máxima de vídeos verificados
+
+    Returns:
+        int: Quantidade de uploads reenfileirados
+    """
+    video_table = Video.__table__
+    now = datetime.utcnow()
+    stale = db.execute(
+        select(video_table.c.id, video_table.c.arquivo_video, video_table.c.upload_owner)
+        .where(
+            video_table.c.upload_state.in_([UPLOAD_PENDING, UPLOAD_UPLOADING]),
+            func.coalesce(video_table.c.upload_heartbeat_at, video_table.c.updated_at)
+            < now - timedelta(minutes=settings.AZURE_STORAGE_UPLOAD_STALE_MINUTES)
+        )
+        .order_by(video_table.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    claimed = []
+    missing = []
+    for video in stale:
+        if video.arquivo_video and os.path.exists(video.arquivo_video):
+            claimed.append(video)
+        elif not video.upload_owner or video.upload_owner.split(":", 1)[0] == UPLOAD_NODE:
+            missing.append(video.id)
+    if not claimed and not missing:
+        db.rollback()
+        return 0
+
+    if claimed:
+        db.execute(
+            update(video_table)
+            .where(video_table.c.id.in_([video.id for video in claimed]))
+            .values(upload_state=UPLOAD_PENDING, upload_owner=UPLOAD_OWNER, upload_heartbeat_at=now)
+        )
+    if missing:
+        db.execute(update(video_table).where(video_table.c.id.in_(missing)).values(upload_state=UPLOAD_FAILED))
+    db.commit()
+
+    # Se a fila estiver cheia, o vídeo continua pendente e é recuperado quando o heartbeat expirar
+    requeued = 0
+    for video in claimed:
+        if get_background_uploader().submit(video.id, video.arquivo_video):
+            requeued += 1
+
+    logger.info(
+        "Uploads interrompidos recuperados",
+        extra={
+            "requeued_uploads": requeued,
+            "failed_uploads": len(missing),
+            "operation": "recover_stale_uploads"
+        }
+    )
+    return requeued
+
+
+class UploadRecoverySweeper:
+    """
+    Recupera, em uma thread em segundo plano, os uploads interrompidos: na inicialização
+    e depois a cada interval_seconds.
+    """
+
+    def __init__(self, interval_seconds: int):
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia a thread do sweeper, se ainda não estiver em execução"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="upload-recovery-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe o sweeper"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(self.interval_seconds)
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            db = SessionLocal()
+            try:
+                recover_stale_uploads(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(
+                    "Erro ao recuperar uploads interrompidos",
+                    extra={
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                        "operation": "recover_stale_uploads"
+                    }
+                )
+            finally:
+                db.close()
+            if self._stop_event.wait(self.interval_seconds):
+                return
+
+
+_upload_recovery_sweeper = UploadRecoverySweeper(
+    interval_seconds=settings.AZURE_STORAGE_UPLOAD_RECOVERY_INTERVAL_SECONDS
+)
+
+
+def get_upload_recovery_sweeper() -> UploadRecoverySweeper:
+    """Retorna o sweeper de uploads interrompidos compartilhado pelo processo"""
+    return _upload_recovery_sweeper
+
+
+def schedule_video_upload(video_id: int, file_path: str) -> Dict[str, Any]:
+    """Agenda o upload de um vídeo para o Blob Storage
+
+    Se a fila estiver cheia, o upload é feito de forma síncrona na thread atual,
+    para que nenhum vídeo fique sem upload.
+
+    Args:
+        video_id: ID do vídeo no banco de dados
+        file_path: Caminho local do arquivo de vídeo
+
+    Returns:
+        Dict[str, Any]: Estado do upload e, se já concluído, a localização do blob
+    """
+    if get_background_uploader().submit(video_id, file_path):
+        return {"upload_state": UPLOAD_PENDING}
+
+    logger.warning(
+        "Fila de uploads cheia, enviando vídeo de forma síncrona",
+        extra={
+            "video_id": video_id,
+            "queue_size": settings.AZURE_STORAGE_UPLOAD_QUEUE_SIZE,
+            "operation": "schedule_video_upload_queue_full"
+        }
+    )
+    blob_location = upload_video_to_blob_storage(file_path, video_id)
+    if blob_location:
+        return {"upload_state": UPLOAD_DONE, "blob_location": blob_location}
+    return {"upload_state": UPLOAD_FAILED}
+
+
+def schedule_artifact_upload(video_id: int) -> None:
+    """Agenda o upload dos artefatos de um vídeo; se a fila estiver cheia, envia de forma síncrona
+
+    Args:
+        video_id: ID do vídeo no banco de dados
+    """
+    if get_background_uploader().submit_artifacts(video_id):
+        return
+    store_video_artifacts(video_id)
+
+
+def schedule_image_upload(video_id: int, arquivo_poster: Optional[str], arquivo_miniaturas: Optional[str]) -> None:
+    """Agenda o upload do poster e das miniaturas de um vídeo; se a fila estiver cheia, envia de forma síncrona
+
+    Args:
+        video_id: ID do vídeo no banco de dados
+        arquivo_poster: Caminho local do poster
+        arquivo_miniaturas: Caminho local da faixa de miniaturas
+    """
+    if get_background_uploader().submit_images(video_id, arquivo_poster, arquivo_miniaturas):
+        return
+    store_video_images(video_id, arquivo_poster, arquivo_miniaturas)
+
+
+def schedule_hls_packaging(video_id: int) -> bool:
+    """Agenda o empacotamento HLS de um vídeo
+
+    O HLS é opcional: se a fila estiver cheia, o vídeo continua disponível apenas em MP4.
+
+    Args:
+        video_id: ID do vídeo no banco de dados
+
+    Returns:
+        bool: True se o empacotamento foi agendado
+    """
+    if get_background_uploader().submit_hls(video_id):
+        return True
+    logger.warning(
+        "Fila de empacotamento HLS cheia, empacotamento ignorado",
+        extra={
+            "video_id": video_id,
+            "queue_size": settings.HLS_QUEUE_SIZE,
+            "operation": "schedule_hls_packaging_queue_full"
+        }
+    )
+    return False
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import uuid
 import os
 import math
@@ -8,11 +8,17 @@ from fastapi.exceptions import RequestValidationError
 from sqlalchemy.orm import Session
 
 from app.models.video import Video
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.video import VideoCreate
 from app.core.exceptions import VideoNotValidatedException, VideoGenerationException
+from app.core.config import settings
 from app.core.logger import get_logger
-from app.services.credit_service import consume_credit, refund_credit, InsufficientCreditsException
+from app.services.credit_service import (
+    capture_credit_hold, place_credit_hold, release_credit_hold, refund_credit, InsufficientCreditsException
+)
+from app.services.upload_service import schedule_video_upload, schedule_artifact_upload, schedule_hls_packaging, schedule_image_upload, UPLOAD_PENDING, UPLOAD_DONE, UPLOAD_FAILED
+from app.services.storage_service import StagedBlobUpload
+from app.services.storage_backends import get_storage_backend
 
 # Importações para geração de vídeo
 from app.services.genvideo.core.social_post import SistemaPostsAutomaticos
@@ -57,12 +63,26 @@ def generate_video(assunto: str, duracao_segundos: int) -> Optional[Dict[str, An
             }
         )
         
+        # Opcionalmente renderiza em MP4 fragmentado e envia os blocos ao Blob Storage durante a renderização
+        staged_uploads = []
+        
+        def iniciar_upload(output_path: str) -> StagedBlobUpload:
+            staged_upload = StagedBlobUpload(output_path).start()
+            staged_uploads.append(staged_upload)
+            return staged_upload
+        
+        # O upload em blocos durante a renderização só existe nos backends compatíveis com o Azure Blob
+        if settings.AZURE_STORAGE_UPLOAD_WHILE_RENDERING and get_storage_backend().azure_compatible:
+            editor_video = EditorVideo(1080, 720, fragmentado=True, ao_iniciar_render=iniciar_upload)
+        else:
+            editor_video = EditorVideo(1080, 720)
+        
         # Inicializa o sistema de posts automáticos com todos os componentes necessários
         sistema = SistemaPostsAutomaticos(
             gerador_texto=GeradorTexto(),
             gerador_imagens=GeradorImagens(),
             gerador_narracao=GeradorNarracao(),
-            editor_video=EditorVideo(1080, 720),
+            editor_video=editor_video,
             editor_audio=EditorAudio()
         )
         
@@ -70,90 +90,45 @@ def generate_video(assunto: str, duracao_segundos: int) -> Optional[Dict[str, An
         qtd_imagens = math.ceil(duracao_segundos / 10)
         
         # Executa o fluxo de geração de vídeo
-        # Importante: o identificador não é usado pelo sistema de geração de vídeos
-        # O sistema gera seu próprio identificador internamente
-        arquivo_video = sistema.executar_fluxo(
+        # O fluxo retorna os dados do post gerado; o registro no histórico é apenas um efeito colateral
+        post_data = sistema.executar_fluxo(
             tema=assunto, 
             modelo='gemini',  # Modelo padrão para geração de texto
             duracao=duracao_segundos, 
             qtd_imagens=qtd_imagens
         )
         
-        try:
-            # Carrega os dados do último registro salvo
-            # O sistema de geração de vídeos salva os dados no arquivo dados.json
-            from app.services.genvideo.save_data import load_data_from_json
-            dados = load_data_from_json()
-            print(arquivo_video)
-            if dados and len(dados) > 0:
-                # Pega o último registro salvo (o mais recente)
-                post_data = dados[-1]
-                arquivo_video = post_data["arquivo_video"]
-                
-                # Garante que o caminho é absoluto
-                arquivo_video = os.path.abspath(arquivo_video)
-                
-                # Calcula o tempo de geração em segundos
-                end_time = datetime.now()
-                generation_time = (end_time - start_time).total_seconds()
-                
-                logger.info(
-                    "Vídeo gerado com sucesso",
-                    extra={
-                        "request_id": request_id,
-                        "assunto": assunto,
-                        "duracao": duracao_segundos,
-                        "arquivo_video": arquivo_video,
-                        "tempo_geracao": generation_time,
-                        "operation": "generate_video",
-                        "component": "video_generation_complete",
-                        "timestamp": end_time.isoformat()
-                    }
-                )
-                
-                # Retorna um dicionário com as informações do vídeo
-                return {
-                    "url": arquivo_video,
-                    "duration": duracao_segundos,
-                    "generation_time": generation_time,
-                    "post_data": post_data  # Inclui os dados completos do post
-                }
-            else:
-                error_id = str(uuid.uuid4())
-                logger.error(
-                    "Nenhum registro de vídeo encontrado após geração",
-                    extra={
-                        "request_id": request_id,
-                        "error_id": error_id,
-                        "assunto": assunto,
-                        "duracao": duracao_segundos,
-                        "operation": "generate_video",
-                        "component": "video_data_validation",
-                        "timestamp": datetime.now().isoformat()
-                    }
-                )
-                return None
-        except Exception as e:
-            import traceback
-            error_stack = traceback.format_exc()
-            error_id = str(uuid.uuid4())
-            
-            logger.error(
-                "Erro ao recuperar dados do vídeo gerado",
-                extra={
-                    "request_id": request_id,
-                    "error_id": error_id,
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "error_stack": error_stack,
-                    "assunto": assunto,
-                    "duracao": duracao_segundos,
-                    "operation": "generate_video",
-                    "component": "video_data_retrieval",
-                    "timestamp": datetime.now().isoformat()
-                }
-            )
-            return None
+        # Garante que o caminho é absoluto
+        arquivo_video = os.path.abspath(post_data.arquivo_video)
+        
+        # Calcula o tempo de geração em segundos
+        end_time = datetime.now()
+        generation_time = (end_time - start_time).total_seconds()
+        
+        logger.info(
+            "Vídeo gerado com sucesso",
+            extra={
+                "request_id": request_id,
+                "post_guid": post_data.guid,
+                "assunto": assunto,
+                "duracao": duracao_segundos,
+                "arquivo_video": arquivo_video,
+                "tempo_geracao": generation_time,
+                "operation": "generate_video",
+                "component": "video_generation_complete",
+                "timestamp": end_time.isoformat()
+            }
+        )
+        
+        # Retorna um dicionário com as informações do vídeo
+        return {
+            "url": arquivo_video,
+            "duration": duracao_segundos,
+            "generation_time": generation_time,
+            "post_data": post_data,  # Dados completos do post (PostData)
+            # Localização do blob, se o vídeo já foi enviado durante a renderização
+            "blob_location": staged_uploads[-1].result if staged_uploads else None
+        }
     except Exception as e:
         import traceback
         error_stack = traceback.format_exc()
@@ -177,7 +152,29 @@ def generate_video(assunto: str, duracao_segundos: int) -> Optional[Dict[str, An
         return None
 
 
-def create_video(db: Session, video_in: VideoCreate, current_user: User) -> Video:
+def _discard_uncharged_video(db: Session, video: Video, blob_location: Optional[Dict[str, str]]) -> None:
+    """Remove um vídeo cujo crédito não pôde ser debitado, com o blob enviado durante a renderização"""
+    video_id = video.id
+    try:
+        db.rollback()
+        db.delete(video)
+        db.commit()
+        if blob_location:
+            get_storage_backend().delete(blob_location["container"], blob_location["blob_name"])
+    except Exception as e:
+        db.rollback()
+        logger.error(
+            "Falha ao remover vídeo sem débito de crédito",
+            extra={
+                "video_id": video_id,
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                "operation": "discard_uncharged_video_failed"
+            }
+        )
+
+
+def create_video(db: Session, video_in: VideoCreate, current_user: Principal) -> Video:
     """
     Cria um novo vídeo no sistema.
     
@@ -195,26 +192,24 @@ def create_video(db: Session, video_in: VideoCreate, current_user: User) -> Vide
         RequestValidationError: Se os dados de entrada forem inválidos
         HTTPException: Para outros erros internos
     """
-    # Variável para controlar se o crédito foi consumido
-    credit_consumed = False
-    transaction_id = None
+    # Reserva do crédito: capturada ao final da geração ou liberada em caso de falha;
+    # após a captura, uma falha é compensada com um estorno
+    hold = None
+    captured_video_id = None
     
     # Tratamento específico para InsufficientCreditsException
     # Esta exceção deve ser propagada diretamente, sem ser capturada pelo bloco genérico
     try:
-        # Verifica e consome um crédito do usuário
+        # Reserva um crédito do usuário; ele só é debitado quando o vídeo fica pronto
         try:
-            credit, transaction = consume_credit(db, current_user.id)
-            credit_consumed = True
-            transaction_id = transaction.id
+            hold = place_credit_hold(db, current_user.id)
             
             logger.info(
-                "Crédito consumido para geração de vídeo",
+                "Crédito reservado para geração de vídeo",
                 extra={
                     "user_id": current_user.id,
                     "user_email": current_user.email,
-                    "transaction_id": transaction.id,
-                    "remaining_balance": credit.balance,
+                    "hold_id": hold.id,
                     "operation": "create_video"
                 }
             )
@@ -231,28 +226,34 @@ def create_video(db: Session, video_in: VideoCreate, current_user: User) -> Vide
                 
             # Create video object com as informações adicionais
             # Extrai os dados do post_data para salvar no banco de dados
-            post_data = video_result.get("post_data", {})
+            post_data = video_result["post_data"]
+            
+            # Obtém o caminho do arquivo de vídeo
+            arquivo_video_path = post_data.arquivo_video
+            has_video_file = bool(arquivo_video_path and os.path.exists(arquivo_video_path))
             
             # Cria o objeto de vídeo com os dados básicos
+            # A URL só é preenchida quando o upload para o Blob Storage termina
             video = Video(
                 title=video_in.title,
                 description=video_in.description,
-                url=video_result["url"],  # URL local temporária
+                url=None,
+                upload_state=UPLOAD_PENDING if has_video_file else UPLOAD_FAILED,
                 is_validated=True,
                 user_id=current_user.id,
                 duration=video_result["duration"],
                 generation_time=video_result["generation_time"],
                 # Campos adicionais do vídeo
-                solicitacao=post_data.get("solicitacao"),
-                roteiro=post_data.get("roteiro"),
-                frases=post_data.get("frases"),
-                hashtags=post_data.get("hashtags"),
-                conteudo=post_data.get("conteudo"),
-                imagens=post_data.get("imagens"),
-                narracao_marcada=post_data.get("narracao_marcada"),
-                arquivo_narracao_raw=post_data.get("arquivo_narracao_raw"),
-                arquivo_narracao_remix=post_data.get("arquivo_narracao_remix"),
-                arquivo_video=post_data.get("arquivo_video")
+                solicitacao=post_data.solicitacao,
+                roteiro=post_data.roteiro,
+                frases=post_data.frases,
+                hashtags=post_data.hashtags,
+                conteudo=post_data.conteudo,
+                imagens=post_data.imagens,
+                narracao_marcada=post_data.narracao_marcada,
+                arquivo_narracao_raw=post_data.arquivo_narracao_raw,
+                arquivo_narracao_remix=post_data.arquivo_narracao_remix,
+                arquivo_video=post_data.arquivo_video
             )
             
             # Salva o vídeo no banco de dados para obter o ID
@@ -260,99 +261,149 @@ def create_video(db: Session, video_in: VideoCreate, current_user: User) -> Vide
             db.commit()
             db.refresh(video)
             
-            # Faz upload do vídeo para o Azure Blob Storage
-            from app.services.storage_service import upload_video_to_blob_storage
-            
-            # Obtém o caminho do arquivo de vídeo
-            arquivo_video_path = post_data.get("arquivo_video")
-            if arquivo_video_path and os.path.exists(arquivo_video_path):
-                # Faz upload do vídeo para o Azure Blob Storage
-                blob_url = upload_video_to_blob_storage(arquivo_video_path, video.id)
-                
-                if blob_url:
-                    # Atualiza a URL do vídeo no banco de dados com a URL do blob
-                    video.url = blob_url
-                    db.commit()
-                    db.refresh(video)
-                    
-                    logger.info(
-                        "URL do vídeo atualizada com a URL do blob",
-                        extra={
-                            "video_id": video.id,
-                            "user_id": current_user.id,
-                            "operation": "upload_video_to_blob"
-                        }
-                    )
-                else:
-                    logger.warning(
-                        "Falha ao fazer upload do vídeo para o Azure Blob Storage",
-                        extra={
-                            "video_id": video.id,
-                            "user_id": current_user.id,
-                            "operation": "upload_video_to_blob_failed"
-                        }
-                    )
-            else:
+            # Business logic: Raise exception if video is not validated
+            if not video.is_validated:
                 logger.warning(
-                    "Arquivo de vídeo não encontrado para upload",
+                    "Video não validado",
                     extra={
                         "video_id": video.id,
-                        "arquivo_video_path": arquivo_video_path,
+                        "validation_status": video.is_validated,
                         "user_id": current_user.id,
-                        "operation": "upload_video_to_blob_file_not_found"
+                        "operation": "video_validation"
+                    }
+                )
+                # Libera a reserva se o vídeo não for validado
+                release_credit_hold(db, hold.id)
+                logger.info(
+                    "Reserva de crédito liberada por vídeo não validado",
+                    extra={
+                        "user_id": current_user.id,
+                        "video_id": video.id,
+                        "hold_id": hold.id,
+                        "operation": "release_credit_hold"
                     }
                 )
+                raise VideoNotValidatedException()
             
+            # Geração concluída: debita o crédito reservado antes de agendar os uploads
+            # (se a reserva expirou durante a geração, o débito sai do saldo disponível)
+            try:
+                credit, transaction = capture_credit_hold(db, hold.id, description=f"Geração de vídeo (ID: {video.id})")
+            except Exception:
+                # Sem débito, o vídeo não é entregue; nenhum upload foi agendado ainda, só
+                # o blob enviado durante a renderização precisa ser removido
+                _discard_uncharged_video(db, video, video_result.get("blob_location"))
+                raise
+            captured_video_id = video.id
             logger.info(
-                "Video criado com sucesso",
+                "Crédito consumido para geração de vídeo",
                 extra={
-                    "video_id": video.id,
                     "user_id": current_user.id,
-                    "user_email": current_user.email,
-                    "video_title": video.title,
+                    "hold_id": hold.id,
+                    "transaction_id": transaction.id,
+                    "remaining_balance": credit.balance,
                     "operation": "create_video"
                 }
             )
-        
-            # Business logic: Raise exception if video is not validated
-            if not video.is_validated:
+            
+            # Envia imagens e narrações para o armazenamento endereçado por conteúdo
+            try:
+                schedule_artifact_upload(video.id)
+            except Exception as e:
                 logger.warning(
-                    "Video não validado",
+                    "Falha ao agendar upload dos artefatos do vídeo",
                     extra={
                         "video_id": video.id,
-                        "validation_status": video.is_validated,
-                        "user_id": current_user.id,
-                        "operation": "video_validation"
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                        "operation": "schedule_artifact_upload_failed"
                     }
                 )
-                # Estorna o crédito se o vídeo não for validado
-                refund_credit(db, current_user.id, description=f"Estorno por vídeo não validado (ID: {video.id})")
+            
+            # Envia o poster e as miniaturas extraídos na renderização
+            if post_data.arquivo_poster or post_data.arquivo_miniaturas:
+                try:
+                    schedule_image_upload(video.id, post_data.arquivo_poster, post_data.arquivo_miniaturas)
+                except Exception as e:
+                    logger.warning(
+                        "Falha ao agendar upload do poster e das miniaturas do vídeo",
+                        extra={
+                            "video_id": video.id,
+                            "error_type": type(e).__name__,
+                            "error_message": str(e),
+                            "operation": "schedule_image_upload_failed"
+                        }
+                    )
+            
+            blob_location = video_result.get("blob_location")
+            if blob_location:
+                # O vídeo já foi enviado ao Blob Storage durante a renderização
+                video.url = blob_location["url"]
+                video.blob_container = blob_location["container"]
+                video.blob_name = blob_location["blob_name"]
+                video.upload_state = UPLOAD_DONE
+                db.commit()
+                db.refresh(video)
+            elif has_video_file:
+                # Agenda o upload do vídeo para o Azure Blob Storage em segundo plano
+                upload_result = schedule_video_upload(video.id, arquivo_video_path)
+                
+                if upload_result["upload_state"] != UPLOAD_PENDING:
+                    # A fila estava cheia e o upload foi feito de forma síncrona
+                    blob_location = upload_result.get("blob_location")
+                    video.upload_state = upload_result["upload_state"]
+                    if blob_location:
+                        video.url = blob_location["url"]
+                        video.blob_container = blob_location["container"]
+                        video.blob_name = blob_location["blob_name"]
+                    db.commit()
+                    db.refresh(video)
+                
                 logger.info(
-                    "Crédito estornado por vídeo não validado",
+                    "Upload do vídeo para o Blob Storage agendado",
                     extra={
-                        "user_id": current_user.id,
                         "video_id": video.id,
-                        "operation": "refund_credit"
+                        "user_id": current_user.id,
+                        "upload_state": video.upload_state,
+                        "operation": "schedule_video_upload"
                     }
                 )
-                # Marca que o crédito já foi estornado para evitar estorno duplo
-                credit_consumed = False
-                raise VideoNotValidatedException()
-                
-        except Exception as video_error:
-            # Se ocorrer um erro na geração do vídeo após o consumo do crédito, estorna o crédito
-            if credit_consumed:
-                refund_credit(db, current_user.id, description="Estorno por falha na geração de vídeo")
-                logger.info(
-                    "Crédito estornado por falha na geração de vídeo",
+            else:
+                logger.warning(
+                    "Arquivo de vídeo não encontrado para upload",
                     extra={
+                        "video_id": video.id,
+                        "arquivo_video_path": arquivo_video_path,
                         "user_id": current_user.id,
-                        "transaction_id": transaction_id,
-                        "operation": "refund_credit"
+                        "operation": "upload_video_to_blob_file_not_found"
                     }
                 )
-            # Re-lança a exceção original
-            raise video_error
+            
+            # Empacotamento HLS opcional, em segundo plano
+            if settings.HLS_ENABLED and has_video_file:
+                try:
+                    schedule_hls_packaging(video.id)
+                except Exception as e:
+                    logger.warning(
+                        "Falha ao agendar empacotamento HLS do vídeo",
+                        extra={
+                            "video_id": video.id,
+                            "error_type": type(e).__name__,
+                            "error_message": str(e),
+                            "operation": "schedule_hls_packaging_failed"
+                        }
+                    )
+            
+            logger.info(
+                "Video criado com sucesso",
+                extra={
+                    "video_id": video.id,
+                    "user_id": current_user.id,
+                    "user_email": current_user.email,
+                    "video_title": video.title,
+                    "operation": "create_video"
+                }
+            )
                 
         except InsufficientCreditsException as e:
             logger.warning(
@@ -366,6 +417,42 @@ def create_video(db: Session, video_in: VideoCreate, current_user: User) -> Vide
             # Propaga a exceção diretamente para o controlador
             raise
         
+        except Exception as video_error:
+            # Descarta a transação que falhou antes de movimentar os créditos
+            db.rollback()
+            if captured_video_id:
+                # O crédito já foi debitado: estorna o valor capturado
+                try:
+                    refund_credit(
+                        db,
+                        current_user.id,
+                        amount=hold.amount,
+                        description=f"Estorno por falha na geração de vídeo (ID: {captured_video_id})"
+                    )
+                except Exception as refund_error:
+                    logger.error(
+                        "Falha ao estornar crédito após erro na geração de vídeo",
+                        extra={
+                            "user_id": current_user.id,
+                            "hold_id": hold.id,
+                            "video_id": captured_video_id,
+                            "error_message": str(refund_error),
+                            "operation": "refund_credit_failed"
+                        }
+                    )
+            # Se ocorrer um erro na geração do vídeo antes da captura, libera o crédito
+            # (a liberação é idempotente: uma reserva já liberada não é liberada de novo)
+            elif hold and release_credit_hold(db, hold.id):
+                logger.info(
+                    "Reserva de crédito liberada por falha na geração de vídeo",
+                    extra={
+                        "user_id": current_user.id,
+                        "hold_id": hold.id,
+                        "operation": "release_credit_hold"
+                    }
+                )
+            # Re-lança a exceção original
+            raise video_error
         return video
     except RequestValidationError as e:
         logger.warning(
@@ -407,26 +494,27 @@ def create_video(db: Session, video_in: VideoCreate, current_user: User) -> Vide
             extra=log_extra
         )
         
-        # Se o crédito foi consumido, tenta estornar
-        if credit_consumed and transaction_id:
+        # Se o crédito ainda estiver reservado, tenta liberar a reserva
+        if hold:
             try:
-                refund_credit(db, current_user.id, description="Estorno por erro interno na geração de vídeo")
-                logger.info(
-                    "Crédito estornado por erro interno",
-                    extra={
-                        "user_id": current_user.id,
-                        "transaction_id": transaction_id,
-                        "operation": "refund_credit"
-                    }
-                )
-            except Exception as refund_error:
+                if release_credit_hold(db, hold.id):
+                    logger.info(
+                        "Reserva de crédito liberada por erro interno",
+                        extra={
+                            "user_id": current_user.id,
+                            "hold_id": hold.id,
+                            "operation": "release_credit_hold"
+                        }
+                    )
+            except Exception as release_error:
+                # A reserva expira e é liberada pelo sweeper
                 logger.error(
-                    "Falha ao estornar crédito após erro interno",
+                    "Falha ao liberar reserva de crédito após erro interno",
                     extra={
                         "user_id": current_user.id,
-                        "transaction_id": transaction_id,
-                        "error_message": str(refund_error),
-                        "operation": "refund_credit_failed"
+                        "hold_id": hold.id,
+                        "error_message": str(release_error),
+                        "operation": "release_credit_hold_failed"
                     }
                 )
         
@@ -436,6 +524,27 @@ def create_video(db: Session, video_in: VideoCreate, current_user: User) -> Vide
         )
 
 
+def _get_blob_location(video: Video) -> Optional[Tuple[str, str]]:
+    """
+    Obtém o container e o nome do blob de um vídeo.
+    Vídeos antigos, sem a localização gravada, têm o blob extraído da URL.
+    
+    Args:
+        video: Vídeo a ser consultado
+        
+    Returns:
+        Optional[Tuple[str, str]]: Container e nome do blob ou None se o vídeo não estiver no blob storage
+    """
+    if video.blob_container and video.blob_name:
+        return video.blob_container, video.blob_name
+    
+    if not video.url or not video.url.startswith("https://"):
+        return None
+    
+    from app.services.storage_service import parse_blob_url
+    return parse_blob_url(video.url)
+
+
 def get_video_download_url(db: Session, video_guid: str, user_id: int) -> Optional[str]:
     """
     Gera uma URL de download para um vídeo específico
@@ -458,13 +567,14 @@ def get_video_download_url(db: Session, video_guid: str, user_id: int) -> Option
         if not video:
             return None
         
-        # Verifica se o vídeo tem uma URL do blob storage
-        if not video.url or not video.url.startswith("https://"):
+        # Verifica se o vídeo está no blob storage
+        blob_location = _get_blob_location(video)
+        if not blob_location:
             return None
         
         # Gera uma URL de download temporária
         from app.services.storage_service import generate_download_url
-        download_url = generate_download_url(video.url, video.id)
+        download_url = generate_download_url(*blob_location, video.id)
         
         return download_url
     except Exception as e:
@@ -502,13 +612,14 @@ def get_video_streaming_url(db: Session, video_guid: str, user_id: int) -> Optio
         if not video:
             return None
         
-        # Verifica se o vídeo tem uma URL do blob storage
-        if not video.url or not video.url.startswith("https://"):
+        # Verifica se o vídeo está no blob storage
+        blob_location = _get_blob_location(video)
+        if not blob_location:
             return None
         
         # Gera uma URL de streaming temporária
         from app.services.storage_service import generate_streaming_url
-        streaming_url = generate_streaming_url(video.url, video.id)
+        streaming_url = generate_streaming_url(*blob_location, video.id)
         
         return streaming_url
     except Exception as e:
@@ -0,0 +1,66 @@
+"""
+Benchmark do upload de vídeos para o Blob Storage.
+
+Envia um arquivo sintético com diferentes níveis de concorrência e tamanhos de bloco
+e imprime o tempo e a vazão de cada combinação. Por padrão usa o emulador Azurite local:
+
+    docker run -p 10000:10000 mcr.microsoft.com/azure-storage/azurite azurite-blob --blobHost 0.0.0.0
+    python scripts/benchmark_blob_upload.py --size-mb 100
+
+Para usar outra conta, defina AZURE_STORAGE_CONNECTION_STRING ou passe --connection-string
+com --backend azure. Com --backend local, mede a gravação no sistema de arquivos (LOCAL_STORAGE_PATH).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de upload para o Blob Storage")
+    parser.add_argument("--size-mb", type=int, default=100, help="Tamanho do arquivo sintético em MB")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--block-size-mb", type=int, nargs="+", default=[4, 8])
+    parser.add_argument("--backend", choices=["azure", "azurite", "local"], default="azurite")
+    parser.add_argument("--connection-string", default=os.getenv("AZURE_STORAGE_CONNECTION_STRING", ""))
+    args = parser.parse_args()
+
+    from app.core.config import settings
+    from app.services import storage_backends, storage_service
+
+    settings.STORAGE_BACKEND = args.backend
+    settings.AZURE_STORAGE_CONNECTION_STRING = args.connection_string
+    storage_backends.reset_storage_backend()
+
+    with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp:
+        chunk = os.urandom(1024 * 1024)
+        for _ in range(args.size_mb):
+            tmp.write(chunk)
+        path = tmp.name
+
+    try:
+        print(f"{'blocos (MB)':>12} {'concorrência':>13} {'tempo (s)':>10} {'MB/s':>8}")
+        for block_size_mb in args.block_size_mb:
+            for concurrency in args.concurrency:
+                settings.AZURE_STORAGE_MAX_BLOCK_SIZE = block_size_mb * 1024 * 1024
+                settings.AZURE_STORAGE_MAX_SINGLE_PUT_SIZE = block_size_mb * 1024 * 1024
+                settings.AZURE_STORAGE_MAX_CONCURRENCY = concurrency
+                # Recria o cliente para aplicar os novos tamanhos de bloco
+                storage_service.reset_blob_service_client()
+
+                start = time.perf_counter()
+                url = storage_service.upload_video_to_blob_storage(path, video_id=0)
+                elapsed = time.perf_counter() - start
+                if not url:
+                    print(f"{block_size_mb:>12} {concurrency:>13} {'falhou':>10}")
+                    continue
+                print(f"{block_size_mb:>12} {concurrency:>13} {elapsed:>10.2f} {args.size_mb / elapsed:>8.1f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark do hashing de senhas com Argon2.
+
+Mede o tempo de hash e de verificação para combinações de time_cost e memory_cost, e a
+vazão de logins simultâneos com o número de workers do pool. Use o resultado para
+escolher ARGON2_TIME_COST, ARGON2_MEMORY_COST e PASSWORD_HASH_WORKERS: o hash deve
+levar algumas centenas de milissegundos na máquina de produção, no máximo.
+
+    python scripts/benchmark_password_hashing.py
+    python scripts/benchmark_password_hashing.py --time-cost 2 3 --memory-mb 32 64 --workers 2 4
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do hashing de senhas com Argon2")
+    parser.add_argument("--time-cost", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--memory-mb", type=int, nargs="+", default=[19, 64])
+    parser.add_argument("--parallelism", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--iterations", type=int, default=10, help="Hashes medidos por combinação")
+    args = parser.parse_args()
+
+    from argon2 import PasswordHasher
+
+    password = "benchmark-password"
+    print(f"{'time_cost':>9} {'memória (MB)':>13} {'hash (ms)':>10} {'verify (ms)':>12} "
+          f"{'workers':>8} {'logins/s':>9}")
+    for time_cost in args.time_cost:
+        for memory_mb in args.memory_mb:
+            hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_mb * 1024, parallelism=args.parallelism)
+
+            hash_times = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                hashed = hasher.hash(password)
+                hash_times.append(time.perf_counter() - start)
+
+            verify_times = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                hasher.verify(hashed, password)
+                verify_times.append(time.perf_counter() - start)
+
+            for workers in args.workers:
+                logins = workers * args.iterations
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    start = time.perf_counter()
+                    list(executor.map(lambda _: hasher.verify(hashed, password), range(logins)))
+                    elapsed = time.perf_counter() - start
+                print(f"{time_cost:>9} {memory_mb:>13} {statistics.median(hash_times) * 1000:>10.1f} "
+                      f"{statistics.median(verify_times) * 1000:>12.1f} {workers:>8} {logins / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Concede créditos em lote a partir de um arquivo CSV.
+
+O arquivo deve ter as colunas user_id, amount e description (opcional). As concessões
+são aplicadas em lotes, cada um em uma única transação; o resultado de cada linha pode
+ser gravado em outro CSV com --output.
+
+    python scripts/grant_credits.py campanha.csv
+    python scripts/grant_credits.py campanha.csv --batch-size 1000 --output resultado.csv
+"""
+import argparse
+import csv
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RESULT_FIELDS = ["user_id", "amount", "status", "balance_after", "error_id"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concede créditos em lote a partir de um CSV")
+    parser.add_argument("input", help="CSV com as colunas user_id, amount e description")
+    parser.add_argument("--batch-size", type=int, default=500, help="Concessões por transação")
+    parser.add_argument("--output", help="CSV onde gravar o resultado de cada linha")
+    args = parser.parse_args()
+
+    with open(args.input, newline="", encoding="utf-8") as f:
+        grants = [
+            {"user_id": int(row["user_id"]), "amount": int(row["amount"]), "description": row.get("description") or None}
+            for row in csv.DictReader(f)
+        ]
+
+    from app.db.session import SessionLocal
+    from app.services.credit_service import grant_credits_bulk
+
+    db = SessionLocal()
+    try:
+        results = grant_credits_bulk(db, grants, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+
+    for status, count in sorted(Counter(result["status"] for result in results).items()):
+        print(f"{status:>15}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Confere se o saldo de cada conta de créditos bate com o histórico de transações.
+
+A conciliação é incremental: cada conta guarda um checkpoint (última transação somada
+e saldo esperado), então cada execução lê apenas as transações novas. Divergências são
+registradas em log como erro; o job termina com código 1 se alguma conta divergir, para
+que o agendador possa alertar.
+
+    python scripts/reconcile_credit_ledger.py
+    python scripts/reconcile_credit_ledger.py --batch-size 1000
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concilia os saldos de créditos com o histórico de transações")
+    parser.add_argument("--batch-size", type=int, default=500, help="Contas conciliadas por transação")
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal
+    from app.services.ledger_reconciliation_service import reconcile_credit_ledger
+
+    db = SessionLocal()
+    try:
+        totals = reconcile_credit_ledger(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    for metric, value in totals.items():
+        print(f"{metric:>16}: {value}")
+    sys.exit(1 if totals["drifted_accounts"] else 0)
+
+
+if __name__ == "__main__":
+    main()
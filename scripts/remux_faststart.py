@@ -0,0 +1,39 @@
+"""
+Converte os vídeos já armazenados para MP4 faststart (moov no início do arquivo).
+
+Os vídeos renderizados antes da adoção do faststart têm o moov no final, o que obriga
+o player a buscar o fim do arquivo antes de começar a reprodução. O job copia as trilhas
+com ffmpeg (-c copy, sem recodificar) e regrava cada blob na mesma chave; vídeos que já
+são faststart são ignorados, então o job pode ser interrompido e executado novamente.
+
+    python scripts/remux_faststart.py --dry-run
+    python scripts/remux_faststart.py
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Converte os vídeos armazenados para MP4 faststart")
+    parser.add_argument("--batch-size", type=int, default=100, help="Vídeos lidos por consulta")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas conta os vídeos que precisam de conversão")
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal
+    from app.services.faststart_service import migrate_videos_to_faststart
+
+    db = SessionLocal()
+    try:
+        totals = migrate_videos_to_faststart(db, batch_size=args.batch_size, dry_run=args.dry_run)
+    finally:
+        db.close()
+
+    for result, count in totals.items():
+        print(f"{result:>10}: {count}")
+
+
+if __name__ == "__main__":
+    main()
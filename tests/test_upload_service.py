@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from app.core.config import settings
+from app.services import storage_backends
+from app.services.upload_service import BackgroundUploader
+
+
+@pytest.fixture
+def storage_backend(monkeypatch, tmp_path):
+    def configure(backend: str, connection_string: str = ""):
+        monkeypatch.setattr(settings, "STORAGE_BACKEND", backend)
+        monkeypatch.setattr(settings, "LOCAL_STORAGE_PATH", str(tmp_path))
+        monkeypatch.setattr(settings, "LOCAL_STORAGE_SIGNING_KEY", "test-signing-key")
+        monkeypatch.setattr(settings, "AZURE_STORAGE_CONNECTION_STRING", connection_string)
+        storage_backends.reset_storage_backend()
+
+    yield configure
+    storage_backends.reset_storage_backend()
+
+
+def test_local_backend_starts_without_azure_client(storage_backend):
+    storage_backend("local")
+    uploader = BackgroundUploader(workers=1, queue_size=1, hls_workers=1, hls_queue_size=1)
+    executed = threading.Event()
+
+    async def job():
+        executed.set()
+
+    try:
+        assert uploader._submit(1, job)
+        assert executed.wait(5)
+        assert uploader._client is None
+    finally:
+        uploader.stop(timeout=5)
+
+
+def test_startup_error_is_raised_instead_of_hanging(storage_backend):
+    storage_backend("azure", connection_string="")
+    uploader = BackgroundUploader(workers=1, queue_size=1, hls_workers=1, hls_queue_size=1)
+    result = {}
+
+    def submit():
+        try:
+            uploader.submit_artifacts(1)
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=submit, daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert isinstance(result.get("error"), ValueError)
+    assert uploader._thread is None